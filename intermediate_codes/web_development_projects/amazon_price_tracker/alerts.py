@@ -0,0 +1,160 @@
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 587
+
+
+def format_alert(alert):
+    """
+    Text block describing one triggered alert.
+
+    Args:
+        alert: Result dict with "title", "price", "target_price" and "url"
+
+    Returns:
+        str: Plain-text description
+    """
+    return (f"Product: {alert['title']}\n"
+            f"Current Price: ${alert['price']:.2f}\n"
+            f"Target Price: ${alert['target_price']:.2f}\n"
+            f"Savings: ${alert['target_price'] - alert['price']:.2f}\n"
+            f"\n"
+            f"View product:\n"
+            f"{alert['url']}\n")
+
+
+class AlertDispatcher:
+    """
+    Collect the alerts of one tracking cycle and email them together.
+
+    send_digest() sends all alerts as a single email. send_each() sends one
+    email per alert, but over a single authenticated SMTP connection, so
+    STARTTLS and login happen once per cycle instead of once per alert.
+
+    Args:
+        email: Sender address (also the default recipient)
+        password: SMTP password; None skips login (local stand-in servers)
+        host: SMTP server
+        port: SMTP port
+        use_tls: Run STARTTLS after connecting
+        to_address: Recipient (defaults to the sender)
+    """
+
+    def __init__(self, email, password, host=SMTP_HOST, port=SMTP_PORT, use_tls=True, to_address=None):
+        self.email = email
+        self.password = password
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.to_address = to_address or email
+        self.alerts = []
+        self.last_error = None
+
+    def add(self, alert):
+        self.alerts.append(alert)
+
+    def _connect(self):
+        connection = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.use_tls:
+            connection.starttls()
+        # Local stand-in servers don't offer AUTH; the .env password is still set
+        connection.ehlo_or_helo_if_needed()
+        if self.password and (self.use_tls or connection.has_extn("auth")):
+            connection.login(user=self.email, password=self.password)
+        return connection
+
+    def _message(self, subject, body):
+        msg = MIMEMultipart()
+        msg['From'] = self.email
+        msg['To'] = self.to_address
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        return msg.as_string()
+
+    def digest_message(self):
+        """
+        Build the single email that lists every collected alert.
+
+        Returns:
+            str: Full MIME message
+        """
+        count = len(self.alerts)
+        if count == 1:
+            subject = f"Amazon Price Alert: {self.alerts[0]['title'][:50]}..."
+        else:
+            subject = f"Amazon Price Alert: {count} products below target"
+
+        sections = [f"{n}. {format_alert(alert)}" for n, alert in enumerate(self.alerts, start=1)]
+        body = (f"\nAmazon Price Alert!\n\n"
+                f"{count} product(s) you're tracking dropped below your target price.\n\n"
+                + "\n".join(sections)
+                + "\n---\nThis is an automated alert from your Amazon Price Tracker.\n")
+        return self._message(subject, body)
+
+    def send_digest(self):
+        """
+        Send all collected alerts as one email.
+
+        Returns:
+            int: Number of alerts included (0 means nothing was sent; on an
+            SMTP or network error the reason is in last_error and the alerts
+            are kept for the next attempt)
+        """
+        self.last_error = None
+        if not self.alerts:
+            return 0
+
+        try:
+            connection = self._connect()
+            try:
+                connection.sendmail(from_addr=self.email, to_addrs=self.to_address, msg=self.digest_message())
+            finally:
+                connection.quit()
+        except (smtplib.SMTPException, OSError) as e:
+            self.last_error = e
+            return 0
+
+        sent = len(self.alerts)
+        self.alerts = []
+        return sent
+
+    def send_each(self):
+        """
+        Send one email per alert over a single SMTP connection.
+
+        Returns:
+            int: Number of emails sent (on an SMTP or network error the
+            reason is in last_error and the unsent alerts are kept)
+        """
+        self.last_error = None
+        if not self.alerts:
+            return 0
+
+        sent = 0
+        try:
+            connection = self._connect()
+            try:
+                for alert in self.alerts:
+                    body = (f"\nAmazon Price Alert!\n\n"
+                            f"The product you're tracking has dropped below ${alert['target_price']:.2f}\n\n"
+                            f"{format_alert(alert)}\n"
+                            f"---\nThis is an automated alert from your Amazon Price Tracker.\n")
+                    connection.sendmail(
+                        from_addr=self.email,
+                        to_addrs=self.to_address,
+                        msg=self._message(f"Amazon Price Alert: {alert['title'][:50]}...", body),
+                    )
+                    sent += 1
+            finally:
+                connection.quit()
+        except (smtplib.SMTPException, OSError) as e:
+            self.last_error = e
+        finally:
+            self.alerts = self.alerts[sent:]
+        return sent
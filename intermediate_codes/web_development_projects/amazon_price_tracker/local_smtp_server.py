@@ -0,0 +1,119 @@
+import os
+import socketserver
+import threading
+from datetime import datetime
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Where the stand-in server listens
+HOST = "localhost"
+PORT = 1025
+
+# Folder where every received email is saved as a .eml file
+OUTBOX_DIR = "outbox"
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Speak just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA,
+    RSET, NOOP and QUIT. No TLS and no authentication.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("utf-8"))
+
+    def handle(self):
+        self.reply("220 localhost stand-in SMTP server ready")
+        sender, recipients = None, []
+
+        for raw_line in self.rfile:
+            command = raw_line.decode("utf-8", errors="replace").strip()
+            verb = command[:4].upper()
+
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                sender, recipients = command[10:].strip(" <>"), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command[8:].strip(" <>"))
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data_line in self.rfile:
+                    if data_line in (b".\r\n", b".\n"):
+                        break
+                    # Undo SMTP dot-stuffing
+                    lines.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                self.server.store(sender, recipients, b"".join(lines))
+                self.reply("250 OK: message accepted")
+            elif verb == "RSET":
+                sender, recipients = None, []
+                self.reply("250 OK")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                break
+            else:
+                self.reply("502 Command not implemented")
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    Stand-in SMTP server that keeps every email it receives.
+
+    Messages are available in .messages (list of dicts) and, when outbox_dir
+    is set, saved as .eml files.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on (0 picks a free port)
+        outbox_dir: Folder for .eml copies, or None
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host=HOST, port=PORT, outbox_dir=OUTBOX_DIR):
+        super().__init__((host, port), SMTPHandler)
+        self.outbox_dir = outbox_dir
+        self.messages = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        if outbox_dir:
+            os.makedirs(outbox_dir, exist_ok=True)
+
+    def verify_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        return True
+
+    def store(self, sender, recipients, data):
+        with self._lock:
+            self.messages.append({"from": sender, "to": recipients, "data": data})
+            count = len(self.messages)
+        if self.outbox_dir:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            with open(os.path.join(self.outbox_dir, f"{stamp}-{count}.eml"), mode="wb") as file:
+                file.write(data)
+        print(f"✓ Received email #{count} from {sender} to {', '.join(recipients)}")
+
+    def start_in_background(self):
+        """Serve from a daemon thread (handy inside scripts and checks)."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+if __name__ == "__main__":
+    server = LocalSMTPServer()
+    print(f"Stand-in SMTP server listening on {HOST}:{PORT} (Ctrl+C to stop)")
+    print(f"Emails are saved in ./{OUTBOX_DIR}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
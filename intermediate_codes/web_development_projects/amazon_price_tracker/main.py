@@ -1,105 +1,92 @@
 import os
-import time
-import smtplib
-import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from tracker import PriceTracker, load_products
+from price_history import PriceHistory
+from alerts import AlertDispatcher
 
 # ==============================================================================
 # CONFIGURATION
 # ==============================================================================
 
-# Amazon product URL to track
-PRODUCT_URL = ("https://www.amazon.com/-/es/Apple-Computadora-escritorio-"
-               "mini-n%C3%BAcleos/dp/B0DLBTPDCS/ref=pd_ci_mcx_mh_mcx_"
-               "views_0_title?pd_rd_w=n9pih&content-id=amzn1.sym.679481c3-"
-               "2bf4-4843-80c0-ffb319282e84%3Aamzn1.symc.c3d5766d-b606-"
-               "46b8-ab07-1d9d1da0638a&pf_rd_p=679481c3-2bf4-4843-80c0-"
-               "ffb319282e84&pf_rd_r=SA3G88A923WSV95C0HR8&pd_rd_wg=HBML4&pd_"
-               "rd_r=78d56093-a70d-48d3-93bf-34fc314bd942&pd_rd_"
-               "i=B0DLBTPDCS&th=1")
-
-# Target price threshold (send alert if product price falls below this)
-TARGET_PRICE = 500.00
-
-# HTTP headers to mimic a real browser request
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                  "AppleWebKit/537.36 (KHTML, like Gecko) "
-                  "Chrome/131.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.5",
-    "Accept-Encoding": "gzip, deflate, br",
-    "Connection": "keep-alive",
-    "Upgrade-Insecure-Requests": "1"
-}
+# CSV file with the products to track (columns: url, target_price)
+PRODUCTS_FILE = "products.csv"
+
+# Worker pool size and per-host politeness limit (seconds between requests)
+MAX_WORKERS = 16
+HOST_MIN_INTERVAL = 2.0
+
+# SQLite file with every observed price and the window for "lowest price" reports
+HISTORY_FILE = "price_history.db"
+HISTORY_DAYS = 30
+
+# True: one digest email per cycle. False: one email per alert (same connection)
+SEND_DIGEST = True
 
 # ==============================================================================
-# STEP 1: Fetch Amazon product page
+# STEP 1: Load the product list
 # ==============================================================================
 
-print("Fetching Amazon product page...")
-
 try:
-    response = requests.get(url=PRODUCT_URL, headers=HEADERS)
-    time.sleep(2)  # Delay to avoid rate limiting
-    response.encoding = "utf-8"
-    response.raise_for_status()  # Raise exception for HTTP errors
-    amazon_html = response.text
-    print("Page fetched successfully")
-
-except requests.exceptions.RequestException as e:
-    print(f"Error fetching Amazon data: {e}")
+    products = load_products(PRODUCTS_FILE)
+except (OSError, KeyError, ValueError) as e:
+    print(f"Error reading {PRODUCTS_FILE}: {e}")
+    exit(1)
+
+if not products:
+    print(f"Error: No products found in {PRODUCTS_FILE}")
     exit(1)
 
 # ==============================================================================
-# STEP 2: Parse HTML and extract product information
+# STEP 2: Fetch and parse all product pages concurrently
 # ==============================================================================
 
-print("Extracting product information...")
+print(f"Fetching {len(products)} Amazon product page(s)...")
 
-soup = BeautifulSoup(amazon_html, "html.parser")
+tracker = PriceTracker(max_workers=MAX_WORKERS, host_min_interval=HOST_MIN_INTERVAL)
+results = tracker.run_cycle(products)
 
-# Extract product price
-price_tag = soup.find("span", class_="a-price-whole")
-if not price_tag:
-    print("Error: Price not found on page")
-    exit(1)
+# ==============================================================================
+# STEP 3: Save every observed price to the history store
+# ==============================================================================
 
-# Clean price text and convert to float
-price_text = price_tag.get_text().strip().replace(",", "")
-try:
-    price = float(price_text)
-except ValueError:
-    print(f"Error: Could not convert price '{price_text}' to number")
-    exit(1)
+history = PriceHistory(HISTORY_FILE)
+saved = history.record(results)
+print(f"Saved {saved} price observation(s) to {HISTORY_FILE}")
 
-# Extract product title
-title_tag = soup.find("span", class_="a-size-large product-title-word-break")
-if not title_tag:
-    print("Error: Product title not found on page")
-    exit(1)
+# ==============================================================================
+# STEP 4: Check which products meet their threshold
+# ==============================================================================
 
-title = title_tag.get_text().strip()
+alerts = []
+for result in results:
+    if result["error"]:
+        print(f"✗ {result['url'][:60]}... -> {result['error']}")
+        continue
 
-print(f"Product: {title}")
-print(f"Current price: ${price:.2f}")
-print(f"Target price: ${TARGET_PRICE:.2f}")
+    print(f"\nProduct: {result['title']}")
+    print(f"Current price: ${result['price']:.2f}")
+    print(f"Target price: ${result['target_price']:.2f}")
 
-# ==============================================================================
-# STEP 3: Check if price meets threshold
-# ==============================================================================
+    lowest = history.lowest_price(result["url"], days=HISTORY_DAYS)
+    print(f"Lowest price in {HISTORY_DAYS} days: ${lowest:.2f}")
 
-if price >= TARGET_PRICE:
-    print(f"Price is above target. No alert sent.")
-    exit(0)
+    change = history.price_change(result["url"])
+    if change is not None:
+        print(f"Change since last check: {change:+.1f}%")
+
+    if result["price"] >= result["target_price"]:
+        print("Price is above target. No alert sent.")
+    else:
+        print(f"Price alert! Product is below ${result['target_price']:.2f}")
+        alerts.append(result)
 
-print(f"Price alert! Product is below ${TARGET_PRICE:.2f}")
+history.close()
+
+if not alerts:
+    exit(0)
 
 # ==============================================================================
-# STEP 4: Load email credentials
+# STEP 5: Load email credentials
 # ==============================================================================
 
 load_dotenv()
@@ -107,58 +94,39 @@ load_dotenv()
 MY_EMAIL = os.getenv("MY_EMAIL")
 MY_PASSWORD = os.getenv("MY_PASSWORD")
 
+# Optional: point at a local stand-in server (see local_smtp_server.py)
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "1") != "0"
+
 # Verify credentials are loaded
-if not MY_EMAIL or not MY_PASSWORD:
+if not MY_EMAIL or (SMTP_USE_TLS and not MY_PASSWORD):
     print("Error: Email credentials not found in .env file")
     exit(1)
 
 # ==============================================================================
-# STEP 5: Compose and send email alert
+# STEP 6: Send all alerts of this cycle over one SMTP connection
 # ==============================================================================
 
-print("Sending email alert...")
+dispatcher = AlertDispatcher(email=MY_EMAIL, password=MY_PASSWORD,
+                             host=SMTP_HOST, port=SMTP_PORT, use_tls=SMTP_USE_TLS)
+for alert in alerts:
+    dispatcher.add(alert)
 
-# Create email message
-msg = MIMEMultipart()
-msg['From'] = MY_EMAIL
-msg['To'] = MY_EMAIL
-msg['Subject'] = f"Amazon Price Alert: {title[:50]}..."
+print(f"\nSending {len(alerts)} price alert(s)...")
 
-# Email body with product details
-body = f"""
-Amazon Price Alert!
+# SMTP errors are reported, not raised, so the tracking run still completes
+if SEND_DIGEST:
+    sent = dispatcher.send_digest()
+    if sent:
+        print("Digest email sent successfully!")
+else:
+    sent = dispatcher.send_each()
+    print(f"{sent} email alert(s) sent successfully!")
 
-The product you're tracking has dropped below ${TARGET_PRICE:.2f}
-
-Product: {title}
-Current Price: ${price:.2f}
-Savings: ${TARGET_PRICE - price:.2f}
-
-View product:
-{PRODUCT_URL}
-
----
-This is an automated alert from your Amazon Price Tracker.
-"""
-
-msg.attach(MIMEText(body, 'plain', 'utf-8'))
-
-# Send email via Gmail SMTP
-try:
-    with smtplib.SMTP("smtp.gmail.com", 587) as connection:
-        connection.starttls()
-        connection.login(user=MY_EMAIL, password=MY_PASSWORD)
-        connection.sendmail(
-            from_addr=MY_EMAIL,
-            to_addrs=MY_EMAIL,
-            msg=msg.as_string()
-        )
-    print("Email alert sent successfully!")
-
-except smtplib.SMTPException as e:
-    print(f"Error sending email: {e}")
-    exit(1)
+if dispatcher.last_error:
+    print(f"Error sending email: {dispatcher.last_error}")
 
 print("\n" + "=" * 70)
 print("PRICE TRACKING COMPLETED")
-print("=" * 70)
\ No newline at end of file
+print("=" * 70)
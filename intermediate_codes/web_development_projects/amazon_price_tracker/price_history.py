@@ -0,0 +1,145 @@
+import re
+import time
+import sqlite3
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# SQLite file where every observed price is stored
+HISTORY_FILE = "price_history.db"
+
+# Amazon product id inside a URL, e.g. ".../dp/B0DLBTPDCS/..."
+ASIN_PATTERN = re.compile(r"/(?:dp|gp/product)/([A-Z0-9]{10})")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    product TEXT NOT NULL,
+    observed_at REAL NOT NULL,
+    price REAL NOT NULL,
+    title TEXT,
+    PRIMARY KEY (product, observed_at)
+) WITHOUT ROWID;
+"""
+
+
+def product_key(url):
+    """
+    Return a stable key for a product URL.
+
+    Amazon URLs carry lots of tracking parameters, so the ASIN is used when
+    it can be found. Otherwise the full URL is the key.
+
+    Args:
+        url: Product page URL
+
+    Returns:
+        str: ASIN or URL
+    """
+    match = ASIN_PATTERN.search(url)
+    return match.group(1) if match else url
+
+
+class PriceHistory:
+    """
+    Append-only price store backed by SQLite in WAL mode.
+
+    Rows are clustered by (product, observed_at), so history queries for one
+    product read a contiguous index range instead of scanning the table.
+
+    Args:
+        file_path: Path to the SQLite database file
+    """
+
+    def __init__(self, file_path=HISTORY_FILE):
+        self.connection = sqlite3.connect(file_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def record(self, results, observed_at=None):
+        """
+        Store the prices of one tracking cycle in a single transaction.
+
+        Args:
+            results: Result dicts from PriceTracker.run_cycle()
+            observed_at: Unix timestamp of the cycle (defaults to now)
+
+        Returns:
+            int: Number of rows written
+        """
+        observed_at = time.time() if observed_at is None else observed_at
+        rows = [
+            (product_key(result["url"]), observed_at, result["price"], result["title"])
+            for result in results
+            if result.get("price") is not None
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO observations (product, observed_at, price, title) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def lowest_price(self, url, days):
+        """
+        Lowest price seen for a product in the last N days.
+
+        Args:
+            url: Product page URL
+            days: Size of the window in days
+
+        Returns:
+            float or None: Lowest price, or None if there is no history
+        """
+        since = time.time() - days * 86400
+        row = self.connection.execute(
+            "SELECT MIN(price) FROM observations WHERE product = ? AND observed_at >= ?",
+            (product_key(url), since),
+        ).fetchone()
+        return row[0]
+
+    def last_prices(self, url, limit=2):
+        """
+        Most recent prices of a product, newest first.
+
+        Args:
+            url: Product page URL
+            limit: Number of observations to return
+
+        Returns:
+            list: (observed_at, price) tuples
+        """
+        return self.connection.execute(
+            "SELECT observed_at, price FROM observations WHERE product = ? "
+            "ORDER BY observed_at DESC LIMIT ?",
+            (product_key(url), limit),
+        ).fetchall()
+
+    def price_change(self, url):
+        """
+        Percentage change between the last two observations of a product.
+
+        A negative value means the price dropped.
+
+        Args:
+            url: Product page URL
+
+        Returns:
+            float or None: Change in percent, or None with fewer than 2 rows
+        """
+        prices = self.last_prices(url, limit=2)
+        if len(prices) < 2 or not prices[1][1]:
+            return None
+        latest, previous = prices[0][1], prices[1][1]
+        return (latest - previous) / previous * 100
@@ -0,0 +1,232 @@
+import os
+import sys
+import csv
+import time
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.http_cache import HttpCache
+from toolkit.http_client import get_client
+from toolkit.html_parsing import HtmlDocument, strainer
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Maximum number of product pages fetched at the same time
+MAX_WORKERS = 16
+
+# Minimum seconds between two requests to the same host (politeness limit)
+HOST_MIN_INTERVAL = 2.0
+
+# Seconds to wait for a single page before giving up
+REQUEST_TIMEOUT = 15
+
+# The only two tags we need from a product page
+PRICE_SELECTOR = "span.a-price-whole"
+TITLE_CLASS = "a-size-large product-title-word-break"
+TITLE_SELECTOR = "span.a-size-large.product-title-word-break"
+PRODUCT_TAGS = strainer("span", class_=["a-price-whole", TITLE_CLASS])
+
+
+# ==============================================================================
+# PRODUCT LIST
+# ==============================================================================
+
+def load_products(file_path):
+    """
+    Read the list of products to track from a CSV file.
+
+    The file needs two columns: url and target_price.
+
+    Args:
+        file_path: Path to the CSV file
+
+    Returns:
+        list: One dict per product with "url" and "target_price" keys
+    """
+    products = []
+    with open(file=file_path, mode="r", encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            url = (row.get("url") or "").strip()
+            if not url:
+                continue
+            products.append({
+                "url": url,
+                "target_price": float(row["target_price"]),
+            })
+    return products
+
+
+# ==============================================================================
+# PER-HOST RATE LIMITING
+# ==============================================================================
+
+class HostRateLimiter:
+    """
+    Space out requests to the same host instead of sleeping after every one.
+
+    Each host gets its own schedule of time slots, so requests to different
+    hosts never wait for each other.
+    """
+
+    def __init__(self, min_interval=HOST_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """
+        Block until the host of the given URL can receive another request.
+
+        Args:
+            url: URL that is about to be requested
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        # Sleep outside the lock so other hosts are not blocked
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+# ==============================================================================
+# PAGE PARSING
+# ==============================================================================
+
+def parse_product(html):
+    """
+    Extract the product title and price from an Amazon product page.
+
+    Only the price and title spans are parsed (or the page goes through
+    selectolax when installed), instead of building a tree of the whole
+    multi-hundred-KB page.
+
+    Args:
+        html: Raw HTML of the product page
+
+    Returns:
+        tuple: (title, price)
+
+    Raises:
+        ValueError: If the title or price cannot be found or converted
+    """
+    document = HtmlDocument(html, only=PRODUCT_TAGS)
+
+    price_text = document.first_text(PRICE_SELECTOR)
+    if price_text is None:
+        raise ValueError("Price not found on page")
+
+    # Clean price text and convert to float
+    price_text = price_text.strip().replace(",", "")
+    try:
+        price = float(price_text)
+    except ValueError:
+        raise ValueError(f"Could not convert price '{price_text}' to number")
+
+    title_text = document.first_text(TITLE_SELECTOR)
+    if title_text is None:
+        raise ValueError("Product title not found on page")
+
+    return title_text.strip(), price
+
+
+# ==============================================================================
+# TRACKER ENGINE
+# ==============================================================================
+
+class PriceTracker:
+    """
+    Fetch many product pages concurrently through a bounded worker pool.
+
+    Pages go through the shared on-disk HTTP cache, so unchanged pages are
+    neither downloaded nor parsed again. Only real network requests wait for
+    the per-host rate limiter.
+
+    Args:
+        headers: Extra HTTP headers (User-Agent etc. come from the shared client)
+        max_workers: Maximum number of pages fetched at the same time
+        host_min_interval: Minimum seconds between requests to the same host
+        cache: HttpCache instance. When omitted, the tracker creates one that
+            fetches through its rate limiter; a cache passed in is used as is,
+            with its own session
+    """
+
+    def __init__(self, headers=None, max_workers=MAX_WORKERS, host_min_interval=HOST_MIN_INTERVAL, cache=None):
+        self.headers = headers
+        self.max_workers = max_workers
+        self.rate_limiter = HostRateLimiter(min_interval=host_min_interval)
+        self.client = get_client()
+        # Never rewire a caller's cache: it may be shared with other code
+        self.cache = cache if cache is not None else HttpCache(session=self)
+
+    def get(self, url, headers=None, timeout=REQUEST_TIMEOUT):
+        """
+        Network fetch used by the cache, respecting the per-host rate limit.
+        Goes through the shared client, so connections to Amazon stay warm
+        and 429/5xx answers are retried with backoff.
+
+        Args:
+            url: Page URL
+            headers: Request headers (including conditional headers)
+            timeout: Seconds to wait for the server
+
+        Returns:
+            requests.Response: Raw response
+        """
+        self.rate_limiter.wait(url)
+        return self.client.get(url, headers=headers, timeout=timeout)
+
+    def check_product(self, product):
+        """
+        Fetch and parse a single product. Errors are stored, not raised,
+        so one broken page does not stop the whole cycle.
+
+        Args:
+            product: Dict with "url" and "target_price"
+
+        Returns:
+            dict: Product data plus "title", "price" and "error"
+        """
+        result = {
+            "url": product["url"],
+            "target_price": product["target_price"],
+            "title": None,
+            "price": None,
+            "error": None,
+        }
+        try:
+            result["title"], result["price"] = self.cache.get_parsed(
+                product["url"], parse_product, name="product", headers=self.headers
+            )
+        except requests.exceptions.RequestException as e:
+            result["error"] = f"Error fetching Amazon data: {e}"
+        except ValueError as e:
+            result["error"] = f"Error: {e}"
+        return result
+
+    def run_cycle(self, products):
+        """
+        Check every product once.
+
+        Args:
+            products: List of product dicts
+
+        Returns:
+            list: Results in the same order as the products
+        """
+        if not products:
+            return []
+
+        workers = min(self.max_workers, len(products))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.check_product, products))
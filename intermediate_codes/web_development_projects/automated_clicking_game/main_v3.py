@@ -1,8 +1,11 @@
-import time
-from selenium import webdriver
+import os
+import sys
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.browser import make_driver, BLOCKED_TRACKERS
+from toolkit.browser_waits import wait_for_clickable
 
 # ==============================================================================
 # CONFIGURATION
@@ -20,12 +23,9 @@ LANGUAGE = "EN"  # Game language
 # SETUP CHROME DRIVER
 # ==============================================================================
 
-# Configure Chrome to stay open after script finishes
-chrome_options = webdriver.ChromeOptions()
-chrome_options.add_experimental_option(name="detach", value=True)
-
-# Create Chrome driver instance
-driver = webdriver.Chrome(options=chrome_options)
+# Create a lean Chrome that stays open after the script finishes. Only
+# trackers are blocked: the game draws its sprites from image files.
+driver = make_driver(detach=True, blocked=BLOCKED_TRACKERS)
 
 print("Starting Cookie Clicker Bot...")
 
@@ -36,18 +36,12 @@ print("Starting Cookie Clicker Bot...")
 driver.get(GAME_URL)
 print(f"Loaded game: {GAME_URL}")
 
-# Wait for page to load
-time.sleep(5)
-
-# Select language
+# Select language. The game is ready once its language selector can be
+# clicked (the page itself never goes network-quiet: ads keep polling)
 try:
-    wait = WebDriverWait(driver, 10)
-    language_button = wait.until(
-        EC.element_to_be_clickable((By.XPATH, f'//*[@id="langSelect-{LANGUAGE}"]'))
-    )
+    language_button = wait_for_clickable(driver, (By.ID, f"langSelect-{LANGUAGE}"), timeout=30)
     language_button.click()
     print(f"Language set to: {LANGUAGE}")
-    time.sleep(2)
 except Exception as e:
     print(f"Warning: Could not select language - {e}")
 
@@ -55,7 +49,8 @@ except Exception as e:
 # STEP 2: Locate the big cookie
 # ==============================================================================
 
-big_cookie = driver.find_element(By.CSS_SELECTOR, "button#bigCookie")
+# The game builds the cookie after the language is chosen
+big_cookie = wait_for_clickable(driver, (By.CSS_SELECTOR, "button#bigCookie"), timeout=30)
 print("Big cookie located. Starting automated clicking...")
 
 # ==============================================================================
@@ -124,7 +119,6 @@ while click_count < TOTAL_CLICKS:
                     print(f"[Click {click_count}] Bought: {best_upgrade['name']} "
                           f"for {best_upgrade['price']:,} cookies "
                           f"(Total upgrades: {total_upgrades_bought})")
-                    time.sleep(0.5)  # Brief pause after purchase
 
         except Exception as e:
             print(f"Error during upgrade check: {e}")
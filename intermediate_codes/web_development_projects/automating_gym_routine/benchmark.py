@@ -0,0 +1,182 @@
+import os
+import sys
+import math
+import time
+import signal
+import json
+import argparse
+import tempfile
+import subprocess
+from local_gym import LocalGym, LATENCY, JITTER, FAILURE_RATE, DAYS, CLASSES_PER_DAY
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Bots compared by default; both book TARGET_DAYS at TARGET_TIME
+SCRIPTS = ["main.py", "main_v2pro.py"]
+TARGET_DAYS = ["Tue", "Thu"]
+TARGET_TIME = "6:00 PM"
+
+RUNS = 3
+RUN_TIMEOUT = 300  # A run still going after this many seconds is stopped
+
+# Any credentials work on the local site
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "benchmark"
+
+# Lines of a failed run's output that are printed
+TAIL_LINES = 15
+
+# Example:
+#   python benchmark.py --runs 5 --latency 0.3 --failure-rate 0.5 --days 14
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (None for no values)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * pct / 100))
+    return ordered[rank - 1]
+
+
+def stop_process(process):
+    """Stop the bot and every browser it started."""
+    try:
+        if os.name == "posix":
+            # The whole process group, so a Chrome left behind goes too
+            os.killpg(process.pid, signal.SIGKILL)
+        elif process.poll() is None:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.wait()
+
+
+def run_script(gym, script, timeout=RUN_TIMEOUT):
+    """
+    Run one bot against the local gym, from a clean profile.
+
+    Args:
+        gym: Running LocalGym
+        script: File name of the bot in this folder
+        timeout: Seconds before the run is stopped
+
+    Returns:
+        dict: "seconds" (whole run), "times" (seconds from launch to each
+        booking), "failures" (injected errors), "returncode", "timed_out", "tail"
+    """
+    gym.reset()
+    # A fresh working folder means a fresh chrome_profile (no saved login)
+    with tempfile.TemporaryDirectory() as workdir:
+        log_path = os.path.join(workdir, "output.log")
+        metrics_path = os.path.join(workdir, "metrics.json")
+        env = dict(os.environ, GYM_URL=gym.url, ACCOUNT_EMAIL=BENCH_EMAIL, ACCOUNT_PASSWORD=BENCH_PASSWORD,
+                   BROWSER_HEADLESS="1", BOT_METRICS_FILE=metrics_path)
+        with open(log_path, "w", encoding="utf-8") as log:
+            start = time.perf_counter()
+            process = subprocess.Popen(
+                [sys.executable, os.path.join(HERE, script)],
+                cwd=workdir, env=env, stdin=subprocess.PIPE, stdout=log, stderr=subprocess.STDOUT,
+                start_new_session=os.name == "posix",
+            )
+            timed_out = False
+            try:
+                # main_v2pro.py waits for Enter before closing the browser
+                process.communicate(input=b"\n", timeout=timeout)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+            seconds = time.perf_counter() - start
+            stop_process(process)
+
+        with open(log_path, encoding="utf-8", errors="replace") as log:
+            tail = log.readlines()[-TAIL_LINES:]
+
+        # Per-step timings written by toolkit/metrics.py when the bot finished
+        steps = {}
+        if os.path.exists(metrics_path):
+            with open(metrics_path, encoding="utf-8") as file:
+                for histogram in json.load(file)["histograms"]:
+                    steps[histogram["name"]] = steps.get(histogram["name"], 0.0) + histogram["sum"]
+
+    with gym.lock:
+        times = [event["at"] - start for event in gym.events]
+        failures = gym.failures
+    return {
+        "seconds": seconds,
+        "times": times,
+        "failures": failures,
+        "returncode": process.returncode,
+        "timed_out": timed_out,
+        "tail": tail,
+        "steps": steps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the gym bots against a local copy of the site.")
+    parser.add_argument("--scripts", nargs="+", default=SCRIPTS, help="Bots to compare")
+    parser.add_argument("--runs", type=int, default=RUNS, help="Runs per bot")
+    parser.add_argument("--latency", type=float, default=LATENCY, help="Seconds each API call takes")
+    parser.add_argument("--jitter", type=float, default=JITTER, help="Extra random seconds per call")
+    parser.add_argument("--failure-rate", type=float, default=FAILURE_RATE, help="Share of bookings that fail")
+    parser.add_argument("--days", type=int, default=DAYS, help="Days on the schedule")
+    parser.add_argument("--classes-per-day", type=int, default=CLASSES_PER_DAY, help="Classes on each day")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the schedule and the failures")
+    parser.add_argument("--timeout", type=float, default=RUN_TIMEOUT, help="Seconds before a run is stopped")
+    args = parser.parse_args()
+
+    with LocalGym(port=0, latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                  days=args.days, classes_per_day=args.classes_per_day, seed=args.seed) as gym:
+        expected = gym.targets(TARGET_DAYS, TARGET_TIME)
+        print(f"Local gym on {gym.url}: {len(gym.classes)} classes, {expected} to book per run, "
+              f"{args.latency:.2f}s latency, {args.failure_rate:.0%} failures\n")
+
+        results = {}
+        for script in args.scripts:
+            results[script] = []
+            for run in range(1, args.runs + 1):
+                result = run_script(gym, script, args.timeout)
+                results[script].append(result)
+                status = "timed out" if result["timed_out"] else f"exit {result['returncode']}"
+                print(f"{script} run {run}/{args.runs}: {len(result['times'])}/{expected} booked "
+                      f"in {result['seconds']:.1f}s ({status}, {result['failures']} injected failures)")
+                if result["timed_out"] or result["returncode"] != 0:
+                    print("".join(f"    {line}" for line in result["tail"]))
+
+    # ==========================================================================
+    # Report
+    # ==========================================================================
+    print("\n" + "=" * 78)
+    print(f"{'Script':<18}{'Booked':>10}{'Bookings/s':>12}{'p50 (s)':>10}{'p99 (s)':>10}{'Run (s)':>10}")
+    print("=" * 78)
+    for script, runs in results.items():
+        times = [seconds for result in runs for seconds in result["times"]]
+        total_seconds = sum(result["seconds"] for result in runs)
+        p50 = percentile(times, 50)
+        p99 = percentile(times, 99)
+        print(f"{script:<18}"
+              f"{f'{len(times)}/{expected * len(runs)}':>10}"
+              f"{len(times) / total_seconds:>12.3f}"
+              f"{p50 if p50 is not None else float('nan'):>10.2f}"
+              f"{p99 if p99 is not None else float('nan'):>10.2f}"
+              f"{total_seconds / len(runs):>10.1f}")
+    print("=" * 78)
+    print("Time-to-book is measured from the bot's launch (Chrome start and login included).")
+
+    # Average seconds per step and run, from each bot's own metrics
+    step_names = sorted({step for runs in results.values() for result in runs for step in result["steps"]})
+    if step_names:
+        print(f"\n{'Step (s per run)':<22}" + "".join(f"{script[:16]:>18}" for script in results))
+        for step in step_names:
+            cells = []
+            for runs in results.values():
+                cells.append(sum(result["steps"].get(step, 0.0) for result in runs) / len(runs))
+            print(f"{step:<22}" + "".join(f"{cell:>18.2f}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,505 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from dotenv import load_dotenv
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.http_client import get_client
+from toolkit.driver_pool import DriverPool
+from toolkit.browser_waits import (AdaptiveTimeout, wait_for, wait_for_clickable, wait_for_present,
+                                   text_changed, POLL_INTERVAL)
+from toolkit.metrics import timer, observe, report
+from toolkit.retry import RetryPolicy
+from schedule_snapshot import schedule_snapshot, find_target_classes, CLASS_CARD_CLASS
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+load_dotenv()
+
+GYM_URL = os.getenv("GYM_URL", "https://appbrewery.github.io/gym/")
+
+# Used when no targets file is given: the .env account books these
+TARGET_DAYS = ["Tue", "Thu"]
+TARGET_TIME = "6:00 PM"
+
+# One Chrome profile per account, so logins and bookings never mix
+PROFILE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chrome_profiles")
+
+# Browsers start and log in this long before booking opens
+WARMUP_SECONDS = 60
+
+# The last part of the wait for the opening moment is a busy loop, because
+# time.sleep() can wake up several milliseconds late
+SPIN_SECONDS = 0.05
+
+# Clock sync: HEAD requests this far apart until the server's Date header
+# ticks over (the spacing bounds the error), for at most CLOCK_SYNC_SECONDS
+CLOCK_POLL_INTERVAL = 0.02
+CLOCK_SYNC_SECONDS = 2.5
+
+LOGIN_DEADLINE = 60  # Seconds an account may keep failing to log in
+GO_GRACE_SECONDS = 30  # Workers give up this long after the opening moment if never released
+MAX_CLICK_RETRIES = 5
+TAKEN_STATUSES = ["Booked", "Waitlisted"]
+
+# Targets file (passwords stay in .env, the file only names the variables):
+# {
+#   "accounts": {
+#     "me": {"email_env": "ACCOUNT_EMAIL", "password_env": "ACCOUNT_PASSWORD"},
+#     "partner": {"email_env": "PARTNER_EMAIL", "password_env": "PARTNER_PASSWORD"}
+#   },
+#   "targets": [
+#     {"account": "me", "day": "Tue", "time": "6:00 PM"},
+#     {"account": "partner", "day": "Tue", "time": "6:00 PM"}
+#   ]
+# }
+#
+# Example:
+#   python booking_scheduler.py --targets booking_targets.json --open-at "2026-10-20 06:00:00+02:00"
+
+
+def load_targets(path=None):
+    """
+    Accounts and the classes each one should book.
+
+    Args:
+        path: Targets JSON file (None books TARGET_DAYS at TARGET_TIME for
+              ACCOUNT_EMAIL / ACCOUNT_PASSWORD)
+
+    Returns:
+        tuple: ({account: (email, password)}, {account: [(day, time), ...]})
+
+    Raises:
+        ValueError: If an account's credentials are missing from the environment
+    """
+    if path is None:
+        config = {
+            "accounts": {"me": {"email_env": "ACCOUNT_EMAIL", "password_env": "ACCOUNT_PASSWORD"}},
+            "targets": [{"account": "me", "day": day, "time": TARGET_TIME} for day in TARGET_DAYS],
+        }
+    else:
+        with open(path, encoding="utf-8") as file:
+            config = json.load(file)
+
+    accounts = {}
+    for name, account in config["accounts"].items():
+        email = os.getenv(account["email_env"])
+        password = os.getenv(account["password_env"])
+        if not email or not password:
+            raise ValueError(f"Missing {account['email_env']} / {account['password_env']} for account '{name}'")
+        accounts[name] = (email, password)
+
+    targets = {}
+    for target in config["targets"]:
+        if target["account"] not in accounts:
+            raise ValueError(f"Target for unknown account '{target['account']}'")
+        targets.setdefault(target["account"], []).append((target["day"], target["time"]))
+    return accounts, targets
+
+
+# ==============================================================================
+# CLOCK
+# ==============================================================================
+
+def server_clock_offset(url=GYM_URL, interval=CLOCK_POLL_INTERVAL, max_seconds=CLOCK_SYNC_SECONDS):
+    """
+    Seconds to add to the local clock to get the server's clock.
+
+    The Date header only has whole seconds, so the server is polled until the
+    header ticks over: that tick happened between the last two requests,
+    which pins the offset down to about one round-trip instead of one second.
+
+    Args:
+        url: Page on the booking server
+        interval: Seconds between requests
+        max_seconds: Give up looking for a tick after this long
+
+    Returns:
+        float: Offset in seconds (0.0 if the server doesn't send a Date)
+    """
+    client = get_client()
+    previous = None
+    give_up_at = time.time() + max_seconds
+    while True:
+        sent = time.time()
+        try:
+            response = client.request("HEAD", url)
+        except requests.exceptions.RequestException as e:
+            print(f"✗ Could not read the server clock ({e}), using the local clock")
+            return 0.0
+        received = time.time()
+
+        header = response.headers.get("Date")
+        if not header:
+            return 0.0
+        server_time = parsedate_to_datetime(header).timestamp()
+        middle = (sent + received) / 2
+        if previous is not None and server_time != previous[0]:
+            # The new second started between the two requests
+            return server_time - (previous[1] + middle) / 2
+        if received > give_up_at:
+            # Never saw a tick: the server second is on average half over
+            return server_time + 0.5 - middle
+        previous = (server_time, middle)
+        time.sleep(interval)
+
+
+def opening_time(text):
+    """
+    Parse --open-at. The UTC offset is required, so the moment doesn't depend
+    on the timezone of the machine running the bot.
+
+    Raises:
+        argparse.ArgumentTypeError: If the text isn't an ISO time with an offset
+    """
+    try:
+        moment = datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO date and time: {text!r}")
+    if moment.tzinfo is None:
+        raise argparse.ArgumentTypeError(f"add the gym's UTC offset, e.g. {text}+02:00")
+    return moment
+
+
+def sleep_until(moment, spin=SPIN_SECONDS):
+    """Sleep until time.time() reaches moment, finishing with a busy loop."""
+    while True:
+        remaining = moment - time.time()
+        if remaining <= 0:
+            return
+        if remaining > spin:
+            time.sleep(remaining - spin)
+
+
+# ==============================================================================
+# BROWSER SESSIONS
+# ==============================================================================
+
+def open_schedule(driver, email, password):
+    """
+    Load the schedule page, logging in first if the profile isn't logged in.
+
+    Raises:
+        TimeoutException: If the login kept failing for LOGIN_DEADLINE seconds
+    """
+    def attempt():
+        driver.get(GYM_URL)
+        wait_for(driver, lambda d: d.find_elements(By.ID, "schedule-page") or d.find_elements(By.ID, "login-button"),
+                 timeout=10, message="Gym page did not load")
+        if driver.find_elements(By.ID, "schedule-page"):
+            return
+
+        driver.find_element(By.ID, "login-button").click()
+        email_input = wait_for_clickable(driver, (By.ID, "email-input"), timeout=5)
+        email_input.clear()
+        email_input.send_keys(email)
+        password_input = driver.find_element(By.ID, "password-input")
+        password_input.clear()
+        password_input.send_keys(password)
+        driver.find_element(By.ID, "submit-button").click()
+        wait_for_present(driver, (By.ID, "schedule-page"), timeout=5)
+
+    RetryPolicy(
+        retry_on=(TimeoutException,), deadline=LOGIN_DEADLINE, base_delay=0.25, name="login",
+        on_retry=lambda attempt, error, delay: print(f"✗ Login attempt {attempt} for {email} failed, retrying..."),
+    ).call(attempt)
+
+
+def refresh_schedule(driver, wanted):
+    """
+    Reload the schedule and read it, waiting only as long as needed for the
+    wanted classes to show up.
+
+    Args:
+        driver: Logged-in WebDriver
+        wanted: List of (day, time)
+
+    Returns:
+        list: Snapshot of the classes matching wanted
+    """
+    driver.refresh()
+    wait_for_present(driver, (By.CLASS_NAME, CLASS_CARD_CLASS), timeout=10)
+
+    def matches(classes):
+        return [gym_class for day, class_time in wanted
+                for gym_class in find_target_classes(classes, [day], class_time)]
+
+    def all_found(driver):
+        found = matches(schedule_snapshot(driver))
+        found_keys = {(gym_class["day"], gym_class["time"]) for gym_class in found}
+        return found if all(target in found_keys for target in wanted) else False
+
+    # The first cards can be there before all of them are
+    try:
+        return wait_for(driver, all_found, timeout=5)
+    except TimeoutException:
+        # Some wanted classes aren't on the schedule; book the ones that are
+        return matches(schedule_snapshot(driver))
+
+
+def book_all(driver, classes, fired_at):
+    """
+    Click every wanted class at once, then collect the answers.
+
+    All clicks go out before the first answer is awaited, so the classes are
+    booked in parallel instead of one after the other. Clicks that didn't
+    take are sent again, up to MAX_CLICK_RETRIES rounds.
+
+    Args:
+        driver: WebDriver on the schedule page
+        classes: Snapshot dicts of the classes to book
+        fired_at: time.perf_counter() at the opening moment
+
+    Returns:
+        dict: (date, time, name) -> seconds from the opening moment until the
+        button changed (only for classes that changed)
+    """
+    click_timeout = AdaptiveTimeout(initial=2.0, minimum=0.5, maximum=10.0)
+    booked_after = {}
+    pending = [gym_class for gym_class in classes if gym_class["status"] not in TAKEN_STATUSES]
+
+    def changed(gym_class):
+        return text_changed(gym_class["button"], gym_class["status"])(driver)
+
+    def mark_booked(gym_class):
+        key = (gym_class["date"], gym_class["time"], gym_class["name"])
+        booked_after[key] = time.perf_counter() - fired_at
+        pending.remove(gym_class)
+
+    for round_number in range(MAX_CLICK_RETRIES):
+        if not pending:
+            break
+        for gym_class in list(pending):
+            # An answer that came after the last round's wait already
+            # changed it; a click on "Booked"/"Waitlisted" would cancel it
+            if round_number and changed(gym_class):
+                mark_booked(gym_class)
+                continue
+            try:
+                gym_class["button"].click()
+            except WebDriverException as e:
+                print(f"  ✗ Click failed on {gym_class['name']} ({gym_class['date']}): {e}")
+
+        # Watch every button in the same loop, so each answer is seen as
+        # soon as it arrives
+        clicked_at = time.monotonic()
+        deadline = clicked_at + click_timeout.timeout
+        while pending and time.monotonic() < deadline:
+            for gym_class in list(pending):
+                if changed(gym_class):
+                    click_timeout.record(time.monotonic() - clicked_at)
+                    mark_booked(gym_class)
+            time.sleep(POLL_INTERVAL)
+        if pending:
+            click_timeout.expired()
+
+    return booked_after
+
+
+# ==============================================================================
+# SCHEDULER
+# ==============================================================================
+
+class BookingScheduler:
+    """
+    Book classes for many accounts at the same moment.
+
+    Every account gets its own warm Chrome (separate profile, so cookies and
+    local storage are isolated), logged in ahead of time. At the opening
+    moment all accounts reload the schedule and click at once.
+
+    Args:
+        accounts: {account: (email, password)}
+        targets: {account: [(day, time), ...]}
+        headless: Run without windows (None reads BROWSER_HEADLESS)
+    """
+
+    def __init__(self, accounts, targets, headless=None):
+        self.accounts = accounts
+        self.targets = targets
+        self.pools = {
+            name: DriverPool(
+                size=1,
+                profile_root=os.path.join(PROFILE_ROOT, name),
+                setup=lambda driver, credentials=accounts[name]: open_schedule(driver, *credentials),
+                headless=headless,
+            )
+            for name in targets
+        }
+        self._go = threading.Event()
+        self._cancelled = False
+        self._go_timeout = None
+        self._fired_at = None
+
+    def warm_up(self):
+        """Start and log in every browser, all in parallel."""
+        with ThreadPoolExecutor(max_workers=len(self.pools)) as executor:
+            list(executor.map(lambda pool: pool.start(), self.pools.values()))
+
+    def fire(self):
+        """Release every account at once."""
+        self._fired_at = time.perf_counter()
+        self._go.set()
+
+    def cancel(self):
+        """Release every account without booking (they return their browsers)."""
+        self._cancelled = True
+        self._go.set()
+
+    def _book_account(self, name):
+        wanted = self.targets[name]
+        with self.pools[name].lease() as driver:
+            if not self._go.wait(self._go_timeout):
+                raise TimeoutError("never released to book")
+            if self._cancelled:
+                return []
+            with timer("schedule_refresh"):
+                classes = refresh_schedule(driver, wanted)
+            with timer("book_all"):
+                booked_after = book_all(driver, classes, self._fired_at)
+            for seconds in booked_after.values():
+                observe("time_to_book", seconds)
+
+            # One more snapshot gives the final state of every button
+            final = {(c["date"], c["time"], c["name"]): c["status"] for c in schedule_snapshot(driver)}
+
+        results = []
+        for gym_class in classes:
+            key = (gym_class["date"], gym_class["time"], gym_class["name"])
+            results.append({
+                "account": name,
+                "day": gym_class["day"],
+                "date": gym_class["date"],
+                "time": gym_class["time"],
+                "class_name": gym_class["name"],
+                "before": gym_class["status"],
+                "after": final.get(key, gym_class["status"]),
+                "seconds": booked_after.get(key),
+            })
+        return results
+
+    def run(self, open_at=None, clock_offset=0.0):
+        """
+        Wait for the opening moment, then book everything in parallel.
+
+        Args:
+            open_at: Server time (timestamp) when booking opens; None books now
+            clock_offset: Result of server_clock_offset()
+
+        Returns:
+            list: One result dict per class found
+        """
+        local_moment = time.time() if open_at is None else open_at - clock_offset
+        self._go_timeout = max(0.0, local_moment - time.time()) + GO_GRACE_SECONDS
+        with ThreadPoolExecutor(max_workers=len(self.pools)) as executor:
+            futures = [executor.submit(self._book_account, name) for name in self.pools]
+
+            # Workers hold their browsers until released: an error or Ctrl-C
+            # while waiting must still let them go, or the executor never exits
+            try:
+                if open_at is not None:
+                    if local_moment < time.time():
+                        print("✗ Booking already opened during warm-up, booking now")
+                    sleep_until(local_moment)
+                self.fire()
+            finally:
+                if not self._go.is_set():
+                    self.cancel()
+
+            results = []
+            for name, future in zip(self.pools, futures):
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    print(f"✗ Account '{name}' failed: {e}")
+        return results
+
+    def close(self):
+        for pool in self.pools.values():
+            pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Book gym classes for several accounts the moment booking opens.")
+    parser.add_argument("--targets", help="Targets JSON file (default: the .env account, TARGET_DAYS at TARGET_TIME)")
+    parser.add_argument("--open-at", type=opening_time,
+                        help='When booking opens by the gym server\'s clock, with its UTC offset, '
+                             'e.g. "2026-10-20 06:00:00+02:00" (default: now)')
+    parser.add_argument("--warmup", type=float, default=WARMUP_SECONDS,
+                        help="Seconds before opening to start the browsers")
+    parser.add_argument("--headless", action="store_true", help="Run without windows")
+    args = parser.parse_args()
+
+    accounts, targets = load_targets(args.targets)
+    print(f"{sum(len(wanted) for wanted in targets.values())} targets for {len(targets)} account(s)")
+
+    # ==========================================================================
+    # STEP 1: Sync with the server clock and wait for the warm-up moment
+    # ==========================================================================
+    open_at = args.open_at.timestamp() if args.open_at else None
+    with timer("clock_sync"):
+        offset = server_clock_offset()
+    print(f"✓ Server clock is {offset:+.3f}s from the local clock")
+    if open_at is not None:
+        warmup_at = open_at - offset - args.warmup
+        if warmup_at > time.time():
+            print(f"Waiting until {datetime.fromtimestamp(warmup_at):%H:%M:%S} (local time) to start the browsers...")
+            sleep_until(warmup_at)
+
+    # ==========================================================================
+    # STEP 2: Start and log in every browser
+    # ==========================================================================
+    scheduler = BookingScheduler(accounts, targets, headless=args.headless or None)
+    try:
+        start_time = time.perf_counter()
+        with timer("warm_up"):
+            scheduler.warm_up()
+        print(f"✓ {len(targets)} browser(s) ready in {time.perf_counter() - start_time:.1f}s")
+
+        # ======================================================================
+        # STEP 3: Book everything at the opening moment
+        # ======================================================================
+        if open_at is not None:
+            print(f"Booking at {args.open_at:%H:%M:%S} (server time)...")
+        results = scheduler.run(open_at, offset)
+    finally:
+        scheduler.close()
+
+    # ==========================================================================
+    # STEP 4: Summary
+    # ==========================================================================
+    print("\n" + "=" * 70)
+    print("BOOKING SUMMARY")
+    print("=" * 70)
+    for result in results:
+        label = f"{result['account']}: {result['class_name']} on {result['date']} at {result['time']}"
+        if result["before"] in TAKEN_STATUSES:
+            print(f"✓ Already {result['before'].lower()}: {label}")
+        elif result["seconds"] is not None:
+            print(f"✓ {result['after']}: {label} ({result['seconds']:.2f}s after opening)")
+        else:
+            print(f"✗ Not booked: {label}")
+    found = {(result["account"], result["day"], result["time"]) for result in results}
+    missing = sum(len(wanted) for wanted in targets.values()) - len(found)
+    if missing > 0:
+        print(f"✗ {missing} target(s) not found on the schedule")
+    print("=" * 70)
+
+    # Where the run spent its time (BOT_METRICS_FILE=run.json also saves it)
+    report()
+
+
+if __name__ == "__main__":
+    main()
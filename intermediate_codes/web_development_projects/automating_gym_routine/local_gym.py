@@ -0,0 +1,394 @@
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# A local copy of https://appbrewery.github.io/gym/ with the same ids and
+# class names, so the bots run against it unchanged (GYM_URL=http://...).
+DEFAULT_PORT = 8765
+
+# Every API call waits LATENCY (+ up to JITTER) seconds
+LATENCY = 0.2
+JITTER = 0.1
+
+# Share of booking requests answered with a 503, like the flaky network of
+# the real site (the bots click again when the button doesn't change)
+FAILURE_RATE = 0.5
+LOGIN_FAILURE_RATE = 0.0
+
+# Schedule size
+DAYS = 7
+CLASSES_PER_DAY = 6
+FULL_RATE = 0.25  # Share of classes that are full (booking joins the waitlist)
+
+CLASS_NAMES = ["Yoga", "Spin", "HIIT", "Pilates", "Boxing", "Zumba", "CrossFit", "Stretch"]
+CLASS_TIMES = ["6:00 AM", "7:00 AM", "8:00 AM", "12:00 PM", "5:00 PM", "6:00 PM", "7:00 PM", "8:00 PM"]
+
+PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Gym (local)</title>
+<style>
+  body { font-family: sans-serif; margin: 2rem; }
+  nav a, nav button { margin-right: 1rem; }
+  .ClassCard_card__KpCx5, .MyBookings_bookingCard__VRdrR { border: 1px solid #ccc; padding: .5rem; margin: .5rem 0; }
+  .hidden { display: none; }
+</style>
+</head>
+<body>
+<nav>
+  <a id="schedule-link" href="#" class="hidden">Schedule</a>
+  <a id="my-bookings-link" href="#" class="hidden">My Bookings</a>
+  <button id="login-button" class="hidden">Login</button>
+</nav>
+<main id="app"></main>
+<script>
+const app = document.getElementById("app");
+const account = () => localStorage.getItem("gymAccount");
+
+function api(path, body) {
+    const options = body === undefined ? {} :
+        {method: "POST", headers: {"Content-Type": "application/json"}, body: JSON.stringify(body)};
+    return fetch(path, options).then((response) => {
+        if (!response.ok) { throw new Error("HTTP " + response.status); }
+        return response.json();
+    });
+}
+
+function element(tag, attributes, text) {
+    const node = document.createElement(tag);
+    Object.assign(node, attributes || {});
+    if (text !== undefined) { node.textContent = text; }
+    return node;
+}
+
+function showNav() {
+    const loggedIn = !!account();
+    document.getElementById("login-button").classList.toggle("hidden", loggedIn);
+    document.getElementById("schedule-link").classList.toggle("hidden", !loggedIn);
+    document.getElementById("my-bookings-link").classList.toggle("hidden", !loggedIn);
+}
+
+function showLogin() {
+    app.replaceChildren(
+        element("input", {id: "email-input", type: "email", placeholder: "Email"}),
+        element("input", {id: "password-input", type: "password", placeholder: "Password"}),
+        element("button", {id: "submit-button"}, "Log In"),
+    );
+    document.getElementById("submit-button").onclick = () => {
+        const email = document.getElementById("email-input").value;
+        const password = document.getElementById("password-input").value;
+        api("/api/login", {email, password}).then(() => {
+            localStorage.setItem("gymAccount", email);
+            showNav();
+            showSchedule();
+        }).catch(() => {});
+    };
+}
+
+function book(button, classId) {
+    if (button.dataset.pending) { return; }
+    button.dataset.pending = "1";
+    api("/api/book", {account: account(), class_id: classId})
+        .then((result) => { button.textContent = result.status; })
+        .catch(() => {})
+        .finally(() => { delete button.dataset.pending; });
+}
+
+function showSchedule() {
+    api("/api/schedule?account=" + encodeURIComponent(account())).then((days) => {
+        const page = element("div", {id: "schedule-page"});
+        for (const day of days) {
+            const group = element("div", {className: "Schedule_dayGroup__y79__"});
+            group.append(element("h2", {}, day.heading));
+            for (const gymClass of day.classes) {
+                const card = element("div", {className: "ClassCard_card__KpCx5"});
+                const button = element("button", {}, gymClass.status);
+                button.onclick = () => {
+                    if (button.textContent === "Book Class" || button.textContent === "Join Waitlist") {
+                        book(button, gymClass.id);
+                    }
+                };
+                card.append(element("h3", {}, gymClass.name), element("p", {}, "Time: " + gymClass.time), button);
+                group.append(card);
+            }
+            page.append(group);
+        }
+        app.replaceChildren(page);
+    }).catch(() => setTimeout(showSchedule, 500));
+}
+
+function showBookings() {
+    api("/api/bookings?account=" + encodeURIComponent(account())).then((bookings) => {
+        const page = element("div", {id: "my-bookings-page"});
+        for (const booking of bookings) {
+            const card = element("div", {className: "MyBookings_bookingCard__VRdrR"});
+            const label = booking.status === "Booked" ? "Cancel Booking" : "Leave Waitlist";
+            card.append(element("h3", {}, booking.name), element("p", {}, booking.date + " " + booking.time),
+                        element("button", {}, label));
+            page.append(card);
+        }
+        app.replaceChildren(page);
+    }).catch(() => setTimeout(showBookings, 500));
+}
+
+document.getElementById("login-button").onclick = showLogin;
+document.getElementById("schedule-link").onclick = (event) => { event.preventDefault(); showSchedule(); };
+document.getElementById("my-bookings-link").onclick = (event) => { event.preventDefault(); showBookings(); };
+showNav();
+if (account()) { showSchedule(); }
+</script>
+</body>
+</html>
+"""
+
+
+def day_heading(day, offset):
+    """ "Today (Tue, Oct 20)", "Tomorrow (Wed, Oct 21)", then "Thu, Oct 22". """
+    label = f"{day:%a}, {day:%b} {day.day}"
+    if offset == 0:
+        return f"Today ({label})"
+    if offset == 1:
+        return f"Tomorrow ({label})"
+    return label
+
+
+def make_schedule(days=DAYS, classes_per_day=CLASSES_PER_DAY, full_rate=FULL_RATE, seed=0, start=None):
+    """
+    A random but repeatable class schedule.
+
+    Every day has a 6:00 PM class (the bots' target time); bigger days repeat
+    the time slots.
+
+    Returns:
+        list: Class dicts with "id", "day", "heading", "date", "name", "time", "full"
+    """
+    rng = random.Random(seed)
+    start = start or date.today()
+    first_slot = CLASS_TIMES.index("6:00 PM")
+    classes = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        slots = sorted((first_slot + n) % len(CLASS_TIMES) for n in range(classes_per_day))
+        for slot in slots:
+            classes.append({
+                "id": len(classes),
+                "day": f"{day:%a}",
+                "heading": day_heading(day, offset),
+                "date": f"{day:%a}, {day:%b} {day.day}",
+                "name": rng.choice(CLASS_NAMES),
+                "time": CLASS_TIMES[slot],
+                "full": rng.random() < full_rate,
+            })
+    return classes
+
+
+class LocalGym:
+    """
+    The gym booking site, served from this machine.
+
+    Bookings are kept per account in memory, and every successful booking is
+    logged with its time.perf_counter() so a benchmark can time the bots.
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+        latency: Seconds every API call waits
+        jitter: Extra random seconds, up to this much
+        failure_rate: Share of booking requests that fail with a 503
+        login_failure_rate: Share of login requests that fail with a 503
+        days: Days on the schedule
+        classes_per_day: Classes on each day
+        full_rate: Share of classes that are full
+        seed: Seed for the schedule and the failures
+    """
+
+    def __init__(self, port=DEFAULT_PORT, latency=LATENCY, jitter=JITTER, failure_rate=FAILURE_RATE,
+                 login_failure_rate=LOGIN_FAILURE_RATE, days=DAYS, classes_per_day=CLASSES_PER_DAY,
+                 full_rate=FULL_RATE, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.login_failure_rate = login_failure_rate
+        self.classes = make_schedule(days, classes_per_day, full_rate, seed)
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.bookings = {}
+        self.events = []
+        self.failures = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self):
+        """Forget every booking (the schedule stays the same)."""
+        with self.lock:
+            self.bookings.clear()
+            self.events.clear()
+            self.failures = 0
+
+    def targets(self, days, class_time):
+        """Number of classes on one of the days at class_time."""
+        return sum(1 for gym_class in self.classes if gym_class["day"] in days and gym_class["time"] == class_time)
+
+    # ==========================================================================
+    # API
+    # ==========================================================================
+
+    def _wait(self):
+        time.sleep(self.latency + self.random.random() * self.jitter)
+
+    def _fails(self, rate):
+        with self.lock:
+            failed = self.random.random() < rate
+            if failed:
+                self.failures += 1
+        return failed
+
+    def schedule(self, account):
+        days = {}
+        with self.lock:
+            for gym_class in self.classes:
+                status = self.bookings.get((account, gym_class["id"]))
+                if status is None:
+                    status = "Join Waitlist" if gym_class["full"] else "Book Class"
+                day = days.setdefault(gym_class["heading"], {"heading": gym_class["heading"], "classes": []})
+                day["classes"].append({"id": gym_class["id"], "name": gym_class["name"],
+                                       "time": gym_class["time"], "status": status})
+        return list(days.values())
+
+    def book(self, account, class_id):
+        gym_class = self.classes[class_id]
+        with self.lock:
+            key = (account, class_id)
+            if key not in self.bookings:
+                self.bookings[key] = "Waitlisted" if gym_class["full"] else "Booked"
+                self.events.append({"at": time.perf_counter(), "account": account,
+                                    "class_id": class_id, "status": self.bookings[key]})
+            return self.bookings[key]
+
+    def account_bookings(self, account):
+        bookings = []
+        with self.lock:
+            for (owner, class_id), status in self.bookings.items():
+                if owner == account:
+                    gym_class = self.classes[class_id]
+                    bookings.append({"name": gym_class["name"], "date": gym_class["date"],
+                                     "time": gym_class["time"], "status": status})
+        return bookings
+
+    def _handler(self):
+        gym = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body, content_type="application/json"):
+                data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                account = parse_qs(url.query).get("account", [""])[0]
+                if url.path in ("/", "/gym/", "/index.html"):
+                    self._send(200, PAGE_HTML, "text/html; charset=utf-8")
+                elif url.path == "/api/schedule":
+                    gym._wait()
+                    self._send(200, gym.schedule(account))
+                elif url.path == "/api/bookings":
+                    gym._wait()
+                    self._send(200, gym.account_bookings(account))
+                elif url.path == "/api/stats":
+                    with gym.lock:
+                        self._send(200, {"events": list(gym.events), "failures": gym.failures})
+                else:
+                    self._send(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send(400, {"error": "bad json"})
+                    return
+
+                if self.path == "/api/login":
+                    gym._wait()
+                    if gym._fails(gym.login_failure_rate):
+                        self._send(503, {"error": "network error"})
+                    else:
+                        self._send(200, {"account": body.get("email", "")})
+                elif self.path == "/api/book":
+                    gym._wait()
+                    if gym._fails(gym.failure_rate):
+                        self._send(503, {"error": "network error"})
+                    elif not isinstance(body.get("class_id"), int) or not 0 <= body["class_id"] < len(gym.classes):
+                        self._send(400, {"error": "unknown class"})
+                    else:
+                        self._send(200, {"status": gym.book(body.get("account", ""), body["class_id"])})
+                elif self.path == "/api/reset":
+                    gym.reset()
+                    self._send(200, {"ok": True})
+                else:
+                    self._send(404, {"error": "not found"})
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local copy of the gym booking site.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=LATENCY, help="Seconds each API call takes")
+    parser.add_argument("--jitter", type=float, default=JITTER, help="Extra random seconds per call")
+    parser.add_argument("--failure-rate", type=float, default=FAILURE_RATE, help="Share of bookings that fail")
+    parser.add_argument("--login-failure-rate", type=float, default=LOGIN_FAILURE_RATE, help="Share of logins that fail")
+    parser.add_argument("--days", type=int, default=DAYS, help="Days on the schedule")
+    parser.add_argument("--classes-per-day", type=int, default=CLASSES_PER_DAY, help="Classes on each day")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the schedule and the failures")
+    args = parser.parse_args()
+
+    gym = LocalGym(args.port, args.latency, args.jitter, args.failure_rate, args.login_failure_rate,
+                   args.days, args.classes_per_day, seed=args.seed)
+    print(f"✓ Local gym on {gym.url} (Ctrl+C to stop)")
+    print(f"  Run a bot against it with GYM_URL={gym.url}")
+    try:
+        gym.server.serve_forever()
+    except KeyboardInterrupt:
+        gym.server.server_close()
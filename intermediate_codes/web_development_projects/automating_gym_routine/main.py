@@ -3,43 +3,50 @@ from selenium.common.exceptions import WebDriverException, NoSuchElementExceptio
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
-from selenium import webdriver
 from dotenv import load_dotenv
 import calendar
-import time
+import sys
 import os
 
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.browser import make_driver
+from toolkit.browser_waits import AdaptiveTimeout, wait_for_text_change, wait_for_clickable
+from toolkit.metrics import timer, timed, report
+from toolkit.retry import RetryPolicy
+from schedule_snapshot import wait_for_bookings
+
 DAYS_OF_THE_WEEK = list(calendar.day_name)
 
 load_dotenv()
 ACCOUNT_EMAIL = os.environ["ACCOUNT_EMAIL"]
 ACCOUNT_PASSWORD = os.environ["ACCOUNT_PASSWORD"]
 
-# Keep Chrome browser open after program finishes
-chrome_options = webdriver.ChromeOptions()
-chrome_options.add_experimental_option(name="detach", value=True)
-
 # User profile
 user_data_dir = os.path.join(os.getcwd(), "chrome_profile")
-chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
 
-# Create a driver
-driver = webdriver.Chrome(options=chrome_options)
+# Create a lean driver (no images, fonts or trackers) that stays open after
+# the program finishes. BROWSER_HEADLESS=1 in .env runs it without a window.
+driver = make_driver(profile_dir=user_data_dir, detach=True)
 
-# Navigate to the webpage
-URL = "https://appbrewery.github.io/gym/"
-driver.get(url=URL)
+# Navigate to the webpage (GYM_URL in the environment points the bot at
+# another copy of the site, e.g. local_gym.py)
+URL = os.getenv("GYM_URL", "https://appbrewery.github.io/gym/")
+with timer("page_load", page="gym"):
+    driver.get(url=URL)
 
 wait = WebDriverWait(driver, timeout=2)
 
+# Time to wait for the server after a click: adapts to the site's speed
+click_timeout = AdaptiveTimeout(initial=2.0, minimum=0.5, maximum=10.0)
 
+
+@timed()
 def login():
     login_button = driver.find_element(by=By.ID, value="login-button")
     login_button.click()
 
-    time.sleep(0.5)
-
-    email = driver.find_element(by=By.ID, value="email-input")
+    email = wait_for_clickable(driver, (By.ID, "email-input"), timeout=5)
     email.clear()
     email.send_keys(ACCOUNT_EMAIL)
 
@@ -53,51 +60,52 @@ def login():
     wait.until(ec.presence_of_element_located((By.ID, "schedule-page")))
 
 
-def retry(func, retries=7, description=None):
-    for n in range(retries):
-        print(f"Trying {description}. Attempt: {n + 1}")
-        try:
-            return func()
-        except TimeoutException:
-            if n == retries - 1:
-                raise
-            time.sleep(1)
+def retry(func, deadline=60, description=None):
+    # Retry timeouts with exponential backoff until the deadline (seconds)
+    print(f"Trying {description}...")
+    policy = RetryPolicy(retry_on=(TimeoutException,), deadline=deadline, base_delay=0.25, name=description,
+                         on_retry=lambda attempt, error, delay: print(f"Attempt {attempt} failed, retrying..."))
+    return policy.call(func)
 
 
-def click_until_success(button, max_attempts=5):
+# Clicks are retried for up to 15 seconds (the site drops about half of them)
+click_retry = RetryPolicy(retry_on=(WebDriverException,), deadline=15, base_delay=0.05, max_delay=1.0,
+                          name="book_click",
+                          on_retry=lambda attempt, error, delay: print(f"  ✗ No change (attempt {attempt}), retrying in {delay:.1f}s..."))
+
+
+@timed("book_click")
+def click_until_success(button):
     """
     Simple function: Click button until the click works (50% network fail).
 
     Args:
         button: The button element to click
-        max_attempts: Maximum number of click attempts
 
     Returns:
         bool: True if click succeeded, False otherwise
     """
     initial_text = button.text
 
-    for attempt in range(1, max_attempts + 1):
-        try:
-            print(f"  → Attempt {attempt}: Clicking '{initial_text}'...")
-            button.click()
+    def click_once():
+        # An answer that came after the last wait already changed it; a
+        # click on "Booked"/"Waitlisted" would cancel it again
+        if button.text != initial_text:
+            return
+        print(f"  → Clicking '{initial_text}'...")
+        button.click()
 
-            # Wait a moment for the change to happen
-            time.sleep(2)
+        # Wait until the button text changes (means click worked)
+        wait_for_text_change(driver, button, initial_text, adaptive=click_timeout)
 
-            # Check if button text changed (means click worked)
-            if button.text != initial_text:
-                print(f"  ✓ Success! Changed to '{button.text}'")
-                return True
-            else:
-                print(f"  ✗ No change, retrying...")
+    try:
+        click_retry.call(click_once)
+    except WebDriverException:
+        print(f"  ✗ Failed after {click_retry.deadline} seconds")
+        return False
 
-        except Exception as e:
-            print(f"  ✗ Error on attempt {attempt}: {e}")
-            time.sleep(0.5)
-
-    print(f"  ✗ Failed after {max_attempts} attempts")
-    return False
+    print(f"  ✓ Success! Changed to '{button.text}'")
+    return True
 
 
 # def click_and_wait_for_h1(link, expected_h1_text, max_attempts=5):
@@ -127,6 +135,7 @@ retry(login, description="login")
 print("\n✓ Successfully logged\n")
 
 
+@timed("booking")
 def booking_class():
     class_schedule_days = driver.find_elements(by=By.CLASS_NAME, value="Schedule_dayGroup__y79__")
 
@@ -166,7 +175,7 @@ def booking_class():
                     # Only click if NOT already booked/waitlisted
                     if status not in ["Booked", "Waitlisted"]:
                         print(f"Booking: {class_name} on {class_date}")
-                        click_until_success(join_class_button, max_attempts=5)
+                        click_until_success(join_class_button)
                         # Update status after clicking
                         status = join_class_button.text
 
@@ -210,8 +219,9 @@ def booking_class():
     my_booking_link = driver.find_element(by=By.ID, value="my-bookings-link")
     my_booking_link.click()
 
-    # Wait for bookings page to load
-    time.sleep(1)
+    # Wait for the fetched bookings to be on the page
+    with timer("bookings_verify"):
+        wait_for_bookings(driver, expected=processed_class)
 
     # Verify bookings
     confirmed_booked_classes = driver.find_elements(by=By.CLASS_NAME, value="MyBookings_bookingCard__VRdrR")
@@ -240,4 +250,7 @@ def booking_class():
         print(f"❌ MISMATCH: Difference of {abs(processed_class - verification_count)} bookings")
 
 
-retry(booking_class, description="Booking")
\ No newline at end of file
+retry(booking_class, description="Booking")
+
+# Where the run spent its time (BOT_METRICS_FILE=run.json also saves it)
+report()
@@ -1,14 +1,22 @@
 import os
 import sys
-import time
 import calendar
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from dotenv import load_dotenv
 
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.browser import make_driver
+from toolkit.driver_pool import lease_warm_driver
+from toolkit.browser_waits import AdaptiveTimeout, wait_for_text_change, wait_for_clickable
+from toolkit.metrics import timer, timed, report
+from toolkit.retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from toolkit.journal import Journal
+from schedule_snapshot import schedule_snapshot, find_target_classes, bookings_snapshot, wait_for_bookings
+
 # ==============================================================================
 # CONFIGURATION
 # ==============================================================================
@@ -18,10 +26,20 @@ TARGET_DAYS = ["Tue", "Thu"]  # Days to book classes
 TARGET_TIME = "6:00 PM"  # Preferred class time
 DAYS_OF_THE_WEEK = list(calendar.day_name)
 
-# Network retry settings
-MAX_LOGIN_RETRIES = 7  # Maximum login attempts
-MAX_BOOKING_RETRIES = 7  # Maximum booking process attempts
-MAX_CLICK_RETRIES = 5  # Maximum retries for individual button clicks
+# Retry budgets: how long each step may keep failing before giving up.
+# Retries back off exponentially (with jitter), so a short network hiccup
+# only costs as long as it lasts.
+LOGIN_DEADLINE = 60  # Seconds for logging in
+BOOKING_DEADLINE = 120  # Seconds for the whole booking pass
+CLICK_DEADLINE = 15  # Seconds for one class button
+
+# After this many failed clicks in a row the site is treated as down: the
+# remaining classes are skipped at once instead of each using its budget
+BOOKING_BREAKER = CircuitBreaker(failure_threshold=15, reset_timeout=10, name="Gym booking")
+
+# How long to wait for the server to answer a click. It starts at 2 seconds
+# and then adapts to how fast the site has been answering.
+CLICK_TIMEOUT = AdaptiveTimeout(initial=2.0, minimum=0.5, maximum=10.0)
 
 # Load credentials from .env file
 load_dotenv()
@@ -31,24 +49,45 @@ ACCOUNT_PASSWORD = os.getenv("ACCOUNT_PASSWORD")
 if not ACCOUNT_EMAIL or not ACCOUNT_PASSWORD:
     raise ValueError("Missing credentials in .env file. Please add ACCOUNT_EMAIL and ACCOUNT_PASSWORD")
 
+# Classes booked or waitlisted are recorded in .journal/ (one file per
+# account). The page always wins: the journal only decides for buttons that
+# show neither a taken nor a bookable state (e.g. still updating after a
+# restart). A class the page offers again is booked again.
+JOURNAL = Journal(f"gym_bookings_{ACCOUNT_EMAIL}")
+TAKEN_STATUSES = ["Booked", "Waitlisted"]
+BOOKABLE_STATUSES = ["Book Class", "Join Waitlist"]
+
 # ==============================================================================
 # SETUP CHROME DRIVER
 # ==============================================================================
 
-# Configure Chrome options
-chrome_options = webdriver.ChromeOptions()
-chrome_options.add_experimental_option(name="detach", value=True)
-
 # Use persistent Chrome profile to save login sessions
 user_data_dir = os.path.join(os.getcwd(), "chrome_profile")
-chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
 
-# Initialize Chrome driver
-driver = webdriver.Chrome(options=chrome_options)
+# Reuse a warm, already logged-in Chrome when `python -m toolkit.driver_pool`
+# is running; otherwise start a lean Chrome driver (no images, fonts or
+# trackers). BROWSER_HEADLESS=1 in .env runs it without a window.
+warm_lease = lease_warm_driver()
+if warm_lease:
+    driver = warm_lease.driver
+    print(f"Using warm Chrome session on port {warm_lease.port}")
+else:
+    driver = make_driver(profile_dir=user_data_dir, detach=True)
+
+
+def close_browser():
+    if warm_lease:
+        # Give the session back to the pool instead of closing Chrome
+        warm_lease.release()
+    else:
+        driver.quit()
+
 
-# Navigate to gym booking website
-GYM_URL = "https://appbrewery.github.io/gym/"
-driver.get(GYM_URL)
+# Navigate to gym booking website (GYM_URL in the environment points the bot
+# at another copy of the site, e.g. local_gym.py)
+GYM_URL = os.getenv("GYM_URL", "https://appbrewery.github.io/gym/")
+with timer("page_load", page="gym"):
+    driver.get(GYM_URL)
 
 print(f"Navigated to: {GYM_URL}\n")
 
@@ -57,83 +96,95 @@ print(f"Navigated to: {GYM_URL}\n")
 # UTILITY FUNCTIONS
 # ==============================================================================
 
-def retry_with_attempts(func, retries, description):
+def retry_step(func, deadline, description):
     """
-    Retry a function multiple times if it fails.
+    Run a step, retrying network timeouts with backoff until the deadline.
 
     Args:
         func: Function to execute
-        retries: Maximum number of retry attempts
+        deadline: Seconds the step may keep failing
         description: Description for logging
 
     Returns:
         Result of the function if successful
     """
-    for attempt in range(1, retries + 1):
-        print(f"Trying {description}. Attempt: {attempt}/{retries}")
-        try:
-            return func()
-        except TimeoutException as e:
-            if attempt == retries:
-                # Final attempt failed - display friendly error and exit
-                print("\n" + "=" * 70)
-                print(f"❌ ERROR: {description} Failed After {retries} Attempts")
-                print("=" * 70)
-                print("Reason: Network timeout - the page did not load in time")
-                print("\nPossible causes:")
-                print("  • Internet connection is slow or unstable")
-                print("  • Gym website is down or not responding")
-                print("  • Firewall or antivirus blocking connection")
-                print("\nPlease check your connection and try again.")
-                print("=" * 70 + "\n")
-                driver.quit()
-                sys.exit(1)
-
-            print(f"✗ Attempt {attempt} failed, retrying...\n")
-            time.sleep(1)
-
-
-def click_until_text_changes(button, max_attempts=5):
+    policy = RetryPolicy(
+        retry_on=(TimeoutException,), deadline=deadline, base_delay=0.25, name=description.lower(),
+        on_retry=lambda attempt, error, delay: print(f"✗ Attempt {attempt} failed, retrying in {delay:.1f}s...\n"),
+    )
+    print(f"Trying {description}...")
+    try:
+        return policy.call(func)
+    except TimeoutException:
+        # Budget used up - display friendly error and exit
+        print("\n" + "=" * 70)
+        print(f"❌ ERROR: {description} Failed After {deadline} Seconds")
+        print("=" * 70)
+        print("Reason: Network timeout - the page did not load in time")
+        print("\nPossible causes:")
+        print("  • Internet connection is slow or unstable")
+        print("  • Gym website is down or not responding")
+        print("  • Firewall or antivirus blocking connection")
+        print("\nPlease check your connection and try again.")
+        print("=" * 70 + "\n")
+        close_browser()
+        sys.exit(1)
+
+
+# Clicks are retried until the button text changes (the site drops about half
+# of the requests). Any WebDriver error, including the timeout, counts as a
+# failed click.
+CLICK_RETRY = RetryPolicy(
+    retry_on=(WebDriverException,), deadline=CLICK_DEADLINE, base_delay=0.05, max_delay=1.0,
+    breaker=BOOKING_BREAKER, name="book_click",
+    on_retry=lambda attempt, error, delay: print(f"  ✗ No change detected ({type(error).__name__}), retrying..."),
+)
+
+
+@timed("book_click")
+def click_until_text_changes(button, initial_text=None):
     """
     Click button repeatedly until text changes (handles 50% network failure).
 
     Args:
         button: Selenium WebElement to click
-        max_attempts: Maximum number of click attempts
+        initial_text: Current button text, if already known (saves a round-trip)
 
     Returns:
         bool: True if button text changed, False otherwise
     """
-    initial_text = button.text
-
-    for attempt in range(1, max_attempts + 1):
-        try:
-            print(f"  → Attempt {attempt}/{max_attempts}: Clicking '{initial_text}'...")
-            button.click()
-
-            # Wait for server response
-            time.sleep(2)
-
-            # Verify button text changed (indicates successful click)
-            current_text = button.text
-            if current_text != initial_text:
-                print(f"  ✓ Success! Button changed to '{current_text}'")
-                return True
-            else:
-                print(f"  ✗ No change detected, retrying...")
-
-        except Exception as e:
-            print(f"  ✗ Error on attempt {attempt}: {e}")
-            time.sleep(0.5)
-
-    print(f"  ✗ Failed after {max_attempts} attempts")
-    return False
+    if initial_text is None:
+        initial_text = button.text
+
+    def click_once():
+        # An answer that came after the last wait already changed it; a
+        # click on "Booked"/"Waitlisted" would cancel it again
+        if button.text != initial_text:
+            return
+        print(f"  → Clicking '{initial_text}'...")
+        button.click()
+        # Wait for server response: return as soon as the button text
+        # changes (indicates successful click)
+        wait_for_text_change(driver, button, initial_text, adaptive=CLICK_TIMEOUT)
+
+    try:
+        CLICK_RETRY.call(click_once)
+    except CircuitOpenError as e:
+        print(f"  ✗ Skipped: {e}")
+        return False
+    except WebDriverException:
+        print(f"  ✗ Failed after {CLICK_DEADLINE} seconds")
+        return False
+
+    print(f"  ✓ Success! Button changed to '{button.text}'")
+    return True
 
 
 # ==============================================================================
 # STEP 1: Login to gym account
 # ==============================================================================
 
+@timed()
 def login():
     """
     Authenticate user with email and password.
@@ -143,10 +194,8 @@ def login():
     login_button = driver.find_element(By.ID, "login-button")
     login_button.click()
 
-    time.sleep(0.5)
-
-    # Enter email
-    email_input = driver.find_element(By.ID, "email-input")
+    # Enter email (as soon as the login form is shown)
+    email_input = wait_for_clickable(driver, (By.ID, "email-input"), timeout=5)
     email_input.clear()
     email_input.send_keys(ACCOUNT_EMAIL)
 
@@ -164,15 +213,23 @@ def login():
     wait.until(EC.presence_of_element_located((By.ID, "schedule-page")))
 
 
-# Execute login with retry mechanism
-retry_with_attempts(login, retries=MAX_LOGIN_RETRIES, description="Login")
-print("✓ Successfully logged in\n")
+def is_logged_in():
+    return bool(driver.find_elements(By.ID, "schedule-page"))
+
+
+# Execute login with retry mechanism (warm sessions are usually logged in already)
+if is_logged_in():
+    print("✓ Already logged in\n")
+else:
+    retry_step(login, deadline=LOGIN_DEADLINE, description="Login")
+    print("✓ Successfully logged in\n")
 
 
 # ==============================================================================
 # STEP 2: Book classes automatically
 # ==============================================================================
 
+@timed("booking")
 def book_classes():
     """
     Main booking function:
@@ -182,8 +239,9 @@ def book_classes():
     4. Verify bookings on My Bookings page
     """
 
-    # Find all day groups in schedule
-    schedule_days = driver.find_elements(By.CLASS_NAME, "Schedule_dayGroup__y79__")
+    # Read the whole schedule in one round-trip; matching happens in Python
+    with timer("schedule_scan"):
+        target_classes = find_target_classes(schedule_snapshot(driver), TARGET_DAYS, TARGET_TIME)
 
     # Statistics tracking
     booked_count = 0
@@ -193,77 +251,60 @@ def book_classes():
 
     # Data storage
     class_bookings = []
-    verified_bookings = []
-    new_button_status = ""
 
     print("=" * 70)
     print("SCANNING SCHEDULE FOR AVAILABLE CLASSES")
     print("=" * 70 + "\n")
 
     # ==============================================================================
-    # Scan schedule and book classes
+    # Book the target classes
     # ==============================================================================
 
-    for day_group in schedule_days:
-        # Extract date from heading
-        date_heading = day_group.find_element(By.TAG_NAME, "h2").text
-
-        # Parse "Today" or "Tomorrow" dates
-        if "Tomorrow" in date_heading or "Today" in date_heading:
-            start_idx = date_heading.index("(") + 1
-            end_idx = date_heading.index(")")
-            date_heading = date_heading[start_idx:end_idx]
-
-        # Check if this is a target day (Tuesday or Thursday)
-        if any(day in date_heading for day in TARGET_DAYS):
-            day_abbrev = date_heading.split()[0].replace(",", "")
-            full_date = date_heading
-
-            # Find all classes on this day
-            class_cards = day_group.find_elements(By.CLASS_NAME, "ClassCard_card__KpCx5")
-
-            for card in class_cards:
-                # Extract class information
-                class_time_raw = card.find_element(By.TAG_NAME, "p").text
-                class_time = class_time_raw.replace("Time: ", "")
-                class_name = card.find_element(By.TAG_NAME, "h3").text
-
-                # Check if this is the target time
-                if class_time == TARGET_TIME:
-                    booking_button = card.find_element(By.TAG_NAME, "button")
-                    button_status = booking_button.text
-
-                    # Attempt booking if not already booked/waitlisted
-                    if button_status not in ["Booked", "Waitlisted"]:
-                        print(f"📋 Attempting to book: {class_name} on {full_date}")
-                        click_until_text_changes(booking_button, max_attempts=MAX_CLICK_RETRIES)
-                        # Update status after click
-                        new_button_status = booking_button.text
-
-                    # Log result based on final status
-                    if new_button_status:
-                        if new_button_status == "Waitlisted":
-                            print(f"⏳ Joined waitlist: {class_name} on {full_date}")
-                            waitlist_count += 1
-                        else:
-                            print(f"✓ Successfully booked: {class_name} on {full_date}")
-                            booked_count += 1
-                    elif button_status == "Waitlisted":
-                        print(f"⏳ Already Waitlisted: {class_name} on {full_date}")
-                        already_booked_count += 1
-                    else:
-                        print(f"✓ Already booked: {class_name} on {full_date}")
-                        already_booked_count += 1
-
-                    # Store booking information
-                    class_bookings.append({
-                        "class_name": class_name,
-                        "day": day_abbrev,
-                        "date": full_date,
-                        "status": button_status
-                    })
-
-                    processed_classes += 1
+    for gym_class in target_classes:
+        class_name = gym_class["name"]
+        full_date = gym_class["date"]
+        button_status = gym_class["status"]
+        new_button_status = ""
+        class_id = f"{full_date} {gym_class['time']} {class_name}"
+
+        # Booked by an earlier run, and the page can't tell otherwise
+        if class_id in JOURNAL and button_status not in TAKEN_STATUSES + BOOKABLE_STATUSES:
+            button_status = JOURNAL.entries[class_id].get("status", "Booked")
+
+        # Attempt booking if not already booked/waitlisted
+        if button_status not in ["Booked", "Waitlisted"]:
+            print(f"📋 Attempting to book: {class_name} on {full_date}")
+            booking_button = gym_class["button"]
+            click_until_text_changes(booking_button, initial_text=button_status)
+            # Update status after click
+            new_button_status = booking_button.text
+            if new_button_status in ["Booked", "Waitlisted"]:
+                JOURNAL.record(class_id, status=new_button_status)
+
+        # Log result based on final status
+        if new_button_status:
+            if new_button_status == "Waitlisted":
+                print(f"⏳ Joined waitlist: {class_name} on {full_date}")
+                waitlist_count += 1
+            else:
+                print(f"✓ Successfully booked: {class_name} on {full_date}")
+                booked_count += 1
+        elif button_status == "Waitlisted":
+            print(f"⏳ Already Waitlisted: {class_name} on {full_date}")
+            already_booked_count += 1
+        else:
+            print(f"✓ Already booked: {class_name} on {full_date}")
+            already_booked_count += 1
+
+        # Store booking information
+        class_bookings.append({
+            "class_name": class_name,
+            "day": gym_class["day"],
+            "date": full_date,
+            "status": button_status
+        })
+
+        processed_classes += 1
 
     # Convert day abbreviations to full names
     for day_name in DAYS_OF_THE_WEEK:
@@ -301,28 +342,21 @@ def book_classes():
     print("VERIFYING BOOKINGS")
     print("=" * 70 + "\n")
 
-    my_bookings_link = driver.find_element(By.ID, "my-bookings-link")
-    my_bookings_link.click()
-
-    # Wait for page to load
-    time.sleep(1)
+    with timer("bookings_verify"):
+        my_bookings_link = driver.find_element(By.ID, "my-bookings-link")
+        my_bookings_link.click()
 
-    # Find all booking cards
-    booking_cards = driver.find_elements(By.CLASS_NAME, "MyBookings_bookingCard__VRdrR")
+        # Wait for the fetched bookings to be on the page
+        wait_for_bookings(driver, expected=processed_classes)
 
-    for card in booking_cards:
-        class_name = card.find_element(By.TAG_NAME, "h3").text
-        reserve_button = card.find_element(By.TAG_NAME, "button")
-        reserve_type = reserve_button.text.split()[1]  # "Cancel Booking" or "Leave Waitlist"
+        # Read all booking cards in one round-trip
+        verified_bookings = bookings_snapshot(driver)
 
-        verified_bookings.append({
-            "class_name": class_name,
-            "reserve_type": reserve_type
-        })
-        if reserve_type == "Booking":
-            print(f"✓ Verified: {class_name} ({reserve_type})")
+    for booking in verified_bookings:
+        if booking["reserve_type"] == "Booking":
+            print(f"✓ Verified: {booking['class_name']} ({booking['reserve_type']})")
         else:
-            print(f"✓ Verified: {class_name}")
+            print(f"✓ Verified: {booking['class_name']}")
 
     # ==============================================================================
     # Final verification check
@@ -347,12 +381,17 @@ def book_classes():
 
 
 # Execute booking with retry mechanism
-retry_with_attempts(book_classes, retries=MAX_BOOKING_RETRIES, description="Booking")
+retry_step(book_classes, deadline=BOOKING_DEADLINE, description="Booking")
 
 print("=" * 70)
 print("BOOKING PROCESS COMPLETED")
 print("=" * 70)
 
+JOURNAL.close()
+
+# Where the run spent its time (BOT_METRICS_FILE=run.json also saves it)
+report()
+
 # Keep browser open for user inspection
 input("\nPress Enter to close the browser...")
-driver.quit()
\ No newline at end of file
+close_browser()
\ No newline at end of file
@@ -0,0 +1,142 @@
+import os
+import sys
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.browser_waits import wait_for, wait_for_present, count_above
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+DAY_GROUP_CLASS = "Schedule_dayGroup__y79__"
+CLASS_CARD_CLASS = "ClassCard_card__KpCx5"
+BOOKING_CARD_CLASS = "MyBookings_bookingCard__VRdrR"
+
+# The My Bookings page is only rendered once the bookings have been fetched
+BOOKINGS_PAGE_ID = "my-bookings-page"
+BOOKINGS_TIMEOUT = 10
+
+# Each script reads a whole page in one WebDriver round-trip, instead of a
+# find_element + .text call per tag of every card.
+
+# Returns [{heading, classes: [{time, name, status, button}]}]. The button is
+# returned as a DOM node, which Selenium turns into a WebElement to click.
+SCHEDULE_JS = f"""
+const text = (node) => node ? node.innerText.trim() : "";
+return Array.from(document.querySelectorAll(".{DAY_GROUP_CLASS}")).map((group) => ({{
+    heading: text(group.querySelector("h2")),
+    classes: Array.from(group.querySelectorAll(".{CLASS_CARD_CLASS}")).map((card) => ({{
+        time: text(card.querySelector("p")),
+        name: text(card.querySelector("h3")),
+        status: text(card.querySelector("button")),
+        button: card.querySelector("button"),
+    }})),
+}}));
+"""
+
+# Returns [{name, button_text}] for every card on My Bookings
+BOOKINGS_JS = f"""
+const text = (node) => node ? node.innerText.trim() : "";
+return Array.from(document.querySelectorAll(".{BOOKING_CARD_CLASS}")).map((card) => ({{
+    name: text(card.querySelector("h3")),
+    button_text: text(card.querySelector("button")),
+}}));
+"""
+
+
+def clean_date_heading(heading):
+    """
+    "Tomorrow (Tue, Aug 12)" -> "Tue, Aug 12"; other headings are unchanged.
+    """
+    if "Tomorrow" in heading or "Today" in heading:
+        return heading[heading.index("(") + 1:heading.index(")")]
+    return heading
+
+
+def schedule_snapshot(driver):
+    """
+    Every class on the schedule page, read in one round-trip.
+
+    Args:
+        driver: Selenium WebDriver on the schedule page
+
+    Returns:
+        list: Dicts with "date", "day", "time", "name", "status" and "button"
+        (WebElement), in page order
+    """
+    classes = []
+    for group in driver.execute_script(SCHEDULE_JS):
+        date = clean_date_heading(group["heading"])
+        day = date.split()[0].replace(",", "") if date else ""
+        for card in group["classes"]:
+            classes.append({
+                "date": date,
+                "day": day,
+                "time": card["time"].replace("Time: ", ""),
+                "name": card["name"],
+                "status": card["status"],
+                "button": card["button"],
+            })
+    return classes
+
+
+def find_target_classes(classes, target_days, target_time):
+    """
+    Classes on one of the target days at the target time.
+
+    Args:
+        classes: Result of schedule_snapshot()
+        target_days: Day abbreviations, e.g. ["Tue", "Thu"]
+        target_time: Class time, e.g. "6:00 PM"
+
+    Returns:
+        list: The matching class dicts
+    """
+    return [
+        gym_class for gym_class in classes
+        if any(day in gym_class["date"] for day in target_days) and gym_class["time"] == target_time
+    ]
+
+
+def bookings_snapshot(driver):
+    """
+    Every card on the My Bookings page, read in one round-trip.
+
+    Args:
+        driver: Selenium WebDriver on the My Bookings page
+
+    Returns:
+        list: Dicts with "class_name" and "reserve_type" ("Booking" or "Waitlist")
+    """
+    return [
+        {
+            "class_name": card["name"],
+            # "Cancel Booking" -> "Booking", "Leave Waitlist" -> "Waitlist"
+            "reserve_type": card["button_text"].split()[1] if len(card["button_text"].split()) > 1 else "",
+        }
+        for card in driver.execute_script(BOOKINGS_JS)
+    ]
+
+
+def wait_for_bookings(driver, expected=0, timeout=BOOKINGS_TIMEOUT):
+    """
+    Wait until the My Bookings page has loaded its booking cards.
+
+    Args:
+        driver: Selenium WebDriver, just after clicking "My Bookings"
+        expected: Cards to wait for; fewer after the timeout is not an error
+            (the verification reports the difference)
+        timeout: Seconds to wait for the page, then for the cards
+
+    Raises:
+        TimeoutException: If the page itself never loads
+    """
+    wait_for_present(driver, (By.ID, BOOKINGS_PAGE_ID), timeout=timeout)
+    if expected:
+        try:
+            wait_for(driver, count_above((By.CLASS_NAME, BOOKING_CARD_CLASS), expected - 1), timeout=timeout)
+        except TimeoutException:
+            pass
@@ -1,41 +1,101 @@
-from bs4 import BeautifulSoup
-import requests
+import os
+import sys
 
-response = requests.get(url="https://news.ycombinator.com/news")
-yc_web_page = response.text
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.http_cache import HttpCache
+from toolkit.html_parsing import HtmlDocument, strainer
+from toolkit.html_stream import RecordSpec, stream_records
 
-soup = BeautifulSoup(yc_web_page, "html.parser")
+URL = "https://news.ycombinator.com/news"
 
-with open(file="soup.html", mode="w") as file:
-    file.write(soup.prettify())
+# STREAMING = True lee la página por partes y extrae cada post en cuanto se
+# cierra su fila; con False la página pasa por la caché en disco
+STREAMING = False
 
-posts = soup.find_all('tr', class_='athing submission')
+# Guardar el HTML crudo (sin prettify) en soup.html, solo para depurar
+DEBUG_DUMP = False
+DUMP_FILE = "soup.html"
 
-post_titles = [posts[idx].select(".titleline a")[0].getText() for idx in range(len(posts))]
+# Registros que se extraen en modo streaming
+POST_RECORDS = [
+    RecordSpec("post", "tr.athing.submission", {
+        "id": (None, "id"),
+        "title": ("span.titleline a", "text"),
+        "link": ("span.titleline a", "href"),
+    }),
+    RecordSpec("score", "span.score", {
+        "id": (None, "id"),
+        "points": (None, "text"),
+    }),
+]
 
-hyperlinks = [posts[idx].select(".titleline a")[0].get("href") for idx in range(len(posts))]
 
+def parse_posts(yc_web_page):
+    """
+    Extract title, link and score of every post on the Hacker News page.
 
-# Lista para guardar los scores
-scores = []
+    Args:
+        yc_web_page: HTML of the page
 
-# Recorrer cada post
-for post in posts:
-    # Buscar la siguiente fila (ahí está el score)
-    next_row = post.find_next_sibling('tr')
+    Returns:
+        list: [title, link, score] for each post
+    """
+    # Solo se parsean las filas de la tabla (selectolax/lxml si están instalados)
+    document = HtmlDocument(yc_web_page, only=strainer("tr"))
 
-    # Buscar el span con clase 'score' en esa fila
-    score_element = next_row.find('span', class_='score')
+    post_ids = document.attrs("tr.athing.submission", "id")
+    post_titles = document.texts("tr.athing.submission .titleline > a")
+    hyperlinks = document.attrs("tr.athing.submission .titleline > a", "href")
 
-    # Si encontramos el score, extraer el número
-    if score_element:
-        # score_element.text da algo como "847 points"
-        # .split()[0] toma solo "847"
-        score_number = score_element.text.split()[0]
-        scores.append(int(score_number))
-    else:
-        # Si no hay score (como en job posts), poner 0
-        scores.append(0)
+    # Cada score tiene el id "score_<id del post>", así no hace falta
+    # buscar la fila siguiente de cada post
+    score_by_id = {
+        score_id.replace("score_", ""): int(score_text.split()[0])
+        for score_id, score_text in zip(document.attrs("span.score", "id"), document.texts("span.score"))
+    }
+
+    # Si no hay score (como en job posts), poner 0
+    scores = [score_by_id.get(post_id, 0) for post_id in post_ids]
+
+    return [list(post) for post in zip(post_titles, hyperlinks, scores)]
+
+
+def stream_posts():
+    """
+    Same result as parse_posts(), but reading the page in chunks.
+
+    Returns:
+        list: [title, link, score] for each post
+    """
+    posts = {}
+    dump_path = DUMP_FILE if DEBUG_DUMP else None
+    for kind, record in stream_records(URL, POST_RECORDS, dump_path=dump_path):
+        if kind == "post":
+            posts[record["id"]] = [record["title"], record["link"], 0]
+        else:
+            # El score llega después de su post: "score_<id del post>"
+            post_id = record["id"].replace("score_", "")
+            if post_id in posts:
+                posts[post_id][2] = int(record["points"].split()[0])
+    return list(posts.values())
+
+
+if STREAMING:
+    posts = stream_posts()
+else:
+    # La página solo se descarga y se parsea de nuevo si cambió desde la última vez
+    cache = HttpCache()
+    posts = cache.get_parsed(URL, parse_posts, name="posts")
+
+    # Se guarda aquí y no en parse_posts(), que no se ejecuta si la caché acierta
+    if DEBUG_DUMP:
+        with open(file=DUMP_FILE, mode="w", encoding="utf-8") as file:
+            file.write(cache.get(URL).text)
+
+post_titles = [post[0] for post in posts]
+hyperlinks = [post[1] for post in posts]
+scores = [post[2] for post in posts]
 
 max_score = max(scores)
 idx = scores.index(max_score)
@@ -43,4 +103,3 @@ idx = scores.index(max_score)
 print(f'The post with maximun amount of points is '
       f'"{post_titles[idx]}" and its likn address is '
       f'{hyperlinks[idx]}')
-
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit import html_parsing
+from toolkit.html_parsing import HtmlDocument, strainer
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Saved copy of the Zillow clone page (~318 KB)
+HTML_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zillow_data.html")
+
+# Times each parser runs; the best run is reported
+ROUNDS = 20
+
+LINK_SELECTOR = 'a[data-test="property-card-link"]'
+PRICE_SELECTOR = 'span[data-test="property-card-price"]'
+LISTING_TAGS = strainer(attrs={"data-test": ["property-card-link", "property-card-price"]})
+
+
+def baseline(html):
+    """The original approach: full html.parser tree, then find_all()."""
+    soup = BeautifulSoup(html, features="html.parser")
+    links = soup.find_all(name="a", attrs={'data-test': 'property-card-link'})
+    prices = soup.find_all(name="span", attrs={'data-test': 'property-card-price'})
+    return len(links), len(prices)
+
+
+def with_document(backend, parser=None, only=None):
+    def run(html):
+        document = HtmlDocument(html, only=only, backend=backend, parser=parser)
+        return len(document.attrs(LINK_SELECTOR, "href")), len(document.texts(PRICE_SELECTOR))
+    return run
+
+
+def best_time(func, html):
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = func(html)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    with open(file=HTML_FILE, mode="r", encoding="utf-8") as file:
+        html = file.read()
+
+    print(f"File: {os.path.basename(HTML_FILE)} ({len(html.encode('utf-8')) / 1024:.0f} KB), best of {ROUNDS}\n")
+
+    candidates = [
+        ("html.parser, full tree (original)", baseline),
+        ("html.parser + SoupStrainer", with_document("bs4", parser="html.parser", only=LISTING_TAGS)),
+    ]
+    if html_parsing.PARSER == "lxml":
+        candidates += [
+            ("lxml, full tree", with_document("bs4", parser="lxml")),
+            ("lxml + SoupStrainer", with_document("bs4", parser="lxml", only=LISTING_TAGS)),
+        ]
+    else:
+        print("(lxml not installed, skipping lxml runs)")
+    if html_parsing.FastHTMLParser is not None:
+        candidates.append(("selectolax", with_document("selectolax")))
+    else:
+        print("(selectolax not installed, skipping selectolax run)")
+
+    base_time = None
+    print(f"{'Parser':<36}{'ms/page':>10}{'speedup':>10}{'links/prices':>15}")
+    print("-" * 71)
+    for name, func in candidates:
+        elapsed, (links, prices) = best_time(func, html)
+        base_time = base_time or elapsed
+        print(f"{name:<36}{elapsed * 1000:>10.2f}{base_time / elapsed:>9.1f}x{f'{links}/{prices}':>15}")
+
+
+if __name__ == "__main__":
+    main()
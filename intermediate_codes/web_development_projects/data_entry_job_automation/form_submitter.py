@@ -0,0 +1,183 @@
+import os
+import re
+import sys
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.http_client import get_client, ConnectFailed
+from toolkit.metrics import timed
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Responses posted at the same time
+MAX_WORKERS = 8
+
+# Question data Google embeds in every form page
+LOAD_DATA_PATTERN = re.compile(r"FB_PUBLIC_LOAD_DATA_\s*=\s*(.*?);\s*</script>", re.DOTALL)
+
+# Older forms (and prefilled links) name their inputs directly
+ENTRY_NAME_PATTERN = re.compile(r'name="(entry\.\d+)"')
+
+# Why a response failed. Only NOT_SENT and REJECTED are safe to send again:
+# after a read timeout or a dropped answer Google may already have the response.
+NOT_SENT = "not_sent"
+REJECTED = "rejected"
+UNKNOWN = "unknown"
+
+
+def form_response_url(form_url):
+    """
+    Endpoint that receives the answers of a form.
+
+    Args:
+        form_url: ".../forms/d/e/<id>/viewform" URL (query string allowed)
+
+    Returns:
+        str: ".../forms/d/e/<id>/formResponse"
+    """
+    base = form_url.split("?")[0].rstrip("/")
+    return re.sub(r"/(viewform|formResponse)$", "", base) + "/formResponse"
+
+
+def find_entry_ids(form_html):
+    """
+    Field names of the form questions, in the order they appear.
+
+    Args:
+        form_html: HTML of the viewform page
+
+    Returns:
+        list: e.g. ["entry.1148208384", "entry.2089532745", "entry.1617342287"]
+    """
+    match = LOAD_DATA_PATTERN.search(form_html)
+    if match:
+        try:
+            questions = json.loads(match.group(1))[1][1]
+            return [f"entry.{question[4][0][0]}" for question in questions if question[4]]
+        except (ValueError, IndexError, TypeError):
+            pass
+    return list(dict.fromkeys(ENTRY_NAME_PATTERN.findall(form_html)))
+
+
+def failure_reason(error):
+    """
+    Whether a failed post can have reached the form.
+
+    Args:
+        error: Exception raised by FormSubmitter.submit()
+
+    Returns:
+        str: NOT_SENT (never reached the server), REJECTED (answered with a
+            non-2xx status) or UNKNOWN (the response may have been recorded)
+    """
+    if isinstance(error, ConnectFailed):
+        return NOT_SENT
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return REJECTED
+    return UNKNOWN
+
+
+class FormSubmitter:
+    """
+    Submit Google Form responses with plain HTTP POSTs instead of a browser.
+
+    All posts share the pooled client from toolkit/http_client.py, which
+    retries 429 and 5xx responses with backoff.
+
+    Args:
+        form_url: Link to the form (viewform URL or short forms.gle link)
+        entry_ids: Field names in answer order; found on the form page if omitted
+        client: HttpClient to use (defaults to the shared one)
+        max_workers: Responses posted at the same time
+    """
+
+    def __init__(self, form_url, entry_ids=None, client=None, max_workers=MAX_WORKERS):
+        self.client = client or get_client()
+        self.max_workers = max_workers
+        self.form_url = form_url
+        self.entry_ids = list(entry_ids or [])
+        self.response_url = None
+        self._done = 0
+        self._lock = threading.Lock()
+
+    def prepare(self):
+        """
+        Load the form page once to find the endpoint and the field names.
+
+        Raises:
+            requests.exceptions.RequestException: If the page can't be loaded
+            ValueError: If the form has no text fields
+        """
+        response = self.client.get(self.form_url)
+        response.raise_for_status()
+        # Short links redirect to the real form URL
+        self.response_url = form_response_url(response.url)
+        if not self.entry_ids:
+            self.entry_ids = find_entry_ids(response.text)
+        if not self.entry_ids:
+            raise ValueError("No entry.* fields found on the form page")
+
+    @timed("form_fill", mode="http")
+    def submit(self, answers):
+        """
+        Post one response.
+
+        Args:
+            answers: Values in the same order as the form questions
+
+        Raises:
+            requests.exceptions.RequestException: On network or HTTP errors
+        """
+        if self.response_url is None:
+            self.prepare()
+        data = dict(zip(self.entry_ids, answers))
+        data.update({"fvv": "1", "pageHistory": "0"})
+        response = self.client.post(self.response_url, data=data)
+        response.raise_for_status()
+
+    def submit_many(self, rows, progress=True, on_success=None):
+        """
+        Post many responses concurrently.
+
+        Args:
+            rows: List of answer lists
+            progress: Print one line per finished response
+            on_success: Optional on_success(row) called (from a worker
+                thread) as soon as a row is posted, e.g. to journal it
+
+        Returns:
+            dict: Index of each failed row -> failure_reason() (empty when
+                all succeeded)
+        """
+        if self.response_url is None:
+            self.prepare()
+        self._done = 0
+        total = len(rows)
+
+        def work(row):
+            try:
+                self.submit(row)
+            except requests.exceptions.RequestException as e:
+                error = e
+            else:
+                error = None
+                if on_success:
+                    on_success(row)
+            with self._lock:
+                self._done += 1
+                done = self._done
+            if progress:
+                print(f"✓ Submitted {done}/{total}" if error is None else f"✗ Failed {done}/{total}: {error}")
+            return error
+
+        if not rows:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as executor:
+            errors = list(executor.map(work, rows))
+        return {n: failure_reason(error) for n, error in enumerate(errors) if error is not None}
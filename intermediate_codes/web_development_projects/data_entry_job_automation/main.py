@@ -1,96 +1,206 @@
-import time
-
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from selenium import webdriver
 import requests
+import sys
 import os
 
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.http_cache import HttpCache
+from toolkit.html_parsing import HtmlDocument, strainer
+from toolkit.html_stream import RecordSpec, stream_records
+from toolkit.browser import make_driver
+from toolkit.browser_waits import AdaptiveTimeout, wait_for, count_above
+from toolkit.metrics import timer, report
+from toolkit.journal import Journal
+from form_submitter import FormSubmitter, NOT_SENT, REJECTED, UNKNOWN
+
 load_dotenv()
 GOOGLE_FORM = os.environ["GOOGLE_FORM"]
 
+# Optional: "entry.123,entry.456,entry.789" (address, price, link). When empty
+# the field names are read from the form page.
+FORM_ENTRY_IDS = [entry for entry in os.environ.get("FORM_ENTRY_IDS", "").split(",") if entry]
+
+# "http" posts the answers straight to the form (seconds for hundreds of
+# listings); "selenium" types them in the browser. Responses that fail over
+# HTTP before reaching Google, or that Google rejects, are entered with
+# Selenium as a fallback. Ones that may have gone through (e.g. a read
+# timeout) are journaled as "unknown" and listed instead of sent twice.
+SUBMIT_MODE = "http"
 
-# User-Agent Header to identify the browser making the request
-HEADER = {
-    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) "
-                  "AppleWebKit/537.36 (KHTML, like Gecko) "
-                  "Chrome/140.0.0.0 Safari/537.36"
-}
+
+# The User-Agent is set once for all scrapers in toolkit/http_client.py
 
 # Billboard Hot 100 chart URL with the specified date
 URL = "https://appbrewery.github.io/Zillow-Clone/"
 
-# Fetch and parse Billboard webpage
+# Only the listing links and prices are parsed, not the whole page
+LINK_SELECTOR = 'a[data-test="property-card-link"]'
+PRICE_SELECTOR = 'span[data-test="property-card-price"]'
+LISTING_TAGS = strainer(attrs={"data-test": ["property-card-link", "property-card-price"]})
+
+# STREAMING = True reads the page in chunks and extracts each listing card as
+# soon as it closes; False goes through the on-disk cache instead
+STREAMING = False
+
+# Listings already submitted are recorded (by link) in .journal/, so a run
+# that stops halfway resumes with the rest. Delete the file to submit all
+# listings again.
+JOURNAL_NAME = "form_submissions"
+
+# Save the raw page HTML (no prettify) for debugging
+DEBUG_DUMP = False
+DUMP_FILE = "zillow_data.html"
+
+# One record per listing card, used in streaming mode
+CARD_RECORD = RecordSpec("card", 'article[data-test="property-card"]', {
+    "link": ('a[data-test="property-card-link"]', "href"),
+    "address": ('address[data-test="property-card-addr"]', "text"),
+    "price": ('span[data-test="property-card-price"]', "text"),
+})
+
+
+def parse_listings(zillow_html):
+    """
+    Extract addresses, prices and links of every listing on the page.
+
+    Args:
+        zillow_html: HTML of the Zillow clone page
+
+    Returns:
+        dict: "addresses", "prices" and "links" lists
+    """
+    # Parse only the listing tags (selectolax/lxml when installed)
+    document = HtmlDocument(zillow_html, only=LISTING_TAGS)
+    property_links = document.attrs(LINK_SELECTOR, "href")
+    property_texts = document.texts(LINK_SELECTOR)
+    property_tag_prices = document.texts(PRICE_SELECTOR)
+
+    listings = {"addresses": [], "prices": [], "links": []}
+    for n in range(len(property_links)):
+        if n % 2 == 0:
+            listings["links"].append(property_links[n])
+            listings["addresses"].append(property_texts[n].strip())
+
+    for n in range(len(property_tag_prices)):
+        listings["prices"].append(
+            property_tag_prices[n].strip()[:6].replace("+", "")
+        )
+    return listings
+
+
+def stream_listings():
+    """
+    Same result as parse_listings(), but each card is extracted while the
+    page is still downloading.
+
+    Returns:
+        dict: "addresses", "prices" and "links" lists
+    """
+    listings = {"addresses": [], "prices": [], "links": []}
+    dump_path = DUMP_FILE if DEBUG_DUMP else None
+    for _, card in stream_records(URL, [CARD_RECORD], dump_path=dump_path):
+        listings["links"].append(card["link"])
+        listings["addresses"].append(card["address"])
+        listings["prices"].append((card["price"] or "")[:6].replace("+", ""))
+    return listings
+
+
+# Fetch and parse the listings page (reused from the on-disk cache if unchanged)
 try:
-    response = requests.get(url=URL, headers=HEADER)
-    response.encoding = "utf-8"
-    response.raise_for_status()  # Raise error for bad status codes
-    billboard_html = response.text
+    with timer("listings_fetch", streaming=STREAMING):
+        if STREAMING:
+            listings = stream_listings()
+        else:
+            cache = HttpCache()
+            listings = cache.get_parsed(URL, parse_listings, name="listings")
+            # Written here and not in parse_listings(), which is skipped on a cache hit
+            if DEBUG_DUMP:
+                with open(file=DUMP_FILE, mode="w", encoding="utf-8") as file:
+                    file.write(cache.get(URL).text)
 except requests.exceptions.RequestException as e:
     print(f"Error fetching data: {e}")
     exit()
 
-# Parse HTML content with BeautifulSoup
-soup = BeautifulSoup(billboard_html, features="html.parser")
-
-with open(file="zillow_data.html", mode="w", encoding="utf-8") as file:
-    file.write(soup.prettify())
-
-# property_links_raw = soup.find_all()
-property_tags = soup.find_all(name="a", attrs={'data-test':'property-card-link'})
-property_tag_prices = soup.find_all(name="span", attrs={'data-test':'property-card-price'})
-
-property_prices = []
-property_links = []
-property_addresses = []
-for n in range(len(property_tags)):
-    if n % 2 == 0:
-        property_links.append(property_tags[n].get('href'))
-        property_addresses.append(property_tags[n].text.strip())
-
-for n in range(len(property_tag_prices)):
-    property_prices.append(
-        property_tag_prices[n].text[:6].replace("+", "")
-    )
-
-# Configure Webdriver
-
-# Configure Chrome options
-chrome_options = webdriver.ChromeOptions()
-chrome_options.add_experimental_option(name="detach", value=True)
-
-# Initialize Chrome driver
-driver = webdriver.Chrome(options=chrome_options)
-
-# Navigate to the webpage
-driver.get(url=GOOGLE_FORM)
-
-# Function to wait until a element be available
-def until_be_clickeable(web_driver, by):
-    return WebDriverWait(web_driver, timeout=10).until(
-        ec.element_to_be_clickable(by)
-    )
-
-answer_inputs = driver.find_elements(by=By.CSS_SELECTOR, value='input[type="text"]')
-
-for n in range(len(property_addresses)):
-    time.sleep(0.5)
-    answer_inputs = driver.find_elements(by=By.CSS_SELECTOR, value='input[type="text"]')
-    time.sleep(0.5)
-    answer_inputs[0].send_keys(property_addresses[n])
-    time.sleep(0.5)
-    answer_inputs[1].send_keys(property_prices[n])
-    time.sleep(0.5)
-    answer_inputs[2].send_keys(property_links[n])
-    time.sleep(0.5)
-
-    wait_until_be_clickeable_submit_button = until_be_clickeable(web_driver=driver, by=(By.CSS_SELECTOR, "div[jsname='M2UYVd']"))
-    wait_until_be_clickeable_submit_button.click()
-
-    time.sleep(2)
-
-    wait_until_be_clickeable_submit_another_response = until_be_clickeable(web_driver=driver, by=(By.CSS_SELECTOR, "div.c2gzEf a"))
-    wait_until_be_clickeable_submit_another_response.click()
\ No newline at end of file
+property_addresses = listings["addresses"]
+property_prices = listings["prices"]
+property_links = listings["links"]
+
+
+def fill_form_with_selenium(rows, journal):
+    """
+    Type each listing into the form in a real browser (slow fallback).
+
+    Args:
+        rows: List of [address, price, link]
+        journal: Journal where each submitted listing is recorded
+    """
+    # Initialize a lean Chrome driver (no images, fonts or trackers)
+    driver = make_driver(detach=True)
+
+    # Navigate to the webpage
+    with timer("page_load", page="form"):
+        driver.get(url=GOOGLE_FORM)
+
+    # Function to wait until a element be available
+    def until_be_clickeable(web_driver, by):
+        return WebDriverWait(web_driver, timeout=10).until(
+            ec.element_to_be_clickable(by)
+        )
+
+    # Adapts to how fast the form loads after each "submit another response"
+    form_timeout = AdaptiveTimeout()
+    text_inputs = (By.CSS_SELECTOR, 'input[type="text"]')
+
+    for address, price, link in rows:
+        with timer("form_fill", mode="selenium"):
+            # Wait until the three answer fields of a fresh form are there
+            answer_inputs = wait_for(driver, count_above(text_inputs, 2), adaptive=form_timeout)
+            answer_inputs[0].send_keys(address)
+            answer_inputs[1].send_keys(price)
+            answer_inputs[2].send_keys(link)
+
+            wait_until_be_clickeable_submit_button = until_be_clickeable(web_driver=driver, by=(By.CSS_SELECTOR, "div[jsname='M2UYVd']"))
+            wait_until_be_clickeable_submit_button.click()
+
+            # The confirmation page shows the "submit another response" link
+            wait_until_be_clickeable_submit_another_response = until_be_clickeable(web_driver=driver, by=(By.CSS_SELECTOR, "div.c2gzEf a"))
+            wait_until_be_clickeable_submit_another_response.click()
+        journal.record(link, mode="selenium")
+
+
+journal = Journal(JOURNAL_NAME)
+
+# Listings submitted by an earlier run are skipped (the link is the id)
+rows = [list(row) for row in zip(property_addresses, property_prices, property_links)]
+rows = journal.pending(rows, key=lambda row: row[2])
+pending = rows
+
+if SUBMIT_MODE == "http" and rows:
+    try:
+        submitter = FormSubmitter(GOOGLE_FORM, entry_ids=FORM_ENTRY_IDS)
+        with timer("form_submit_all", mode="http"):
+            failed = submitter.submit_many(rows, on_success=lambda row: journal.record(row[2], mode="http"))
+        print(f"Submitted {len(rows) - len(failed)}/{len(rows)} listings over HTTP")
+        # Only rows the form surely didn't record go through the browser again
+        pending = [rows[n] for n, reason in failed.items() if reason in (NOT_SENT, REJECTED)]
+        unknown = [rows[n] for n, reason in failed.items() if reason == UNKNOWN]
+        for address, price, link in unknown:
+            journal.record(link, mode="http", state="unknown")
+        if unknown:
+            print(f"✗ {len(unknown)} listing(s) may or may not have been recorded; check the sheet for:")
+            for address, price, link in unknown:
+                print(f"  {link}")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"HTTP submission unavailable ({e}), using Selenium")
+
+if pending:
+    fill_form_with_selenium(pending, journal)
+
+journal.close()
+
+# Where the run spent its time (BOT_METRICS_FILE=run.json also saves it)
+report()
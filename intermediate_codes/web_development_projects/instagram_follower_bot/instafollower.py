@@ -1,27 +1,86 @@
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from dotenv import load_dotenv
-from selenium import webdriver
-import time
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
+import sys
 import os
 
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.browser import make_driver
+from toolkit.browser_waits import AdaptiveTimeout, wait_for_present, wait_for_text_change
+from toolkit.infinite_scroll import InfiniteScroller
+from toolkit.journal import Journal, journal_path
+from toolkit.bloom_filter import BloomFilter
+
 load_dotenv(dotenv_path=".env")
 LOGIN_USERNAME = os.environ["LOGIN_USERNAME"]
 LOGIN_PASSWORD = os.environ["LOGIN_PASSWORD"]
 SIMILAR_ACCOUNT = os.environ["SIMILAR_ACCOUNT"]
 URL = "https://www.instagram.com/"
 
+# Rows of the followers dialog
+FOLLOW_BUTTON_SELECTOR = "button._aswp._aswr._aswu._asw_._asx2"
+LABEL_SELECTOR = "div._ap3a._aaco._aacw._aad6._aade"
+
+# Rows handled per run (already followed accounts don't count); None goes
+# through the whole list
+FOLLOW_QUOTA = 100
+
+# Button labels of accounts already followed (or asked to); clicking them
+# would unfollow, so these rows are only recorded
+FOLLOWED_LABELS = ("Following", "Requested")
+
+# The processed handles are saved every this many rows
+SAVE_EVERY = 20
+
+# Handles already followed are recorded in .journal/ and skipped by the next
+# run, so a run that dies mid-scroll doesn't start over
+JOURNAL_NAME = f"instagram_followed_{LOGIN_USERNAME}"
+
+# For very long lists, keep the handles in a Bloom filter instead: fixed
+# size (about 1.8 MB for a million handles) but about 1 in 1000 new accounts
+# is wrongly skipped. Started from the journal the first time.
+USE_BLOOM_FILTER = False
+BLOOM_FILE = os.path.splitext(journal_path(JOURNAL_NAME))[0] + ".bloom"
+
+# Rows are keyed by the handle in the profile link next to the follow button.
+# The dialog reuses row elements while scrolling, so the key is read from the
+# row each time rather than remembered per element.
+ROW_HANDLE_JS = """(button) => {
+    let row = button.parentElement;
+    let link = null;
+    while (row && row !== document.body && !(link = row.querySelector('a[href^="/"]'))) {
+        row = row.parentElement;
+    }
+    return link ? link.getAttribute("href").split("/").filter(Boolean)[0] || "" : "";
+}"""
+ROW_JS = "(button, handle) => ({key: handle, handle: handle, label: button.innerText.trim(), button: button})"
+
+# Current button label of a handle's row (null when the row is not rendered)
+LABEL_BY_HANDLE_JS = """
+const handleOf = ROW_HANDLE_JS;
+for (const button of document.querySelectorAll(arguments[0])) {
+    if (handleOf(button) === arguments[1]) {
+        return button.innerText.trim();
+    }
+}
+return null;
+""".replace("ROW_HANDLE_JS", ROW_HANDLE_JS)
+
 class InstaFollower:
     def __init__(self):
 
-        # Configure Chrome options
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_experimental_option(name="detach", value=True)
+        # Initialize a lean Chrome driver (no images, videos, fonts or trackers)
+        self.driver = make_driver(detach=True)
+
+        # Timeouts that adapt to how fast Instagram answers clicks and loads rows
+        self.click_timeout = AdaptiveTimeout(initial=3.0, minimum=1.0, maximum=10.0)
+        self.load_timeout = AdaptiveTimeout(initial=5.0, minimum=2.0, maximum=20.0)
 
-        # Initialize Chrome driver
-        self.driver = webdriver.Chrome(options=chrome_options)
+        # Handles followed by this and earlier runs
+        self.processed = self.load_processed()
 
     def until_be_clickeable(self, driver, by):
 
@@ -86,33 +145,96 @@ class InstaFollower:
         )
         wait_for_found_followers.click()
 
-    def follow(self):
-        time.sleep(2)
+    def load_processed(self):
+        """Journal of followed handles, or a Bloom filter when USE_BLOOM_FILTER is set."""
+        if not USE_BLOOM_FILTER:
+            return Journal(JOURNAL_NAME)
+        if os.path.exists(BLOOM_FILE):
+            return BloomFilter.load(BLOOM_FILE)
+        bloom = BloomFilter()
+        if os.path.exists(journal_path(JOURNAL_NAME)):
+            with Journal(JOURNAL_NAME) as journal:
+                for handle in journal.entries:
+                    bloom.add(handle)
+        return bloom
+
+    def mark_processed(self, handle, status):
+        if isinstance(self.processed, BloomFilter):
+            self.processed.add(handle)
+        else:
+            self.processed.record(handle, status=status)
 
-        for n in range(11):
-            follow_buttons = self.driver.find_elements(
-                by=By.CSS_SELECTOR,
-                value="button._aswp._aswr._aswu._asw_._asx2"
-            )
+    def save_processed(self):
+        if isinstance(self.processed, BloomFilter):
+            self.processed.save(BLOOM_FILE)
+        else:
+            self.processed.sync()
 
-            label_button = self.driver.find_elements(
-                by=By.CSS_SELECTOR,
-                value="div._ap3a._aaco._aacw._aad6._aade"
-            )
+    def already_followed(self, row):
+        """True for rows followed before (they don't count toward FOLLOW_QUOTA)."""
+        if row["handle"] in self.processed:
+            return True
+        if row["label"] in FOLLOWED_LABELS:
+            # Followed outside the bot: remember it so the next run skips it too
+            self.mark_processed(row["handle"], row["label"])
+            return True
+        return False
 
-            for i in range(len(follow_buttons)):
-                if label_button[i].text != "Following":
-                    follow_buttons[i].click()
-                    time.sleep(0.5)
+    def current_label(self, handle):
+        """Button label of a handle's row, looked up again; "unknown" if it can't be read."""
+        try:
+            label = self.driver.execute_script(LABEL_BY_HANDLE_JS, FOLLOW_BUTTON_SELECTOR, handle)
+        except WebDriverException:
+            label = None
+        return label or "unknown"
 
-            container = self.driver.find_element(
-                by=By.XPATH,
-                value="/html/body/div[5]/div[2]/div/div/div[1]/div/div[2]/div/div/div/div/div[2]/div/div/div[3]"
-            )
-            container.send_keys(Keys.END)
+    def follow(self):
+        # Wait for the followers dialog to show its first rows
+        wait_for_present(self.driver, (By.CSS_SELECTOR, LABEL_SELECTOR), adaptive=self.load_timeout)
+
+        # Yields each new row once, as soon as Instagram loads it
+        scroller = InfiniteScroller(
+            self.driver,
+            FOLLOW_BUTTON_SELECTOR,
+            key_js=ROW_HANDLE_JS,
+            row_js=ROW_JS,
+            quota=FOLLOW_QUOTA,
+            skip=self.already_followed,
+            adaptive=self.load_timeout,
+        )
 
-            time.sleep(2)
+        for row in scroller:
+            handle = row["handle"]
+            try:
+                row["button"].click()
+            except (StaleElementReferenceException, WebDriverException):
+                # The list recycled the row before the click landed
+                label = self.current_label(handle)
+                if label in FOLLOWED_LABELS:
+                    self.mark_processed(handle, label)
+                else:
+                    print(f"✗ Could not click {handle}, moving on")
+                continue
+            # Move on once Instagram confirms ("Following"/"Requested")
+            try:
+                label = wait_for_text_change(self.driver, row["button"], row["label"], adaptive=self.click_timeout)
+            except TimeoutException:
+                print(f"✗ No answer for {handle}, moving on")
+                continue
+            except (StaleElementReferenceException, WebDriverException):
+                label = True
+            if label is True:
+                # The row was re-rendered: read its label again by handle
+                label = self.current_label(handle)
+            self.mark_processed(handle, label)
+            if scroller.yielded % SAVE_EVERY == 0:
+                self.save_processed()
 
+        self.save_processed()
+        if scroller.stop_reason == "exhausted":
+            print("✓ No more followers to load")
+        else:
+            print(f"✓ Reached the quota of {FOLLOW_QUOTA} accounts")
 
         # Other option os def follow(self):
         # import random
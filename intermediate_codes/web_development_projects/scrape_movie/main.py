@@ -1,21 +1,33 @@
-import requests
+import os
+import sys
 from bs4 import BeautifulSoup
 
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.http_cache import HttpCache
+
 URL = "https://web.archive.org/web/20200518073855/https://www.empireonline.com/movies/features/best-movies-2/"
 
-# Write your code below this line 👇
-response = requests.get(url=URL)
-response.encoding = "utf-8"
-empire_web_page = response.text
+# Save the raw page HTML to soup.html (debugging only)
+DEBUG_DUMP = False
 
-soup = BeautifulSoup(empire_web_page, features="html.parser")
 
-with open(file="soup.html", mode="w", encoding="utf-8") as file:
-    file.write(soup.prettify())
+def parse_movies(empire_web_page):
+    soup = BeautifulSoup(empire_web_page, features="html.parser")
 
-movies = soup.find_all('h3', class_="title")[::-1]
+    return [movie.getText() for movie in soup.find_all('h3', class_="title")[::-1]]
+
+
+# Write your code below this line 👇
+# The archived page is cached on disk, so repeat runs skip download and parsing
+cache = HttpCache()
+movies = cache.get_parsed(URL, parse_movies, name="movies")
+
+# Written here and not in parse_movies(), which is skipped on a cache hit
+if DEBUG_DUMP:
+    with open(file="soup.html", mode="w", encoding="utf-8") as file:
+        file.write(cache.get(URL).text)
 
 with open(file="movies.txt", mode="w") as file:
     for movie in movies:
-        file.write(f"{movie.getText()}\n")
-
+        file.write(f"{movie}\n")
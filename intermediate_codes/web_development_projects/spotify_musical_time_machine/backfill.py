@@ -0,0 +1,190 @@
+import os
+import sys
+import csv
+import time
+import argparse
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import spotipy
+from spotipy.oauth2 import SpotifyClientCredentials
+from dotenv import load_dotenv
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.http_cache import HttpCache
+from billboard_chart import fetch_chart
+from spotify_api import RateLimitGate, make_session, MAX_REQUESTS_PER_SECOND
+from track_resolver import TrackResolver, MAX_WORKERS
+from track_cache import TrackCache, song_key
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Chart pages downloaded at the same time
+CHART_WORKERS = 8
+
+# Billboard publishes one Hot 100 per week, dated on Saturdays
+CHART_WEEKDAY = 5
+STEP_DAYS = 7
+
+# CSV written by default
+OUTPUT_FILE = "hot100_dataset.csv"
+
+# Example:
+#   python backfill.py 1990-01-01 1999-12-31 --output nineties.csv
+
+
+def chart_dates(start, end, step_days=STEP_DAYS):
+    """
+    Chart dates between start and end, both included.
+
+    Args:
+        start: First date (moved forward to the next chart Saturday)
+        end: Last date
+        step_days: Days between charts
+
+    Returns:
+        list: Dates as YYYY-MM-DD strings
+    """
+    current = start + timedelta(days=(CHART_WEEKDAY - start.weekday()) % 7)
+    dates = []
+    while current <= end:
+        dates.append(current.isoformat())
+        current += timedelta(days=step_days)
+    return dates
+
+
+def fetch_charts(dates, workers=CHART_WORKERS):
+    """
+    Download and parse many charts concurrently.
+
+    Charts already in the on-disk cache are not downloaded again.
+
+    Args:
+        dates: Chart dates as YYYY-MM-DD strings
+        workers: Pages downloaded at the same time
+
+    Returns:
+        dict: {date: [[title, artist], ...]} for the charts that loaded
+    """
+    cache = HttpCache()
+
+    def work(chart_date):
+        try:
+            return fetch_chart(chart_date, cache=cache)
+        except requests.exceptions.RequestException as e:
+            print(f"✗ Error fetching chart {chart_date}: {e}")
+            return None
+
+    charts = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chart_date, songs in zip(dates, executor.map(work, dates)):
+            if songs is not None:
+                charts[chart_date] = songs
+                print(f"✓ Chart {chart_date}: {len(songs)} songs")
+    return charts
+
+
+def unique_songs(charts):
+    """
+    Every different (title, artist) across the charts, in first-seen order.
+
+    Songs are compared with the same normalized key as the track cache, so
+    "Café" by "Beyoncé" and "cafe" by "BEYONCE" count once.
+
+    Args:
+        charts: {date: [[title, artist], ...]}
+
+    Returns:
+        list: (title, artist) tuples
+    """
+    seen = {}
+    for songs in charts.values():
+        for title, artist in songs:
+            seen.setdefault(song_key(title, artist), (title, artist))
+    return list(seen.values())
+
+
+def connect_spotify():
+    """
+    Spotify client for searches only (no user login needed).
+
+    Returns:
+        spotipy.Spotify: Client authenticated with the app credentials
+    """
+    load_dotenv()
+    auth_manager = SpotifyClientCredentials(client_id=os.environ["SPOTIFY_CLIENT_ID"],
+                                            client_secret=os.environ["SPOTIFY_CLIENT_SECRET"])
+    return spotipy.Spotify(auth_manager=auth_manager,
+                           requests_session=make_session(pool_size=MAX_WORKERS),
+                           requests_timeout=10)
+
+
+def write_dataset(file_path, charts, uris):
+    """
+    Write one row per chart entry.
+
+    Args:
+        file_path: CSV to write
+        charts: {date: [[title, artist], ...]}
+        uris: {song_key: uri or None}
+
+    Returns:
+        int: Number of rows written
+    """
+    rows = 0
+    with open(file_path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["date", "rank", "title", "artist", "uri"])
+        for chart_date in sorted(charts):
+            for rank, (title, artist) in enumerate(charts[chart_date], start=1):
+                writer.writerow([chart_date, rank, title, artist, uris.get(song_key(title, artist)) or ""])
+                rows += 1
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a Hot 100 dataset for a range of dates.")
+    parser.add_argument("start", type=date.fromisoformat, help="First date (YYYY-MM-DD)")
+    parser.add_argument("end", type=date.fromisoformat, help="Last date (YYYY-MM-DD)")
+    parser.add_argument("--output", default=OUTPUT_FILE, help=f"CSV file (default {OUTPUT_FILE})")
+    parser.add_argument("--step-days", type=int, default=STEP_DAYS, help="Days between charts")
+    parser.add_argument("--workers", type=int, default=CHART_WORKERS, help="Charts downloaded at once")
+    parser.add_argument("--skip-spotify", action="store_true", help="Only scrape, leave the uri column empty")
+    args = parser.parse_args()
+
+    # ==========================================================================
+    # STEP 1: Fetch every chart in the range
+    # ==========================================================================
+    start_time = time.perf_counter()
+    dates = chart_dates(args.start, args.end, args.step_days)
+    print(f"Fetching {len(dates)} charts...")
+    charts = fetch_charts(dates, workers=args.workers)
+
+    # ==========================================================================
+    # STEP 2: Resolve each different song once
+    # ==========================================================================
+    songs = unique_songs(charts)
+    entries = sum(len(chart) for chart in charts.values())
+    print(f"\n{entries} chart entries, {len(songs)} different songs")
+
+    uris = {}
+    if not args.skip_spotify:
+        sp = connect_spotify()
+        gate = RateLimitGate(max_per_second=MAX_REQUESTS_PER_SECOND)
+        with TrackCache() as track_cache:
+            resolved = TrackResolver(sp, gate=gate, cache=track_cache).resolve(songs)
+        uris = {song_key(title, artist): uri for (title, artist), uri in zip(songs, resolved)}
+        print(f"✓ {sum(1 for uri in resolved if uri)}/{len(songs)} songs found on Spotify")
+
+    # ==========================================================================
+    # STEP 3: Save the dataset
+    # ==========================================================================
+    rows = write_dataset(args.output, charts, uris)
+    print(f"\n✓ Wrote {rows} rows to {args.output} in {time.perf_counter() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
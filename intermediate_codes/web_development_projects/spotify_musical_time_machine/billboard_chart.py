@@ -0,0 +1,118 @@
+import os
+import sys
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.http_cache import HttpCache
+from toolkit.html_parsing import make_soup, strainer
+from toolkit.html_stream import RecordSpec, stream_records
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# The User-Agent is set once for all scrapers in toolkit/http_client.py
+
+# Billboard Hot 100 chart URL for a date in YYYY-MM-DD format
+CHART_URL = "https://www.billboard.com/charts/hot-100/{date}/"
+
+# CSS classes for song titles (these may change over time)
+SONG_TITLE_CLASS = ("c-title a-font-basic u-letter-spacing-0010 u-max-width-397 lrv-u-font-size-16 "
+                    "lrv-u-font-size-14@mobile-max u-line-height-22px u-word-spacing-0063 "
+                    "u-line-height-normal@mobile-max a-truncate-ellipsis-2line lrv-u-margin-b-025 "
+                    "lrv-u-margin-b-00@mobile-max")
+
+# CSS classes for artist names
+ARTIST_CLASS = ("c-label a-no-trucate a-font-secondary u-font-size-15 u-font-size-13@mobile-max "
+                    "u-line-height-18px@mobile-max u-letter-spacing-0010 u-line-height-21px "
+                    "a-children-link-color-black a-children-link-color-brand-secondary:hover "
+                    "lrv-a-children-link-decoration-underline:hover lrv-u-display-block "
+                    "a-truncate-ellipsis-2line u-max-width-397 u-max-width-230@tablet-only "
+                    "u-max-width-300@mobile-max")
+
+# Only the title and artist tags are parsed, the rest of the page is skipped
+CHART_TAGS = strainer(["h3", "span"], class_=[SONG_TITLE_CLASS, ARTIST_CLASS])
+
+# Records used in streaming mode
+CHART_RECORDS = [
+    RecordSpec("song", "h3." + ".".join(SONG_TITLE_CLASS.split()), {"text": (None, "text")}),
+    RecordSpec("artist", "span." + ".".join(ARTIST_CLASS.split()), {"text": (None, "text")}),
+]
+
+
+def chart_url(date):
+    return CHART_URL.format(date=date)
+
+
+def parse_chart(billboard_html):
+    """
+    Extract (song, artist) pairs from a Billboard Hot 100 page.
+
+    Args:
+        billboard_html: HTML of the chart page
+
+    Returns:
+        list: [song title, artist] for each chart entry
+    """
+    # Parse only the chart tags (with lxml when installed)
+    soup = make_soup(billboard_html, only=CHART_TAGS)
+
+    # Find all song and artist tags
+    artist_tags = soup.find_all(name="span", class_=ARTIST_CLASS)
+    song_tags = soup.find_all(name="h3", class_=SONG_TITLE_CLASS)
+
+    # Verify we found 100 songs
+    if len(song_tags) < 100 or len(artist_tags) < 100:
+        print(f"Warning: Only found {len(song_tags)} songs and {len(artist_tags)} artists")
+
+    return [
+        [song_tags[i].get_text().strip(), artist_tags[i].get_text().strip()]
+        for i in range(min(len(song_tags), len(artist_tags)))
+    ]
+
+
+def stream_chart(url):
+    """
+    Same result as parse_chart(), but reading the page in chunks.
+
+    Args:
+        url: Chart page URL
+
+    Returns:
+        list: [song title, artist] for each chart entry
+    """
+    pending = {"song": [], "artist": []}
+    entries = []
+    for kind, record in stream_records(url, CHART_RECORDS):
+        pending[kind].append(record["text"])
+        # Titles and artists alternate on the page: pair them as they close
+        if pending["song"] and pending["artist"]:
+            entries.append([pending["song"].pop(0), pending["artist"].pop(0)])
+
+    if len(entries) < 100:
+        print(f"Warning: Only found {len(entries)} songs")
+    return entries
+
+
+def fetch_chart(date, cache=None, streaming=False):
+    """
+    Download and parse the chart of one date.
+
+    Old charts never change, so with the cache repeat runs are served from
+    disk without downloading or parsing.
+
+    Args:
+        date: Chart date in YYYY-MM-DD format
+        cache: HttpCache to use (a new one is created if omitted)
+        streaming: Read the page in chunks instead of going through the cache
+
+    Returns:
+        list: [song title, artist] for each chart entry, in rank order
+
+    Raises:
+        requests.exceptions.RequestException: On network or HTTP errors
+    """
+    url = chart_url(date)
+    if streaming:
+        return stream_chart(url)
+    return (cache or HttpCache()).get_parsed(url, parse_chart, name="chart")
@@ -0,0 +1,174 @@
+import re
+from difflib import SequenceMatcher
+from spotify_api import call_api
+from track_cache import normalize
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Candidates requested by the single relaxed search
+CANDIDATES = 10
+
+# Minimum combined score (0-1) to accept a candidate
+MIN_SCORE = 0.75
+
+# Weight of the title in the score (the artist gets the rest)
+TITLE_WEIGHT = 0.6
+
+# "Featuring", "feat.", "ft.", "with" between the main and the guest artists.
+# "&" and "," are not split on: they are part of names like "Earth, Wind &
+# Fire". " x " is left out too: it would split "Lil Nas X Featuring ...".
+FEATURING = re.compile(r"\s+(?:featuring|feat\.?|ft\.?|duet with|with)\s+", re.IGNORECASE)
+
+# "(feat. ...)", "[Remix]", "- Remastered 2011" ... parts of a title
+TITLE_EXTRAS = re.compile(r"\s*[\(\[].*?[\)\]]|\s+-\s+.*$")
+
+PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def clean_text(text):
+    """
+    Normalized text without punctuation: "Don't Stop (Remix)" -> "dont stop remix".
+    """
+    text = normalize(text).replace("&", " and ")
+    text = PUNCTUATION.sub("", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def clean_title(title):
+    """
+    Title without featuring credits, versions or remaster notes.
+
+    Args:
+        title: Song title from Billboard or Spotify
+
+    Returns:
+        str: e.g. "Old Town Road (Remix) [feat. X]" -> "old town road"
+    """
+    return clean_text(TITLE_EXTRAS.sub("", title)) or clean_text(title)
+
+
+def split_artists(artist):
+    """
+    Main and featured artists of a credit, main artist first.
+
+    Args:
+        artist: Billboard credit, e.g. "Lil Nas X Featuring Billy Ray Cyrus"
+
+    Returns:
+        list: e.g. ["lil nas x", "billy ray cyrus"]
+    """
+    names = [clean_text(name) for name in FEATURING.split(artist)]
+    return [name for name in names if name] or [clean_text(artist)]
+
+
+def artist_names(artist):
+    """
+    Names to compare a credit with: the whole credit, then its split parts.
+
+    Returns:
+        list: e.g. ["earth wind and fire"] or
+            ["lil nas x featuring billy ray cyrus", "lil nas x", "billy ray cyrus"]
+    """
+    return list(dict.fromkeys([clean_text(artist)] + split_artists(artist)))
+
+
+def similarity(a, b):
+    """
+    0-1 similarity of two cleaned strings (1 means equal).
+
+    quick_ratio() is an upper bound that is much cheaper than ratio(), so
+    clearly different strings are rejected without the full comparison.
+    """
+    if a == b:
+        return 1.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.quick_ratio() < MIN_SCORE * 0.5:
+        return 0.0
+    return matcher.ratio()
+
+
+class FuzzyMatcher:
+    """
+    Second chance for songs the exact search did not find.
+
+    It sends one relaxed query (clean title + main artist, no field filters)
+    with limit=10 and ranks the candidates locally by title and artist
+    similarity, so each miss costs a single extra request.
+
+    Args:
+        sp: spotipy.Spotify client
+        gate: RateLimitGate shared by all workers
+        min_score: Minimum score to accept a candidate
+    """
+
+    def __init__(self, sp, gate, min_score=MIN_SCORE):
+        self.sp = sp
+        self.gate = gate
+        self.min_score = min_score
+
+    @staticmethod
+    def relaxed_query(title, artist):
+        return f"{clean_title(title)} {split_artists(artist)[0]}"
+
+    @staticmethod
+    def score(title, artists, track):
+        """
+        Score one Spotify track against a chart entry.
+
+        Args:
+            title: Cleaned chart title
+            artists: Cleaned chart artist names (see artist_names())
+            track: Spotify track object
+
+        Returns:
+            float: Weighted title and artist similarity (0-1)
+        """
+        title_score = similarity(title, clean_title(track["name"]))
+        names = [artist["name"] for artist in track["artists"]]
+        # Also as one credit, for duos Spotify lists as two artists
+        track_artists = [clean_text(name) for name in names] + [clean_text(" & ".join(names))]
+        artist_score = max(
+            (similarity(wanted, found) for wanted in artists for found in track_artists),
+            default=0.0,
+        )
+        return TITLE_WEIGHT * title_score + (1 - TITLE_WEIGHT) * artist_score
+
+    def best_match(self, title, artist, tracks):
+        """
+        Highest scoring track above min_score.
+
+        Args:
+            title: Chart title
+            artist: Chart artist credit
+            tracks: Spotify track objects
+
+        Returns:
+            tuple: (uri, score), or (None, best score) when nothing is good enough
+        """
+        wanted_title = clean_title(title)
+        wanted_artists = artist_names(artist)
+        best_uri, best_score = None, 0.0
+        for track in tracks:
+            score = self.score(wanted_title, wanted_artists, track)
+            if score > best_score:
+                best_uri, best_score = track["uri"], score
+        if best_score < self.min_score:
+            return None, best_score
+        return best_uri, best_score
+
+    def match(self, title, artist):
+        """
+        Relaxed search for one song.
+
+        Args:
+            title: Chart title
+            artist: Chart artist credit
+
+        Returns:
+            tuple: (uri or None, score)
+        """
+        result = call_api(self.gate, self.sp.search, q=self.relaxed_query(title, artist),
+                          type="track", limit=CANDIDATES)
+        return self.best_match(title, artist, result["tracks"]["items"])
@@ -1,12 +1,22 @@
 from spotipy.oauth2 import SpotifyOAuth
 from datetime import datetime
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
 import requests
 import spotipy
 import json
+import sys
 import os
 
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.metrics import timer, report
+from billboard_chart import fetch_chart
+from spotify_api import RateLimitGate, make_session, MAX_REQUESTS_PER_SECOND
+from track_resolver import TrackResolver, MAX_WORKERS
+from track_cache import TrackCache
+from playlist_writer import PlaylistWriter
+from playlist_cleanup import PlaylistCleaner
+
 # 1. Get user input for the Billboard chart date
 is_valid = True
 while is_valid:
@@ -19,63 +29,24 @@ while is_valid:
         is_valid = False
 
 # 2. Configure web scraping settings
+# (chart URL, CSS classes and parsing live in billboard_chart.py)
 
-# User-Agent Header to identify the browser making the request
-HEADER = {
-    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) "
-                  "AppleWebKit/537.36 (KHTML, like Gecko) "
-                  "Chrome/140.0.0.0 Safari/537.36"
-}
-
-# Billboard Hot 100 chart URL with the specified date
-URL = f"https://www.billboard.com/charts/hot-100/{date}/"
+# STREAMING = True reads the chart in chunks and pairs each song with its
+# artist as soon as both tags close; False goes through the on-disk cache
+STREAMING = False
 
-# 3. Fetch and parse Billboard webpage
+# 3. Fetch and parse Billboard webpage (old charts never change, so repeat runs
+# are served from the on-disk cache without downloading or parsing)
 try:
-    response = requests.get(url=URL, headers=HEADER)
-    response.encoding = "utf-8"
-    response.raise_for_status()  # Raise error for bad status codes
-    billboard_html = response.text
+    with timer("chart_fetch"):
+        songs = fetch_chart(date, streaming=STREAMING)
 except requests.exceptions.RequestException as e:
     print(f"Error fetching Billboard data: {e}")
     exit()
 
-# Parse HTML content with BeautifulSoup
-soup = BeautifulSoup(billboard_html, features="html.parser")
-
-# 4. Extract song and artist information
-
-# CSS classes for song titles (these may change over time)
-SONG_TITLE_CLASS = ("c-title a-font-basic u-letter-spacing-0010 u-max-width-397 lrv-u-font-size-16 "
-                    "lrv-u-font-size-14@mobile-max u-line-height-22px u-word-spacing-0063 "
-                    "u-line-height-normal@mobile-max a-truncate-ellipsis-2line lrv-u-margin-b-025 "
-                    "lrv-u-margin-b-00@mobile-max")
-
-# CSS classes for artist names
-ARTIST_CLASS = ("c-label a-no-trucate a-font-secondary u-font-size-15 u-font-size-13@mobile-max "
-                    "u-line-height-18px@mobile-max u-letter-spacing-0010 u-line-height-21px "
-                    "a-children-link-color-black a-children-link-color-brand-secondary:hover "
-                    "lrv-a-children-link-decoration-underline:hover lrv-u-display-block "
-                    "a-truncate-ellipsis-2line u-max-width-397 u-max-width-230@tablet-only "
-                    "u-max-width-300@mobile-max")
-
-# Find all song and artist tags
-artist_tags = soup.find_all(name="span", class_=ARTIST_CLASS)
-song_tags = soup.find_all(name="h3", class_=SONG_TITLE_CLASS)
-
-# Verify we found 100 songs
-if len(song_tags) < 100 or len(artist_tags) < 100:
-    print(f"Warning: Only found {len(song_tags)} songs and {len(artist_tags)} artists")
-
-# Create search queries in Spotify format: "track:Song Name artist:Artist Name"
-search_queries = [
-    f"track:{song_tags[i].get_text().strip()} artist:{artist_tags[i].get_text().strip()}"
-    for i in range(min(len(song_tags), len(artist_tags)))
-]
+print(f"Found {len(songs)} songs from Billboard")
 
-print(f"Found {len(search_queries)} songs from Billboard")
-
-# 5. Authenticate with Spotify API
+# 4. Authenticate with Spotify API
 
 # Load environment variables from .env file
 load_dotenv()
@@ -90,8 +61,11 @@ if not all([SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET, SPOTIPY_REDIRECT_URI]):
     print("Error: Missing Spotify credentials in .env file")
     exit()
 
-# Initialize Spotify client with OAuth authentication
+# Initialize Spotify client with OAuth authentication. The session has one
+# keep-alive connection per worker and leaves 429 handling to spotify_api.py
 sp = spotipy.Spotify(
+    requests_session=make_session(pool_size=MAX_WORKERS),
+    requests_timeout=10,
     auth_manager=SpotifyOAuth(client_id=SPOTIFY_CLIENT_ID,
                               client_secret=SPOTIFY_CLIENT_SECRET,
                               redirect_uri=SPOTIPY_REDIRECT_URI,
@@ -103,62 +77,58 @@ sp = spotipy.Spotify(
 )
 
 # Get authenticated user's ID
-user_id = sp.current_user()["id"]
+with timer("spotify_login"):
+    user_id = sp.current_user()["id"]
 print(f"Usuario Autenticado: {user_id}")
 
 
-track_uris = []
-songs_not_found = []
-# Go throght each search query
-for i in range(len(search_queries)):
-    query = search_queries[i]
-
-    try:
-        # Search for the song in Spotify
-        result = sp.search(q=query, type="track", limit=1)
-
-        # Check if you found any song
-        if result["tracks"]["items"]:
-            # Extract the URI of the first song found
-            track_uri = result["tracks"]["items"][0]["uri"]
-            track_uris.append(track_uri)
-            print(f"✓ Found song {i + 1}/100")
-        else:
-            # The song is not available in Spotify
-            song_name = song_tags[i].get_text().strip()
-            songs_not_found.append(song_name)
-            print(f"✗ Not found: {song_name}")
-
-    except Exception as e:
-        print(f"✗ Error searching song {i + 1}: {e}")
-
-# Create the playlist using the list of uris tracks found.
-if track_uris:
-    playlist = sp.user_playlist_create(
-        user=user_id,
-        name=f"Billboard Hot 100 - {date}",
-        public=True,
-        description=f"Top 100 songs from Billboard on {date}. Created with Python."
-    )
+# Search all songs concurrently (searches are "track:Song Name artist:Artist Name").
+# Requests are capped at MAX_REQUESTS_PER_SECOND and a 429 from Spotify
+# pauses every worker for the Retry-After time.
+# Songs already searched in earlier runs come from track_cache.db instead.
+gate = RateLimitGate(max_per_second=MAX_REQUESTS_PER_SECOND)
+with TrackCache() as track_cache, timer("track_search"):
+    uris = TrackResolver(sp, gate=gate, cache=track_cache).resolve(songs)
 
-    playlist_id = playlist["id"]
-    print(f"Playlist created: {playlist['name']}")
+track_uris = [uri for uri in uris if uri]
+songs_not_found = [songs[i][0] for i, uri in enumerate(uris) if not uri]
+if songs_not_found:
+    print(f"✗ {len(songs_not_found)} songs not found on Spotify: {', '.join(songs_not_found)}")
 
-# Save the playlist ID and print it was created.
-print(f"Added {len(track_uris)} songs to the playlist")
-print(f"Playlist URL: https://open.spotify.com/playlist/{playlist_id}")
+# Create the playlist (or reuse the one from a previous run with the same
+# name) and set its tracks, 100 per request
+playlist_id = None
+if track_uris:
+    writer = PlaylistWriter(sp, user_id, gate=gate)
+    with timer("playlist_write"):
+        playlist, created = writer.get_or_create(
+            name=f"Billboard Hot 100 - {date}",
+            public=True,
+            description=f"Top 100 songs from Billboard on {date}. Created with Python."
+        )
 
-# Method to find and delete empty playlists
-# Find all the playslists
-playlists = sp.current_user_playlists(limit=50)
-deleted_count = 0
+        playlist_id = playlist["id"]
+        print(f"Playlist {'created' if created else 'updated'}: {playlist['name']}")
 
-for playlist in playlists["items"]:
-    if playlist["owner"]["id"] == user_id and playlist["tracks"]["total"] == 0:
-        sp.current_user_unfollow_playlist(playlist["id"])
-        print(f"✓ Deleted empty playlist: {playlist['name']}")
-        deleted_count += 1
+        added = writer.replace_tracks(playlist_id, track_uris)
 
-if deleted_count > 0:
-    print(f"Total empty playlists deleted: {deleted_count}")
+    # Save the playlist ID and print it was created.
+    print(f"Added {added} songs to the playlist")
+    print(f"Playlist URL: https://open.spotify.com/playlist/{playlist_id}")
+else:
+    print("No songs found on Spotify, playlist not created")
 
+# Method to find and delete empty playlists
+# Page through all the playlists, then delete the empty ones concurrently.
+# The playlist just written is kept: the listing may not count its tracks yet.
+with timer("playlist_cleanup"):
+    cleanup = PlaylistCleaner(sp, user_id, gate=gate, exclude_ids=[playlist_id] if playlist_id else []).run()
+
+if cleanup["deleted"] > 0:
+    print(f"Total empty playlists deleted: {cleanup['deleted']} of {cleanup['checked']} checked "
+          f"in {cleanup['seconds']:.1f}s ({cleanup['per_second']:.1f} playlists/s)")
+if cleanup["failed"] > 0:
+    print(f"Could not delete {cleanup['failed']} empty playlists, run the script again")
+
+# Where the run spent its time (BOT_METRICS_FILE=run.json also saves it)
+report()
@@ -0,0 +1,131 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from spotify_api import RateLimitGate, call_api
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Requests running at the same time (page downloads and unfollows)
+MAX_WORKERS = 8
+
+# Largest page Spotify returns for /me/playlists
+PAGE_SIZE = 50
+
+
+def iter_user_playlists(sp, gate, page_size=PAGE_SIZE, max_workers=MAX_WORKERS):
+    """
+    Yield every playlist in the user's library.
+
+    The first page tells how many playlists there are, so the remaining pages
+    are requested concurrently by offset and yielded in order.
+
+    Args:
+        sp: spotipy.Spotify client
+        gate: RateLimitGate shared by all workers
+        page_size: Playlists per request (max 50)
+        max_workers: Pages downloaded at the same time
+
+    Yields:
+        dict: Simplified playlist object
+    """
+    first_page = call_api(gate, sp.current_user_playlists, limit=page_size)
+    yield from first_page["items"]
+
+    offsets = range(page_size, first_page["total"], page_size)
+    if not offsets:
+        return
+
+    def fetch(offset):
+        return call_api(gate, sp.current_user_playlists, limit=page_size, offset=offset)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for page in executor.map(fetch, offsets):
+            yield from page["items"]
+
+
+def is_empty_generated(playlist, user_id):
+    """
+    True for playlists owned by the user that have no tracks.
+
+    The Spotify API cannot filter playlists on the server, so this runs on
+    each page as it arrives.
+    """
+    return playlist["owner"]["id"] == user_id and playlist["tracks"]["total"] == 0
+
+
+class PlaylistCleaner:
+    """
+    Unfollow (delete) every empty playlist owned by the user.
+
+    Args:
+        sp: Authenticated spotipy.Spotify client
+        user_id: Id of the authenticated user
+        gate: RateLimitGate shared with other API users (one is created if omitted)
+        max_workers: Requests running at the same time
+        exclude_ids: Playlist ids never deleted, e.g. one just written whose
+            track count the listing may not show yet
+    """
+
+    def __init__(self, sp, user_id, gate=None, max_workers=MAX_WORKERS, exclude_ids=()):
+        self.sp = sp
+        self.user_id = user_id
+        self.exclude_ids = set(exclude_ids)
+        self.gate = gate or RateLimitGate()
+        self.max_workers = max_workers
+
+    def find_empty(self):
+        """
+        Page through the whole library and keep the empty playlists.
+
+        Returns:
+            tuple: (list of empty playlists, number of playlists checked)
+        """
+        checked = 0
+        empty = []
+        for playlist in iter_user_playlists(self.sp, self.gate, max_workers=self.max_workers):
+            checked += 1
+            if is_empty_generated(playlist, self.user_id) and playlist["id"] not in self.exclude_ids:
+                empty.append(playlist)
+        return empty, checked
+
+    def _unfollow(self, playlist):
+        try:
+            call_api(self.gate, self.sp.current_user_unfollow_playlist, playlist["id"])
+        except Exception as e:
+            print(f"✗ Could not delete playlist {playlist['name']}: {e}")
+            return False
+        print(f"✓ Deleted empty playlist: {playlist['name']}")
+        return True
+
+    def run(self, dry_run=False):
+        """
+        Delete all empty playlists.
+
+        Every page is read before anything is deleted: unfollowing while
+        paging by offset would shift the later pages and skip playlists.
+
+        Args:
+            dry_run: Only report what would be deleted
+
+        Returns:
+            dict: "checked", "empty", "deleted", "failed", "seconds" and
+            "per_second" (deletions per second)
+        """
+        start = time.perf_counter()
+        empty, checked = self.find_empty()
+
+        deleted = 0
+        if empty and not dry_run:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                deleted = sum(executor.map(self._unfollow, empty))
+
+        seconds = time.perf_counter() - start
+        return {
+            "checked": checked,
+            "empty": len(empty),
+            "deleted": deleted,
+            "failed": 0 if dry_run else len(empty) - deleted,
+            "seconds": seconds,
+            "per_second": deleted / seconds if seconds else 0.0,
+        }
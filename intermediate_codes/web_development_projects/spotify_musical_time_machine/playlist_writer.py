@@ -0,0 +1,103 @@
+from spotify_api import RateLimitGate, call_api, iter_items
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Spotify accepts at most 100 tracks per add/replace request
+CHUNK_SIZE = 100
+
+# Playlists requested per page when looking one up by name
+PAGE_SIZE = 50
+
+
+def chunks(items, size=CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class PlaylistWriter:
+    """
+    Create playlists and fill them with one request per 100 tracks.
+
+    Every call goes through call_api(), so 429s and 5xx errors are retried.
+
+    Args:
+        sp: Authenticated spotipy.Spotify client
+        user_id: Id of the authenticated user
+        gate: RateLimitGate shared with other API users (one is created if omitted)
+    """
+
+    def __init__(self, sp, user_id, gate=None):
+        self.sp = sp
+        self.user_id = user_id
+        self.gate = gate or RateLimitGate()
+
+    def find_playlist(self, name):
+        """
+        First playlist owned by the user with exactly this name.
+
+        Args:
+            name: Playlist name
+
+        Returns:
+            dict or None: Simplified playlist object
+        """
+        first_page = call_api(self.gate, self.sp.current_user_playlists, limit=PAGE_SIZE)
+        for playlist in iter_items(self.sp, self.gate, first_page):
+            if playlist["owner"]["id"] == self.user_id and playlist["name"] == name:
+                return playlist
+        return None
+
+    def get_or_create(self, name, public=True, description=""):
+        """
+        Reuse the user's playlist with this name, or create it.
+
+        Args:
+            name: Playlist name
+            public: Visibility of a new playlist
+            description: Description of a new playlist
+
+        Returns:
+            tuple: (playlist dict, True if it was created)
+        """
+        playlist = self.find_playlist(name)
+        if playlist:
+            return playlist, False
+        playlist = call_api(self.gate, self.sp.user_playlist_create, user=self.user_id,
+                            name=name, public=public, description=description)
+        return playlist, True
+
+    def add_tracks(self, playlist_id, uris):
+        """
+        Append tracks to a playlist, 100 per request.
+
+        Args:
+            playlist_id: Spotify playlist id
+            uris: Track URIs in the desired order
+
+        Returns:
+            int: Number of tracks added
+        """
+        for chunk in chunks(uris):
+            call_api(self.gate, self.sp.playlist_add_items, playlist_id, chunk)
+        return len(uris)
+
+    def replace_tracks(self, playlist_id, uris):
+        """
+        Make the playlist contain exactly these tracks.
+
+        The first 100 replace whatever was there and the rest are appended,
+        so running it again gives the same playlist instead of duplicates.
+
+        Args:
+            playlist_id: Spotify playlist id
+            uris: Track URIs in the desired order
+
+        Returns:
+            int: Number of tracks in the playlist
+        """
+        uris = list(uris)
+        call_api(self.gate, self.sp.playlist_replace_items, playlist_id, uris[:CHUNK_SIZE])
+        self.add_tracks(playlist_id, uris[CHUNK_SIZE:])
+        return len(uris)
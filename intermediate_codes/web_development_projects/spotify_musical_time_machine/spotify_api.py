@@ -0,0 +1,160 @@
+import os
+import sys
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from spotipy.exceptions import SpotifyException
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.metrics import timer, increment
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Keep-alive connections to api.spotify.com (one per worker thread)
+POOL_SIZE = 16
+
+# Client-side cap on requests per second, shared by all worker threads
+MAX_REQUESTS_PER_SECOND = 20
+
+# Retries for 429 (rate limit), 5xx and dropped connections
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+
+def make_session(pool_size=POOL_SIZE):
+    """
+    requests session for spotipy.Spotify(requests_session=...).
+
+    It has no automatic retries: spotipy's built-in urllib3 retries sleep
+    inside one thread while every other worker keeps hitting the API. Here a
+    429 surfaces as SpotifyException (with its Retry-After header) and
+    call_api() pauses all workers together.
+
+    Args:
+        pool_size: Maximum keep-alive connections
+
+    Returns:
+        requests.Session: Session to hand to spotipy
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class RateLimitGate:
+    """
+    Shared pause for all threads talking to the Spotify API.
+
+    When any call gets a 429, every worker waits until the Retry-After
+    time has passed, instead of each one finding out on its own.
+
+    Args:
+        max_per_second: Optional cap on requests per second across all
+            threads (None only reacts to 429s)
+    """
+
+    def __init__(self, max_per_second=None):
+        self.min_interval = 1 / max_per_second if max_per_second else 0.0
+        self._resume_at = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def wait(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._resume_at - now
+                if delay <= 0:
+                    # Reserve the next request slot, then sleep outside the lock
+                    slot = max(now, self._next_slot)
+                    self._next_slot = slot + self.min_interval
+                    delay = slot - now
+                    break
+            time.sleep(delay)
+        if delay > 0:
+            time.sleep(delay)
+
+
+def backoff_delay(attempt):
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def call_api(gate, func, *args, max_retries=MAX_RETRIES, **kwargs):
+    """
+    Call a spotipy method, honouring rate limits and retrying transient errors.
+
+    Args:
+        gate: RateLimitGate shared by all workers
+        func: spotipy method, e.g. sp.search
+        *args, **kwargs: Passed to func
+        max_retries: Retries after the first attempt
+
+    Returns:
+        Whatever func returns
+
+    Raises:
+        SpotifyException: For non-retryable errors or when retries run out
+    """
+    endpoint = getattr(func, "__name__", "call")
+    with timer("spotify_api", endpoint=endpoint):
+        return _call_with_retries(gate, func, endpoint, max_retries, *args, **kwargs)
+
+
+def _call_with_retries(gate, func, endpoint, max_retries, *args, **kwargs):
+    for attempt in range(max_retries + 1):
+        gate.wait()
+        try:
+            return func(*args, **kwargs)
+        except SpotifyException as e:
+            if attempt == max_retries:
+                raise
+            if e.http_status == 429:
+                increment("spotify_retries", endpoint=endpoint, status=429)
+                retry_after = (e.headers or {}).get("Retry-After")
+                try:
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    delay = backoff_delay(attempt)
+                gate.pause(delay)
+            elif e.http_status and e.http_status >= 500:
+                increment("spotify_retries", endpoint=endpoint, status=e.http_status)
+                time.sleep(backoff_delay(attempt))
+            else:
+                raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == max_retries:
+                raise
+            increment("spotify_retries", endpoint=endpoint, status="connection")
+            time.sleep(backoff_delay(attempt))
+
+
+def iter_items(sp, gate, page):
+    """
+    Yield every item of a paged Spotify response.
+
+    The next page is only requested when the caller has consumed the current
+    one, so stopping early saves requests.
+
+    Args:
+        sp: spotipy.Spotify client
+        gate: RateLimitGate shared by all workers
+        page: First page, e.g. call_api(gate, sp.current_user_playlists, limit=50)
+
+    Yields:
+        dict: One item (playlist, track, ...) at a time
+    """
+    while page:
+        yield from page["items"]
+        page = call_api(gate, sp.next, page) if page.get("next") else None
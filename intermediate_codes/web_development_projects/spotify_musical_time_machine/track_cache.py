@@ -0,0 +1,126 @@
+import re
+import time
+import sqlite3
+import unicodedata
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# SQLite file with every song already searched on Spotify
+CACHE_FILE = "track_cache.db"
+
+# How long results are trusted. Found tracks rarely change; songs that were
+# not found are searched again sooner in case they get added to Spotify.
+FOUND_TTL_DAYS = 365
+NOT_FOUND_TTL_DAYS = 14
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    title_key TEXT NOT NULL,
+    artist_key TEXT NOT NULL,
+    uri TEXT,
+    resolved_at REAL NOT NULL,
+    PRIMARY KEY (title_key, artist_key)
+) WITHOUT ROWID;
+"""
+
+
+def normalize(text):
+    """
+    Lowercase text without accents and with single spaces.
+
+    Args:
+        text: Song title or artist name
+
+    Returns:
+        str: Normalized text, e.g. "Beyoncé  Knowles" -> "beyonce knowles"
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+def song_key(title, artist):
+    return normalize(title), normalize(artist)
+
+
+class TrackCache:
+    """
+    Persistent (title, artist) -> track URI store backed by SQLite.
+
+    A URI of None records that Spotify had no match. Both kinds of result
+    expire after their TTL, so they are searched again eventually.
+
+    The connection belongs to the thread that created the cache: look up and
+    store from the main thread and only run the searches in worker threads.
+
+    Args:
+        file_path: Path to the SQLite database file
+        found_ttl_days: Days a found URI is trusted
+        not_found_ttl_days: Days a "not found" result is trusted
+    """
+
+    def __init__(self, file_path=CACHE_FILE, found_ttl_days=FOUND_TTL_DAYS,
+                 not_found_ttl_days=NOT_FOUND_TTL_DAYS):
+        self.found_ttl = found_ttl_days * 86400
+        self.not_found_ttl = not_found_ttl_days * 86400
+        self.connection = sqlite3.connect(file_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_many(self, songs):
+        """
+        Look up many songs at once.
+
+        Args:
+            songs: List of (title, artist) pairs
+
+        Returns:
+            dict: {(title, artist): uri or None} for the songs with a fresh
+            entry. Songs missing from the dict must be searched.
+        """
+        now = time.time()
+        found = {}
+        for title, artist in songs:
+            row = self.connection.execute(
+                "SELECT uri, resolved_at FROM tracks WHERE title_key = ? AND artist_key = ?",
+                song_key(title, artist),
+            ).fetchone()
+            if row is None:
+                continue
+            uri, resolved_at = row
+            ttl = self.found_ttl if uri else self.not_found_ttl
+            if now - resolved_at < ttl:
+                found[(title, artist)] = uri
+        return found
+
+    def put_many(self, results):
+        """
+        Store search results in a single transaction.
+
+        Args:
+            results: dict {(title, artist): uri or None}
+
+        Returns:
+            int: Number of rows written
+        """
+        now = time.time()
+        rows = [(*song_key(title, artist), uri, now) for (title, artist), uri in results.items()]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO tracks (title_key, artist_key, uri, resolved_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
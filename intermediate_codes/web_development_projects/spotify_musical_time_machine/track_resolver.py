@@ -0,0 +1,119 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from spotify_api import RateLimitGate, call_api
+from fuzzy_match import FuzzyMatcher
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Searches running at the same time
+MAX_WORKERS = 8
+
+
+class TrackResolver:
+    """
+    Find the Spotify URI of many songs with concurrent searches.
+
+    Args:
+        sp: Authenticated spotipy.Spotify client
+        max_workers: Searches running at the same time
+        gate: RateLimitGate shared with other API users (one is created if omitted)
+        cache: Optional TrackCache; cached songs are not searched again
+        fuzzy: Retry songs the exact search misses with FuzzyMatcher
+    """
+
+    def __init__(self, sp, max_workers=MAX_WORKERS, gate=None, cache=None, fuzzy=True):
+        self.sp = sp
+        self.max_workers = max_workers
+        self.gate = gate or RateLimitGate()
+        self.cache = cache
+        self.matcher = FuzzyMatcher(sp, self.gate) if fuzzy else None
+        self.fuzzy_matches = 0
+        self._done = 0
+        self._lock = threading.Lock()
+
+    def search_track(self, song, artist):
+        """
+        Exact search for one song, then one relaxed search if it misses.
+
+        Args:
+            song: Song title
+            artist: Artist name
+
+        Returns:
+            str or None: Track URI, or None when Spotify has no match
+        """
+        query = f"track:{song} artist:{artist}"
+        result = call_api(self.gate, self.sp.search, q=query, type="track", limit=1)
+        items = result["tracks"]["items"]
+        if items or not self.matcher:
+            return items[0]["uri"] if items else None
+
+        uri, score = self.matcher.match(song, artist)
+        if uri:
+            with self._lock:
+                self.fuzzy_matches += 1
+        return uri
+
+    def _report(self, total, song, uri, error):
+        with self._lock:
+            self._done += 1
+            done = self._done
+        if error:
+            print(f"✗ Error searching song {done}/{total} ({song}): {error}")
+        elif uri:
+            print(f"✓ Found song {done}/{total}")
+        else:
+            print(f"✗ Not found: {song}")
+
+    def resolve(self, songs, progress=True):
+        """
+        Resolve many songs concurrently.
+
+        With a cache, songs seen in earlier runs are answered locally and only
+        the rest are searched. Successful searches (found or not found) are
+        stored; searches that failed with an error are not.
+
+        Args:
+            songs: List of (song, artist) pairs
+            progress: Print one line per finished search
+
+        Returns:
+            list: Track URI or None for each song, in the same order
+        """
+        songs = [tuple(pair) for pair in songs]
+        known = self.cache.get_many(songs) if self.cache else {}
+        pending = list(dict.fromkeys(pair for pair in songs if pair not in known))
+        if progress and self.cache:
+            cached = sum(pair in known for pair in songs)
+            print(f"✓ {cached}/{len(songs)} songs found in the local cache")
+
+        self._done = 0
+        self.fuzzy_matches = 0
+        total = len(pending)
+
+        def work(pair):
+            song, artist = pair
+            uri, error = None, None
+            try:
+                uri = self.search_track(song, artist)
+            except Exception as e:
+                error = e
+            if progress:
+                self._report(total, song, uri, error)
+            return uri, error
+
+        searched = {}
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as executor:
+                for pair, (uri, error) in zip(pending, executor.map(work, pending)):
+                    known[pair] = uri
+                    if error is None:
+                        searched[pair] = uri
+
+        if progress and self.fuzzy_matches:
+            print(f"✓ {self.fuzzy_matches} songs matched by the relaxed search")
+        if self.cache and searched:
+            self.cache.put_many(searched)
+        return [known[pair] for pair in songs]
@@ -0,0 +1 @@
+"""Helpers shared by the scraping and Selenium projects in this folder."""
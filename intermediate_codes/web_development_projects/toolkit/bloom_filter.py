@@ -0,0 +1,90 @@
+import os
+import json
+import math
+import hashlib
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Items the filter is sized for, and the share of never-added items it may
+# wrongly report as present once it holds that many. 1,000,000 items at
+# 0.1% take about 1.8 MB.
+CAPACITY = 1_000_000
+ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    """
+    Compact set that can only answer "maybe seen" or "surely not seen".
+
+    Uses a fixed amount of memory however many items are added, at the cost
+    of rare false positives (never false negatives). Good for "have I
+    already handled this?" on very long lists, where skipping an item now
+    and then is fine but redoing one is not.
+
+    Args:
+        capacity: Expected number of items
+        error_rate: Wanted false-positive rate at that capacity
+    """
+
+    def __init__(self, capacity=CAPACITY, error_rate=ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Two hashes from one digest, combined into k positions (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(str(item).encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + n * second) % self.size for n in range(self.hashes)]
+
+    def add(self, item):
+        """Add an item; returns True if it was (surely) not there before."""
+        new = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, item):
+        return all(self.bits[position // 8] & (1 << position % 8) for position in self._positions(item))
+
+    def __len__(self):
+        return self.count
+
+    def save(self, path):
+        """Write the filter to a file (replaced atomically)."""
+        header = {"capacity": self.capacity, "error_rate": self.error_rate, "count": self.count}
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(json.dumps(header).encode("utf-8") + b"\n")
+            file.write(self.bits)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a filter written by save().
+
+        Raises:
+            OSError: If the file can't be read
+            ValueError: If it isn't a saved filter
+        """
+        with open(path, "rb") as file:
+            header = json.loads(file.readline())
+            bits = file.read()
+        bloom = cls(header["capacity"], header["error_rate"])
+        if len(bits) != len(bloom.bits):
+            raise ValueError(f"{path} is not a complete Bloom filter")
+        bloom.bits = bytearray(bits)
+        bloom.count = header["count"]
+        return bloom
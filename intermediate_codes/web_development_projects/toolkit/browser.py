@@ -0,0 +1,126 @@
+import os
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# BROWSER_HEADLESS=1 in the environment (or .env) runs every bot headless,
+# e.g. for scheduled runs on a server
+HEADLESS_ENV = "BROWSER_HEADLESS"
+
+WINDOW_SIZE = "1366,900"
+
+# Requests Chrome never sends (DevTools Network.setBlockedURLs patterns)
+BLOCKED_IMAGES = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.bmp"]
+BLOCKED_MEDIA = ["*.mp4", "*.webm", "*.m4a", "*.mp3", "*.ogg", "*.wav"]
+BLOCKED_FONTS = ["*.woff", "*.woff2", "*.ttf", "*.otf"]
+BLOCKED_TRACKERS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.com*", "*connect.facebook.net*",
+    "*hotjar.com*", "*segment.io*", "*scorecardresearch.com*", "*taboola.com*",
+    "*outbrain.com*", "*amazon-adsystem.com*",
+]
+DEFAULT_BLOCKED = BLOCKED_IMAGES + BLOCKED_MEDIA + BLOCKED_FONTS + BLOCKED_TRACKERS
+
+# Chrome features a bot doesn't need
+LEAN_ARGUMENTS = [
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--disable-dev-shm-usage",
+    "--no-first-run",
+    "--mute-audio",
+]
+
+
+def headless_from_env():
+    return os.environ.get(HEADLESS_ENV, "").lower() in ("1", "true", "yes")
+
+
+def chrome_options(headless=None, profile_dir=None, detach=False, block_images=True):
+    """
+    ChromeOptions shared by all the bots.
+
+    Args:
+        headless: Run without a window (None reads BROWSER_HEADLESS)
+        profile_dir: Folder of a persistent Chrome profile (keeps logins)
+        detach: Leave the window open when the script ends (ignored headless)
+        block_images: Also tell Chrome not to decode images at all
+
+    Returns:
+        webdriver.ChromeOptions
+    """
+    if headless is None:
+        headless = headless_from_env()
+
+    options = webdriver.ChromeOptions()
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_argument(f"--window-size={WINDOW_SIZE}")
+
+    if headless:
+        options.add_argument("--headless=new")
+    elif detach:
+        options.add_experimental_option(name="detach", value=True)
+
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+
+    if block_images:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    # Don't wait for every subresource before driver.get() returns; the bots
+    # wait for what they need with toolkit/browser_waits.py
+    options.page_load_strategy = "eager"
+    return options
+
+
+def block_urls(driver, patterns):
+    """
+    Stop Chrome from requesting URLs that match the patterns.
+
+    Args:
+        driver: Chrome WebDriver
+        patterns: Wildcard patterns, e.g. ["*.png", "*doubleclick.net*"]
+
+    Returns:
+        bool: False if the browser doesn't support the DevTools call
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    except (WebDriverException, AttributeError):
+        return False
+    return True
+
+
+def make_driver(headless=None, profile_dir=None, detach=False, blocked=None, extra_blocked=()):
+    """
+    Start a lean Chrome for a bot.
+
+    Images, media, web fonts and common trackers are blocked by default, so
+    pages load faster and each instance uses less memory.
+
+    Args:
+        headless: Run without a window (None reads BROWSER_HEADLESS)
+        profile_dir: Folder of a persistent Chrome profile (keeps logins)
+        detach: Leave the window open when the script ends
+        blocked: URL patterns to block (defaults to DEFAULT_BLOCKED; [] blocks nothing)
+        extra_blocked: Patterns added to the blocked list
+
+    Returns:
+        webdriver.Chrome
+    """
+    patterns = list(DEFAULT_BLOCKED if blocked is None else blocked) + list(extra_blocked)
+    block_images = any(pattern in patterns for pattern in BLOCKED_IMAGES)
+
+    driver = webdriver.Chrome(options=chrome_options(headless, profile_dir, detach, block_images))
+    if patterns:
+        block_urls(driver, patterns)
+    return driver
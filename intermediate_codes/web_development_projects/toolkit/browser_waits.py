@@ -0,0 +1,236 @@
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as ec
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# How often conditions are checked while waiting
+POLL_INTERVAL = 0.05
+
+# Adaptive timeouts: start here, then follow how long the page really takes
+DEFAULT_TIMEOUT = 10.0
+MIN_TIMEOUT = 2.0
+MAX_TIMEOUT = 30.0
+TIMEOUT_FACTOR = 4.0  # Timeout = this many times the slowest recent wait
+HISTORY_SIZE = 20
+
+# The page counts as idle after this long without requests / DOM changes
+NETWORK_IDLE_SECONDS = 0.5
+DOM_QUIET_SECONDS = 0.3
+
+# Counts in-flight fetch/XHR requests. Installed once per page, the first
+# time a network-idle condition runs.
+NETWORK_TRACKER_JS = """
+const w = window;
+if (!w.__waitTracker) {
+    const t = w.__waitTracker = {
+        inflight: 0,
+        last: performance.now(),
+        entries: performance.getEntriesByType("resource").length,
+    };
+    const done = () => { t.inflight = Math.max(0, t.inflight - 1); t.last = performance.now(); };
+    if (w.fetch) {
+        const originalFetch = w.fetch;
+        w.fetch = function () {
+            t.inflight++;
+            t.last = performance.now();
+            return originalFetch.apply(this, arguments).finally(done);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        t.inflight++;
+        t.last = performance.now();
+        this.addEventListener("loadend", done);
+        return originalSend.apply(this, arguments);
+    };
+}
+const t = w.__waitTracker;
+// Images, scripts and styles don't go through fetch/XHR: watch the resource list too
+const entries = performance.getEntriesByType("resource").length;
+if (entries !== t.entries) { t.entries = entries; t.last = performance.now(); }
+return [document.readyState, t.inflight, (performance.now() - t.last) / 1000];
+"""
+
+# Records the time of the last DOM change under a root element
+DOM_TRACKER_JS = """
+const root = arguments[0] ? document.querySelector(arguments[0]) : document.documentElement;
+if (!root) { return null; }
+if (!root.__waitObserver) {
+    root.__waitLastChange = performance.now();
+    root.__waitObserver = new MutationObserver(() => { root.__waitLastChange = performance.now(); });
+    root.__waitObserver.observe(root, {childList: true, subtree: true, characterData: true, attributes: true});
+}
+return (performance.now() - root.__waitLastChange) / 1000;
+"""
+
+
+class AdaptiveTimeout:
+    """
+    Timeout that follows how fast the page actually responds.
+
+    Every successful wait is recorded. The timeout becomes TIMEOUT_FACTOR
+    times the slowest of the recent waits, kept between the minimum and the
+    maximum. A fast site gets short timeouts and failed actions are noticed
+    quickly; a slow one gets more patience. A timeout doubles the value.
+
+    Args:
+        initial: Timeout before anything has been measured
+        minimum: Lower bound in seconds
+        maximum: Upper bound in seconds
+    """
+
+    def __init__(self, initial=DEFAULT_TIMEOUT, minimum=MIN_TIMEOUT, maximum=MAX_TIMEOUT):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.current = initial
+        self.samples = []
+
+    @property
+    def timeout(self):
+        return self.current
+
+    def record(self, seconds):
+        self.samples = (self.samples + [seconds])[-HISTORY_SIZE:]
+        self.current = min(self.maximum, max(self.minimum, TIMEOUT_FACTOR * max(self.samples)))
+
+    def expired(self):
+        self.current = min(self.maximum, self.current * 2)
+
+
+def wait_for(driver, condition, timeout=None, adaptive=None, poll=POLL_INTERVAL, message=""):
+    """
+    Poll a condition until it returns something truthy.
+
+    Args:
+        driver: Selenium WebDriver
+        condition: Callable receiving the driver (any expected_conditions works)
+        timeout: Seconds to wait (defaults to the adaptive timeout, then DEFAULT_TIMEOUT)
+        adaptive: Optional AdaptiveTimeout that learns from this wait
+        poll: Seconds between checks
+        message: Text of the TimeoutException
+
+    Returns:
+        The condition's truthy result
+
+    Raises:
+        TimeoutException: If the condition never became true
+    """
+    if timeout is None:
+        timeout = adaptive.timeout if adaptive else DEFAULT_TIMEOUT
+
+    start = time.monotonic()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=poll).until(condition, message)
+    except TimeoutException:
+        if adaptive:
+            adaptive.expired()
+        raise
+    if adaptive:
+        adaptive.record(time.monotonic() - start)
+    return result
+
+
+# ==============================================================================
+# CONDITIONS
+# ==============================================================================
+
+def text_changed(element, old_text):
+    """
+    Condition: the element's text is no longer old_text.
+
+    A stale element (React re-rendered it) counts as changed.
+
+    Returns:
+        Callable returning the new text (or True when stale)
+    """
+    def condition(driver):
+        try:
+            text = element.text
+        except StaleElementReferenceException:
+            return True
+        return (text or True) if text != old_text else False
+    return condition
+
+
+def network_idle(idle_seconds=NETWORK_IDLE_SECONDS):
+    """
+    Condition: page loaded, no fetch/XHR in flight, and no new resources
+    for idle_seconds.
+    """
+    def condition(driver):
+        ready_state, inflight, quiet_for = driver.execute_script(NETWORK_TRACKER_JS)
+        return ready_state == "complete" and inflight == 0 and quiet_for >= idle_seconds
+    return condition
+
+
+def dom_quiet(root_selector=None, quiet_seconds=DOM_QUIET_SECONDS):
+    """
+    Condition: no DOM mutation under root_selector for quiet_seconds.
+
+    The MutationObserver is installed the first time the condition runs, so
+    the quiet period is measured from that moment at the earliest.
+    """
+    def condition(driver):
+        quiet_for = driver.execute_script(DOM_TRACKER_JS, root_selector)
+        return quiet_for is not None and quiet_for >= quiet_seconds
+    return condition
+
+
+def count_above(locator, previous):
+    """
+    Condition: more than `previous` elements match the locator.
+
+    Returns:
+        Callable returning the matching elements
+    """
+    def condition(driver):
+        elements = driver.find_elements(*locator)
+        return elements if len(elements) > previous else False
+    return condition
+
+
+# ==============================================================================
+# SHORTCUTS
+# ==============================================================================
+
+def wait_for_page_ready(driver, timeout=None, adaptive=None, idle_seconds=NETWORK_IDLE_SECONDS):
+    """Wait until the page has loaded and the network has gone quiet."""
+    return wait_for(driver, network_idle(idle_seconds), timeout, adaptive,
+                    message="Page did not become idle")
+
+
+def wait_for_text_change(driver, element, old_text, timeout=None, adaptive=None):
+    """
+    Wait until an element's text changes (e.g. "Book" -> "Booked").
+
+    Returns:
+        The new text, or True if the element was replaced
+
+    Raises:
+        TimeoutException: If the text did not change in time
+    """
+    return wait_for(driver, text_changed(element, old_text), timeout, adaptive,
+                    message=f"Text stayed '{old_text}'")
+
+
+def wait_for_dom_quiet(driver, root_selector=None, timeout=None, adaptive=None,
+                       quiet_seconds=DOM_QUIET_SECONDS):
+    """Wait until the DOM under root_selector stops changing."""
+    return wait_for(driver, dom_quiet(root_selector, quiet_seconds), timeout, adaptive,
+                    message="DOM kept changing")
+
+
+def wait_for_clickable(driver, locator, timeout=None, adaptive=None):
+    """Wait until an element is visible and enabled, and return it."""
+    return wait_for(driver, ec.element_to_be_clickable(locator), timeout, adaptive,
+                    message=f"{locator} not clickable")
+
+
+def wait_for_present(driver, locator, timeout=None, adaptive=None):
+    """Wait until an element is in the DOM, and return it."""
+    return wait_for(driver, ec.presence_of_element_located(locator), timeout, adaptive,
+                    message=f"{locator} not found")
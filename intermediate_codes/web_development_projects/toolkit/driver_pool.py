@@ -0,0 +1,387 @@
+import os
+import time
+import queue
+import shutil
+import argparse
+import threading
+import subprocess
+import urllib.request
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from .browser import make_driver, block_urls, headless_from_env, DEFAULT_BLOCKED, LEAN_ARGUMENTS, WINDOW_SIZE
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Warm sessions kept by a pool
+POOL_SIZE = 2
+
+# Persistent profiles live in <PROFILE_ROOT>/slot-<n> so logins survive restarts
+PROFILE_ROOT = os.path.join(os.path.expanduser("~"), ".bot_chrome_pool")
+
+# A session is replaced after this many leases or seconds, whichever comes first
+MAX_USES = 50
+MAX_AGE = 6 * 3600
+
+# Warm Chrome server: slot n listens for DevTools on BASE_PORT + n
+BASE_PORT = 9300
+HEALTH_INTERVAL = 30
+
+# A lease lock older than this is considered abandoned (crashed script)
+LEASE_TTL = 2 * 3600
+
+
+# ==============================================================================
+# IN-PROCESS POOL
+# ==============================================================================
+
+class PooledSession:
+    def __init__(self, slot, driver):
+        self.slot = slot
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+def is_healthy(driver):
+    """True if the browser still answers and has a window."""
+    try:
+        return bool(driver.window_handles) and driver.execute_script("return 1") == 1
+    except WebDriverException:
+        return False
+
+
+class DriverPool:
+    """
+    Keep N Chrome sessions warm and lend them to jobs.
+
+    Each slot has its own persistent profile, so a setup() that logs in only
+    really logs in the first time; later sessions start with the cookies.
+    Sessions are checked before every lease and replaced when they crash, fail
+    a job, or reach MAX_USES / MAX_AGE.
+
+    Args:
+        size: Number of sessions
+        profile_root: Folder holding one profile folder per slot
+        setup: Optional setup(driver) run on every new session (e.g. login)
+        max_uses: Leases before a session is replaced
+        max_age: Seconds before a session is replaced
+        **driver_options: Passed to make_driver() (headless, blocked, ...)
+    """
+
+    def __init__(self, size=POOL_SIZE, profile_root=PROFILE_ROOT, setup=None,
+                 max_uses=MAX_USES, max_age=MAX_AGE, **driver_options):
+        self.size = size
+        self.profile_root = profile_root
+        self.setup = setup
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.driver_options = driver_options
+        self._idle = queue.Queue()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _create(self, slot):
+        profile_dir = os.path.join(self.profile_root, f"slot-{slot}")
+        driver = make_driver(profile_dir=profile_dir, **self.driver_options)
+        if self.setup:
+            try:
+                self.setup(driver)
+            except Exception:
+                driver.quit()
+                raise
+        return PooledSession(slot, driver)
+
+    @staticmethod
+    def _discard(session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+    def start(self):
+        """Start every session in parallel (the slow part happens once, here)."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            for session in executor.map(self._create, range(self.size)):
+                self._idle.put(session)
+
+    def _usable(self, session):
+        too_old = time.monotonic() - session.created_at > self.max_age
+        return session.uses < self.max_uses and not too_old and is_healthy(session.driver)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Borrow a warm driver for one job.
+
+        If the job raises, the session is thrown away and a fresh one is
+        started for the next lease, so a broken page never reaches another job.
+
+        Args:
+            timeout: Seconds to wait for a free session (None waits forever)
+
+        Yields:
+            WebDriver
+
+        Raises:
+            queue.Empty: If no session became free in time
+        """
+        self.start()
+        session = self._idle.get(timeout=timeout)
+        if not self._usable(session):
+            self._discard(session)
+            try:
+                session = self._create(session.slot)
+            except Exception:
+                # Keep the slot: the broken session is replaced on the next lease
+                self._idle.put(session)
+                raise
+
+        session.uses += 1
+        failed = False
+        try:
+            yield session.driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if failed:
+                self._discard(session)
+                session.uses = self.max_uses
+            self._idle.put(session)
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+# ==============================================================================
+# WARM CHROME SERVER (shared between runs)
+# ==============================================================================
+
+def find_chrome():
+    """
+    Path of the Chrome executable (CHROME_BINARY overrides the search).
+
+    Returns:
+        str or None
+    """
+    candidates = [
+        os.environ.get("CHROME_BINARY"),
+        shutil.which("google-chrome"),
+        shutil.which("google-chrome-stable"),
+        shutil.which("chromium"),
+        shutil.which("chromium-browser"),
+        shutil.which("chrome"),
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    ]
+    return next((path for path in candidates if path and os.path.exists(path)), None)
+
+
+def debugger_alive(port):
+    """True if a Chrome answers DevTools requests on this port."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def attach_driver(port, blocked=None):
+    """
+    Control an already running Chrome instead of starting one.
+
+    Only chromedriver starts, so this takes milliseconds instead of the
+    seconds of a cold Chrome start.
+
+    Args:
+        port: DevTools port of the running Chrome
+        blocked: URL patterns to block (defaults to DEFAULT_BLOCKED)
+
+    Returns:
+        webdriver.Chrome
+    """
+    options = webdriver.ChromeOptions()
+    options.debugger_address = f"127.0.0.1:{port}"
+    driver = webdriver.Chrome(options=options)
+    block_urls(driver, DEFAULT_BLOCKED if blocked is None else blocked)
+    return driver
+
+
+class SlotLock:
+    """
+    Cross-process lease of one warm Chrome, held as an exclusive lock file.
+
+    Locks older than LEASE_TTL are taken over, so a crashed script can't
+    block a slot forever.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.held = False
+
+    def acquire(self):
+        for _ in range(2):
+            try:
+                descriptor = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) < LEASE_TTL:
+                        return False
+                    os.remove(self.path)
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(descriptor, "w") as file:
+                file.write(str(os.getpid()))
+            self.held = True
+            return True
+        return False
+
+    def release(self):
+        if self.held:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.held = False
+
+
+class WarmLease:
+    """A driver attached to a warm Chrome, plus the lock that reserves it."""
+
+    def __init__(self, driver, lock, port):
+        self.driver = driver
+        self.lock = lock
+        self.port = port
+
+    def release(self):
+        # Detach chromedriver but leave the warm Chrome running for the next run
+        try:
+            self.driver.service.stop()
+        except Exception:
+            pass
+        self.lock.release()
+
+
+def lease_warm_driver(size=POOL_SIZE, base_port=BASE_PORT, profile_root=PROFILE_ROOT, blocked=None):
+    """
+    Borrow a Chrome kept warm by `python -m toolkit.driver_pool`.
+
+    Args:
+        size: Number of slots the server runs
+        base_port: DevTools port of slot 0
+        profile_root: Folder with the lock files
+        blocked: URL patterns to block on the attached driver
+
+    Returns:
+        WarmLease or None when no warm Chrome is free (start one normally)
+    """
+    os.makedirs(profile_root, exist_ok=True)
+    for slot in range(size):
+        port = base_port + slot
+        if not debugger_alive(port):
+            continue
+        lock = SlotLock(os.path.join(profile_root, f"slot-{slot}.lock"))
+        if not lock.acquire():
+            continue
+        try:
+            return WarmLease(attach_driver(port, blocked), lock, port)
+        except WebDriverException:
+            lock.release()
+    return None
+
+
+class WarmChromeServer:
+    """
+    Keep N Chrome processes running with persistent profiles and DevTools
+    ports, restarting any that die or get too old (when not leased).
+
+    Args:
+        size: Number of Chrome processes
+        base_port: DevTools port of slot 0
+        profile_root: Folder holding one profile folder per slot
+        headless: Run without windows (None reads BROWSER_HEADLESS)
+    """
+
+    def __init__(self, size=POOL_SIZE, base_port=BASE_PORT, profile_root=PROFILE_ROOT, headless=None):
+        self.size = size
+        self.base_port = base_port
+        self.profile_root = profile_root
+        self.headless = headless_from_env() if headless is None else headless
+        self.chrome = find_chrome()
+        self.processes = {}
+        self.started_at = {}
+        if not self.chrome:
+            raise FileNotFoundError("Chrome not found, set CHROME_BINARY")
+
+    def launch(self, slot):
+        profile_dir = os.path.join(self.profile_root, f"slot-{slot}")
+        arguments = [self.chrome, f"--remote-debugging-port={self.base_port + slot}",
+                     f"--user-data-dir={profile_dir}", f"--window-size={WINDOW_SIZE}",
+                     *LEAN_ARGUMENTS, "about:blank"]
+        if self.headless:
+            arguments.insert(1, "--headless=new")
+        self.processes[slot] = subprocess.Popen(arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.started_at[slot] = time.monotonic()
+
+    def stop(self, slot):
+        process = self.processes.pop(slot, None)
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def check(self):
+        """Restart dead slots, and old slots nobody is using."""
+        for slot in range(self.size):
+            port = self.base_port + slot
+            leased = os.path.exists(os.path.join(self.profile_root, f"slot-{slot}.lock"))
+            too_old = time.monotonic() - self.started_at.get(slot, 0) > MAX_AGE
+            if not debugger_alive(port) or (too_old and not leased):
+                print(f"↻ Restarting Chrome slot {slot} (port {port})")
+                self.stop(slot)
+                self.launch(slot)
+
+    def serve_forever(self, interval=HEALTH_INTERVAL):
+        os.makedirs(self.profile_root, exist_ok=True)
+        for slot in range(self.size):
+            self.launch(slot)
+        print(f"✓ {self.size} warm Chrome sessions on ports "
+              f"{self.base_port}-{self.base_port + self.size - 1} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(interval)
+                self.check()
+        except KeyboardInterrupt:
+            for slot in list(self.processes):
+                self.stop(slot)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep warm Chrome sessions for the bots.")
+    parser.add_argument("--size", type=int, default=POOL_SIZE, help="Number of Chrome processes")
+    parser.add_argument("--base-port", type=int, default=BASE_PORT, help="DevTools port of the first one")
+    parser.add_argument("--headless", action="store_true", help="Run without windows")
+    args = parser.parse_args()
+    WarmChromeServer(args.size, args.base_port, headless=args.headless or None).serve_forever()
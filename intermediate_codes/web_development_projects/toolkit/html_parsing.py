@@ -0,0 +1,109 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Optional fast backends: "pip install lxml" and/or "pip install selectolax"
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as FastHTMLParser
+except ImportError:
+    FastHTMLParser = None
+
+
+def make_soup(html, only=None, parser=None):
+    """
+    Build a BeautifulSoup tree with the fastest installed parser.
+
+    Args:
+        html: Page HTML
+        only: Optional SoupStrainer; only matching tags (and their
+            children) are kept, the rest of the page is skipped
+        parser: Force a parser name ("lxml", "html.parser", ...)
+
+    Returns:
+        BeautifulSoup: Parsed tree
+    """
+    return BeautifulSoup(html, parser or PARSER, parse_only=only)
+
+
+def strainer(name=None, **attrs):
+    """
+    Shortcut for SoupStrainer, e.g. strainer("span", class_="a-price-whole").
+    """
+    return SoupStrainer(name, **attrs)
+
+
+class HtmlDocument:
+    """
+    CSS-selector access to a page through the fastest available backend.
+
+    selectolax (lexbor engine) is used when installed. Otherwise the page is
+    parsed with BeautifulSoup + lxml/html.parser, optionally restricted to the
+    tags matched by `only` so the rest of the page never becomes a tree.
+
+    Args:
+        html: Page HTML
+        only: SoupStrainer for the BeautifulSoup fallback (ignored by selectolax,
+            which is faster parsing the whole page than bs4 is parsing a part)
+        backend: "selectolax" or "bs4" to force one
+        parser: Parser for the bs4 backend (defaults to the fastest installed)
+    """
+
+    def __init__(self, html, only=None, backend=None, parser=None):
+        if backend is None:
+            backend = "selectolax" if FastHTMLParser is not None else "bs4"
+        self.backend = backend
+
+        if backend == "selectolax":
+            self._tree = FastHTMLParser(html)
+        else:
+            self._tree = make_soup(html, only=only, parser=parser)
+
+    def _nodes(self, selector):
+        if self.backend == "selectolax":
+            return self._tree.css(selector)
+        return self._tree.select(selector)
+
+    def _text(self, node):
+        if self.backend == "selectolax":
+            return node.text(deep=True)
+        return node.get_text()
+
+    def _attr(self, node, name):
+        if self.backend == "selectolax":
+            return node.attributes.get(name)
+        return node.get(name)
+
+    def texts(self, selector):
+        """
+        Text of every node matching a CSS selector.
+
+        Returns:
+            list: One string per node (not stripped)
+        """
+        return [self._text(node) for node in self._nodes(selector)]
+
+    def attrs(self, selector, name):
+        """
+        Value of one attribute for every node matching a CSS selector.
+
+        Returns:
+            list: Attribute values (None when missing)
+        """
+        return [self._attr(node, name) for node in self._nodes(selector)]
+
+    def first_text(self, selector):
+        """
+        Text of the first matching node.
+
+        Returns:
+            str or None: Text, or None if nothing matches
+        """
+        if self.backend == "selectolax":
+            node = self._tree.css_first(selector)
+        else:
+            node = self._tree.select_one(selector)
+        return self._text(node) if node is not None else None
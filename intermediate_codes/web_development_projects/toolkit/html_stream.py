@@ -0,0 +1,312 @@
+import re
+import codecs
+from html.parser import HTMLParser
+from .http_client import get_client
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Bytes read from the network before the parser is fed again
+CHUNK_SIZE = 64 * 1024
+
+# Tags that never get a closing tag
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z0-9]*)((?:\.[^.\[\s]+)*)((?:\[[^\]]+\])*)$")
+ATTRIBUTE_SELECTOR = re.compile(r"\[([^=\]]+)(?:=\"?([^\"\]]*)\"?)?\]")
+
+
+# ==============================================================================
+# MINI SELECTORS
+# ==============================================================================
+
+def compile_selector(selector):
+    """
+    Turn a small CSS selector into a list of tag tests, one per level.
+
+    Supported: tag names, .classes, [attr] and [attr="value"], joined by
+    spaces for "descendant of". Example: 'span.titleline a'.
+
+    Args:
+        selector: Selector string
+
+    Returns:
+        list: Functions taking (tag, attrs) and returning True on a match
+    """
+    steps = []
+    for part in selector.split():
+        match = SIMPLE_SELECTOR.match(part)
+        if not match:
+            raise ValueError(f"Unsupported selector: {part}")
+        tag = match.group(1).lower()
+        classes = set(match.group(2).split(".")) - {""}
+        attributes = ATTRIBUTE_SELECTOR.findall(match.group(3))
+        steps.append(_make_test(tag, classes, attributes))
+    return steps
+
+
+def _make_test(tag, classes, attributes):
+    def test(name, attrs):
+        if tag and name != tag:
+            return False
+        if classes and not classes <= set((attrs.get("class") or "").split()):
+            return False
+        for attr_name, value in attributes:
+            if attr_name not in attrs or (value and attrs[attr_name] != value):
+                return False
+        return True
+    return test
+
+
+def clean_text(parts):
+    return " ".join("".join(parts).split())
+
+
+class RecordSpec:
+    """
+    Describe one kind of record to pull out of a page.
+
+    Args:
+        kind: Label returned with every record, e.g. "card"
+        root: Selector of the element that wraps one record; a descendant
+            selector ("div.results article") only matches inside its ancestors
+        fields: Dict of field name -> (selector, source). selector is None
+            for the root element itself; source is "text" or an attribute
+            name. The first match inside the record wins.
+    """
+
+    def __init__(self, kind, root, fields):
+        self.kind = kind
+        steps = compile_selector(root)
+        self.root = steps[-1]
+        self.root_ancestors = steps[:-1]
+        self.fields = {
+            name: (compile_selector(selector) if selector else None, source)
+            for name, (selector, source) in fields.items()
+        }
+
+    def matches(self, tag, attrs, stack):
+        """
+        True if the element starts a record.
+
+        Args:
+            tag, attrs: The element
+            stack: (tag, attrs) of the elements it is nested in, outermost first
+        """
+        if not self.root(tag, attrs):
+            return False
+        level = 0
+        for open_tag, open_attrs in stack:
+            if level == len(self.root_ancestors):
+                break
+            if self.root_ancestors[level](open_tag, open_attrs):
+                level += 1
+        return level == len(self.root_ancestors)
+
+
+class _FieldState:
+    """Progress of one field inside one open record."""
+
+    def __init__(self, steps, source):
+        self.steps = steps
+        self.source = source
+        self.ancestors = []  # [tag, depth] of matched outer steps
+        self.capture = None  # [tag, depth, parts] while reading text
+        self.done = False
+
+
+class _OpenRecord:
+    def __init__(self, spec, tag, attrs):
+        self.spec = spec
+        self.tag = tag
+        self.depth = 0
+        self.values = {name: None for name in spec.fields}
+        self.root_text = []
+        self.states = {}
+        for name, (steps, source) in spec.fields.items():
+            if steps is None:
+                if source != "text":
+                    self.values[name] = attrs.get(source)
+            else:
+                self.states[name] = _FieldState(steps, source)
+
+    def start(self, tag, attrs):
+        if tag == self.tag:
+            self.depth += 1
+
+        for name, state in self.states.items():
+            if state.done:
+                continue
+            if state.capture and state.capture[0] == tag:
+                state.capture[1] += 1
+            for ancestor in state.ancestors:
+                if ancestor[0] == tag:
+                    ancestor[1] += 1
+            if state.capture:
+                continue
+
+            level = len(state.ancestors)
+            if not state.steps[level](tag, attrs):
+                continue
+            if level < len(state.steps) - 1:
+                state.ancestors.append([tag, 1])
+            elif state.source == "text":
+                state.capture = [tag, 1, []]
+            else:
+                self.values[name] = attrs.get(state.source)
+                state.done = True
+
+    def data(self, text):
+        self.root_text.append(text)
+        for state in self.states.values():
+            if state.capture:
+                state.capture[2].append(text)
+
+    def end(self, tag):
+        """Close a tag. Returns True when the record itself is closed."""
+        for name, state in self.states.items():
+            if state.done:
+                continue
+            if state.capture and state.capture[0] == tag:
+                state.capture[1] -= 1
+                if state.capture[1] == 0:
+                    self.values[name] = clean_text(state.capture[2])
+                    state.done = True
+                    continue
+            for ancestor in state.ancestors:
+                if ancestor[0] == tag:
+                    ancestor[1] -= 1
+            while state.ancestors and state.ancestors[-1][1] <= 0:
+                state.ancestors.pop()
+
+        if tag == self.tag:
+            self.depth -= 1
+        return self.depth <= 0
+
+    def finish(self):
+        for name, (steps, source) in self.spec.fields.items():
+            if steps is None and source == "text":
+                self.values[name] = clean_text(self.root_text)
+            elif self.values[name] is None and self.states[name].capture:
+                self.values[name] = clean_text(self.states[name].capture[2])
+        return self.spec.kind, self.values
+
+
+# ==============================================================================
+# INCREMENTAL EXTRACTOR
+# ==============================================================================
+
+class StreamExtractor(HTMLParser):
+    """
+    Incremental HTML extractor built on the standard library parser.
+
+    Feed it text as it arrives; every record whose root element has closed is
+    returned right away. No tree of the page is ever built.
+
+    Args:
+        specs: List of RecordSpec
+    """
+
+    def __init__(self, specs):
+        super().__init__(convert_charrefs=True)
+        self.specs = specs
+        self._open = []
+        self._ready = []
+        self._stack = []  # (tag, attrs) of the open elements, for descendant roots
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or "" for name, value in attrs}
+        for record in self._open:
+            record.start(tag, attrs)
+
+        for spec in self.specs:
+            if spec.matches(tag, attrs, self._stack):
+                record = _OpenRecord(spec, tag, attrs)
+                record.start(tag, attrs)
+                self._open.append(record)
+
+        if tag in VOID_TAGS:
+            self.handle_endtag(tag)
+        else:
+            self._stack.append((tag, attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_data(self, data):
+        for record in self._open:
+            record.data(data)
+
+    def handle_endtag(self, tag):
+        # Close up to the innermost open element of that name; a stray end
+        # tag with no open element is ignored
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                del self._stack[index:]
+                break
+
+        for record in list(self._open):
+            if record.end(tag):
+                self._open.remove(record)
+                self._ready.append(record.finish())
+
+    def feed_chunk(self, text):
+        """
+        Parse the next piece of the page.
+
+        Args:
+            text: Decoded HTML text
+
+        Returns:
+            list: (kind, record) tuples completed by this chunk
+        """
+        self.feed(text)
+        ready, self._ready = self._ready, []
+        return ready
+
+    def finish(self):
+        """Flush the parser and return any record left open at end of page."""
+        self.close()
+        ready = self._ready + [record.finish() for record in self._open]
+        self._ready, self._open, self._stack = [], [], []
+        return ready
+
+
+def stream_records(url, specs, dump_path=None, client=None, chunk_size=CHUNK_SIZE):
+    """
+    Download a page in chunks and yield records as soon as they close.
+
+    Args:
+        url: Page URL
+        specs: List of RecordSpec
+        dump_path: Optional file where the raw HTML is written as it arrives
+        client: HttpClient to use (defaults to the shared one)
+        chunk_size: Bytes per network read
+
+    Yields:
+        tuple: (kind, record dict)
+
+    Raises:
+        requests.exceptions.RequestException: On network or HTTP errors
+    """
+    client = client or get_client()
+    extractor = StreamExtractor(specs)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    dump = open(dump_path, mode="wb") if dump_path else None
+
+    try:
+        for chunk in client.stream(url, chunk_size=chunk_size):
+            if dump:
+                dump.write(chunk)
+            yield from extractor.feed_chunk(decoder.decode(chunk))
+        yield from extractor.feed_chunk(decoder.decode(b"", final=True))
+        yield from extractor.finish()
+    finally:
+        if dump:
+            dump.close()
@@ -0,0 +1,306 @@
+import os
+import re
+import json
+import time
+import types
+import hashlib
+import threading
+import requests
+from .http_client import get_client
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Folder (relative to where the script runs) that holds cached pages
+CACHE_DIR = ".http_cache"
+
+# Oldest pages are evicted once the cache grows past this size
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+# Seconds to wait for a page before giving up
+REQUEST_TIMEOUT = 15
+
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+def parse_cache_control(value):
+    """
+    Read the caching rules we care about from a Cache-Control header.
+
+    Args:
+        value: Header value, e.g. "public, max-age=300"
+
+    Returns:
+        dict: "max_age" (int or None), "no_store" and "no_cache" (bool)
+    """
+    value = (value or "").lower()
+    match = MAX_AGE_PATTERN.search(value)
+    return {
+        "max_age": int(match.group(1)) if match else None,
+        "no_store": "no-store" in value,
+        "no_cache": "no-cache" in value,
+    }
+
+
+def _hash_code(code, digest):
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(const, digest)
+        elif isinstance(const, frozenset):
+            # Set order changes from run to run
+            digest.update(repr(sorted(const, key=repr)).encode("utf-8"))
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+def parser_version(parse, version=None):
+    """
+    Identify a parse function, so a stored result is dropped once its code
+    changes.
+
+    Args:
+        parse: The parse function
+        version: Optional extra label to bump by hand (e.g. when only a
+            helper the parser calls has changed)
+
+    Returns:
+        str: "<qualified name>:<hash of its bytecode>[:version]"
+    """
+    digest = hashlib.sha1()
+    code = getattr(parse, "__code__", None)
+    if code is not None:
+        _hash_code(code, digest)
+    label = f"{getattr(parse, '__qualname__', repr(parse))}:{digest.hexdigest()[:12]}"
+    return f"{label}:{version}" if version is not None else label
+
+
+class CachedResponse:
+    """
+    Minimal response object returned by HttpCache.get().
+
+    It mirrors the parts of requests.Response the scripts use
+    (status_code, content, text, encoding, raise_for_status) and adds
+    from_cache, which is True when the body came from disk.
+    """
+
+    def __init__(self, url, status_code, headers, content, from_cache):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.from_cache = from_cache
+        self.encoding = "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HttpCache:
+    """
+    Size-bounded on-disk HTTP cache with conditional requests.
+
+    - Fresh entries (Cache-Control max-age not expired) are served from disk
+      without touching the network.
+    - Stale entries are revalidated with If-None-Match / If-Modified-Since;
+      a 304 answer reuses the cached body.
+    - get_parsed() also stores the parse result, so an unchanged page is not
+      parsed again either (until the parse function's code changes).
+
+    Args:
+        cache_dir: Folder where pages are stored
+        max_bytes: Maximum total size of cached bodies
+        session: Object with a requests-style get() method (defaults to the
+            shared pooled HttpClient)
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, session=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.session = session or get_client()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(
+            entry.stat().st_size for entry in os.scandir(cache_dir) if entry.name.endswith(".body")
+        )
+
+    # --------------------------------------------------------------------------
+    # Storage helpers
+    # --------------------------------------------------------------------------
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
+
+    def _load_meta(self, url):
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, mode="r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _load(self, url):
+        meta = self._load_meta(url)
+        if meta is None:
+            return None, None
+
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, mode="rb") as file:
+                body = file.read()
+        except (OSError, ValueError):
+            return None, None
+
+        # Touch the body so eviction treats it as recently used
+        os.utime(body_path)
+        return meta, body
+
+    def _write_atomic(self, path, data):
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, mode="wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+    def _save_meta(self, url, meta):
+        meta_path, _ = self._paths(url)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _save(self, url, meta, body):
+        meta_path, body_path = self._paths(url)
+        old_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+        self._write_atomic(body_path, body)
+        self._save_meta(url, meta)
+        with self._lock:
+            self._total_bytes += len(body) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits again."""
+        bodies = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".body")]
+        bodies.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in bodies:
+            if self._total_bytes <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            for path in (entry.path, entry.path[:-len(".body")] + ".json"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes -= size
+
+    @staticmethod
+    def _freshness(headers, stored_at):
+        rules = parse_cache_control(headers.get("Cache-Control"))
+        expires_at = stored_at + rules["max_age"] if rules["max_age"] is not None else stored_at
+        return rules, expires_at
+
+    # --------------------------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------------------------
+
+    def get(self, url, headers=None, timeout=REQUEST_TIMEOUT):
+        """
+        Fetch a URL through the cache.
+
+        Args:
+            url: Page URL
+            headers: Extra request headers (User-Agent, ...)
+            timeout: Seconds to wait for the server
+
+        Returns:
+            CachedResponse: Response with from_cache set when no body was downloaded
+
+        Raises:
+            requests.exceptions.RequestException: On network errors
+        """
+        meta, body = self._load(url)
+        now = time.time()
+
+        # Fresh copy on disk: no network at all
+        if meta and not meta["no_cache"] and now < meta["expires_at"]:
+            return CachedResponse(url, meta["status_code"], meta["headers"], body, from_cache=True)
+
+        request_headers = dict(headers or {})
+        if meta:
+            if meta["headers"].get("ETag"):
+                request_headers["If-None-Match"] = meta["headers"]["ETag"]
+            if meta["headers"].get("Last-Modified"):
+                request_headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+
+        response = self.session.get(url=url, headers=request_headers, timeout=timeout)
+
+        # Not modified: keep the cached body, refresh its expiry
+        if response.status_code == 304 and meta:
+            meta["headers"].update({
+                name: response.headers[name]
+                for name in ("ETag", "Last-Modified", "Cache-Control")
+                if name in response.headers
+            })
+            rules, meta["expires_at"] = self._freshness(meta["headers"], now)
+            meta["no_cache"] = rules["no_cache"]
+            self._save_meta(url, meta)
+            return CachedResponse(url, meta["status_code"], meta["headers"], body, from_cache=True)
+
+        saved_headers = {
+            name: response.headers[name]
+            for name in ("ETag", "Last-Modified", "Cache-Control", "Content-Type")
+            if name in response.headers
+        }
+        result = CachedResponse(url, response.status_code, saved_headers, response.content, from_cache=False)
+
+        rules, expires_at = self._freshness(saved_headers, now)
+        if response.status_code == 200 and not rules["no_store"]:
+            self._save(url, {
+                "url": url,
+                "status_code": response.status_code,
+                "headers": saved_headers,
+                "expires_at": expires_at,
+                "no_cache": rules["no_cache"],
+                "parsed": {},
+            }, response.content)
+        return result
+
+    def get_parsed(self, url, parse, name="default", headers=None, timeout=REQUEST_TIMEOUT, version=None):
+        """
+        Fetch a URL and run parse() on its HTML, reusing the stored result
+        when the page has not changed since the last run.
+
+        Args:
+            url: Page URL
+            parse: Function that takes the HTML text and returns JSON-serializable data
+            name: Label for this parse result (one page can have several parsers)
+            headers: Extra request headers
+            timeout: Seconds to wait for the server
+            version: Optional label stored with the result; change it to drop
+                results parsed before (edits to parse() itself are detected)
+
+        Returns:
+            Whatever parse() returns (lists come back as lists, tuples as lists)
+        """
+        response = self.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+
+        parser = parser_version(parse, version)
+        meta = self._load_meta(url) if response.from_cache else None
+        stored = meta.get("parsed", {}).get(name) if meta else None
+        if isinstance(stored, dict) and stored.get("parser") == parser:
+            return stored["result"]
+
+        result = parse(response.text)
+
+        meta = self._load_meta(url)
+        if meta is not None:
+            meta.setdefault("parsed", {})[name] = {"parser": parser, "result": result}
+            self._save_meta(url, meta)
+        return result
@@ -0,0 +1,313 @@
+import os
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from .metrics import timer, increment
+
+# Optional: HTTP/2 needs "pip install httpx[http2]" (httpx plus h2)
+try:
+    import httpx
+    import h2  # noqa: F401 (httpx needs it for http2=True)
+except ImportError:
+    httpx = None
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# The one place where the scrapers' browser identity is defined
+USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/140.0.0.0 Safari/537.36")
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Keep-alive connections kept open per host
+POOL_SIZE = 16
+
+# Retry settings for rate limits and server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5  # First retry waits up to 0.5 s, then 1 s, 2 s, ...
+BACKOFF_MAX = 30.0
+
+# Only these are retried on any error by default. A POST that timed out may
+# still have been processed (a submitted form), so it is only retried when
+# it surely wasn't: the connection never opened, or a 429/503 asked for it
+# with Retry-After.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+SAFE_RETRY_STATUSES = {429, 503}
+
+REQUEST_TIMEOUT = 15
+
+# BOT_HTTP2=1 in the environment makes the shared client (get_client) use
+# HTTP/2 when httpx[http2] is installed
+HTTP2_ENV = "BOT_HTTP2"
+
+
+class ConnectFailed(requests.exceptions.ConnectionError):
+    """The connection could not be opened, so nothing was sent."""
+
+
+def never_sent(error):
+    """True if a requests ConnectionError happened before the request went out."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, NewConnectionError)
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Retry number, starting at 1
+        base: Delay scale of the first retry
+        maximum: Upper bound for any delay
+
+    Returns:
+        float: Seconds to sleep
+    """
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
+
+
+def retry_after_seconds(response):
+    """
+    Read a numeric Retry-After header.
+
+    Returns:
+        float or None: Seconds the server asked us to wait
+    """
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class Http2Response:
+    """
+    httpx response with the requests-style parts the scrapers use
+    (ok, url as text, raise_for_status raising requests.HTTPError,
+    iter_content); everything else is the httpx response's own.
+    """
+
+    def __init__(self, response):
+        self._response = response
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    @property
+    def url(self):
+        return str(self._response.url)
+
+    @property
+    def ok(self):
+        return self._response.status_code < 400
+
+    def raise_for_status(self):
+        if self._response.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self._response.status_code} Error for url: {self.url}",
+                                                response=self)
+
+    def iter_content(self, chunk_size=1):
+        return self._response.iter_bytes(chunk_size)
+
+
+class HttpClient:
+    """
+    Reusable HTTP client for all scrapers.
+
+    - One connection pool per host, so repeated requests reuse warm
+      TCP/TLS connections instead of opening a new one each time.
+    - Optional HTTP/2 multiplexing when httpx is installed.
+    - Jittered exponential backoff on 429 and 5xx, honouring Retry-After.
+      Non-idempotent methods (POST) are only retried when that is safe.
+
+    Args:
+        headers: Headers added to every request (defaults to DEFAULT_HEADERS)
+        pool_size: Keep-alive connections per host
+        max_retries: Retries after the first attempt
+        http2: Use HTTP/2 through httpx when available
+        timeout: Default seconds to wait for a response
+    """
+
+    def __init__(self, headers=None, pool_size=POOL_SIZE, max_retries=MAX_RETRIES,
+                 http2=False, timeout=REQUEST_TIMEOUT):
+        self.max_retries = max_retries
+        self.timeout = timeout
+        # Without httpx or h2 this quietly stays on requests
+        self.http2 = bool(http2 and httpx is not None)
+        base_headers = dict(DEFAULT_HEADERS if headers is None else headers)
+
+        if self.http2:
+            self.session = httpx.Client(
+                http2=True,
+                headers=base_headers,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=pool_size, max_connections=pool_size * 4),
+            )
+        else:
+            self.session = requests.Session()
+            self.session.headers.update(base_headers)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _send(self, method, url, timeout, **kwargs):
+        if not self.http2:
+            try:
+                return self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                if never_sent(e) and not isinstance(e, ConnectFailed):
+                    raise ConnectFailed(*e.args, request=e.request, response=e.response) from e
+                raise
+
+        # Report httpx network errors as requests errors, so callers only
+        # need to catch requests.exceptions.RequestException
+        try:
+            return Http2Response(self.session.request(method, url, timeout=timeout, **kwargs))
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            raise ConnectFailed(str(e))
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+
+    def request(self, method, url, timeout=None, retry=None, **kwargs):
+        """
+        Send a request, retrying rate limits, server errors and dropped connections.
+
+        Args:
+            method: HTTP method ("GET", "POST", ...)
+            url: Target URL
+            timeout: Seconds to wait (defaults to the client timeout)
+            retry: True retries any error, even for POST; False never
+                retries; None (default) retries fully only IDEMPOTENT_METHODS
+                and other methods only when the request surely wasn't
+                processed (connection never opened, 429/503 with Retry-After)
+            **kwargs: Passed to requests/httpx (headers, data, params, ...)
+
+        Returns:
+            Response: Last response received (may still be an error status)
+
+        Raises:
+            requests.exceptions.RequestException: If every attempt failed to connect
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        with timer("http_request", method=method.upper(), host=urlsplit(url).netloc):
+            return self._request_with_retries(method, url, timeout, retry, **kwargs)
+
+    def _request_with_retries(self, method, url, timeout, retry, **kwargs):
+        host = urlsplit(url).netloc
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                response = self._send(method, url, timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt > self.max_retries or not (retry or isinstance(e, ConnectFailed)):
+                    raise
+                increment("http_retries", host=host, reason="connection")
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            delay = retry_after_seconds(response)
+            if retry:
+                retryable = response.status_code in RETRY_STATUSES
+            else:
+                retryable = response.status_code in SAFE_RETRY_STATUSES and delay is not None
+            if not retryable or attempt > self.max_retries:
+                return response
+
+            increment("http_retries", host=host, reason=str(response.status_code))
+            time.sleep(delay if delay is not None else backoff_delay(attempt))
+
+        return response
+
+    def stream(self, url, chunk_size=64 * 1024, headers=None, timeout=None):
+        """
+        Download a page piece by piece instead of loading it all in memory.
+
+        Args:
+            url: Page URL
+            chunk_size: Bytes per chunk
+            headers: Extra request headers
+            timeout: Seconds to wait (defaults to the client timeout)
+
+        Yields:
+            bytes: Raw (decompressed) body chunks
+
+        Raises:
+            requests.exceptions.RequestException: On network or HTTP errors
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        if self.http2:
+            try:
+                with self.session.stream("GET", url, headers=headers, timeout=timeout) as response:
+                    if response.status_code >= 400:
+                        raise requests.exceptions.HTTPError(f"{response.status_code} Error for url: {url}")
+                    yield from response.iter_bytes(chunk_size)
+            except httpx.TransportError as e:
+                raise requests.exceptions.ConnectionError(str(e))
+            return
+
+        response = self.request("GET", url, headers=headers, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size=chunk_size)
+        finally:
+            response.close()
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        return self.request("GET", url, headers=headers, timeout=timeout, **kwargs)
+
+    def post(self, url, data=None, headers=None, timeout=None, retry=None, **kwargs):
+        return self.request("POST", url, data=data, headers=headers, timeout=timeout, retry=retry, **kwargs)
+
+
+# ==============================================================================
+# SHARED INSTANCE
+# ==============================================================================
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Return the process-wide HttpClient, creating it on first use.
+
+    It uses HTTP/2 when BOT_HTTP2=1 is set and httpx[http2] is installed.
+
+    Returns:
+        HttpClient: Shared client
+    """
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient(http2=os.environ.get(HTTP2_ENV, "0") == "1")
+        return _shared_client
@@ -0,0 +1,189 @@
+import time
+from selenium.common.exceptions import StaleElementReferenceException
+from .browser_waits import AdaptiveTimeout
+from .metrics import timer, increment
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Scrolls in a row that load nothing before the list counts as exhausted
+EXHAUSTED_AFTER = 2
+
+# Extra seconds Selenium gives the waiting script on top of its own timeout
+SCRIPT_TIMEOUT_MARGIN = 5
+
+# The scrollable element around the items: the closest ancestor of the first
+# item that scrolls (works for dialogs as well as whole pages)
+FIND_CONTAINER_JS = """
+let node = document.querySelector(arguments[0]);
+while (node && node !== document.body) {
+    const overflow = getComputedStyle(node).overflowY;
+    if ((overflow === "auto" || overflow === "scroll") && node.scrollHeight > node.clientHeight) {
+        return node;
+    }
+    node = node.parentElement;
+}
+return document.scrollingElement;
+"""
+
+# Default item key (JS function of the item element) and row (JS function of
+# the element and its key)
+ITEM_KEY_JS = "(item) => item.innerText.trim()"
+ITEM_ROW_JS = "(item, key) => ({key: key, element: item})"
+
+# Rows whose key changed since the last call. Virtualized lists reuse row
+# elements for new items, so an element is returned again whenever the key
+# it shows differs from the one it was last returned with (data-bot-key).
+# Scripts get (item selector, container).
+CHANGED_ROWS_JS = """
+const keyOf = KEY_JS;
+const toRow = ROW_JS;
+const rows = [];
+for (const item of arguments[1].querySelectorAll(arguments[0])) {
+    const key = keyOf(item);
+    if (!key || item.getAttribute("data-bot-key") === key) {
+        continue;
+    }
+    item.setAttribute("data-bot-key", key);
+    rows.push(toRow(item, key));
+}
+return rows;
+"""
+
+# Scroll to the bottom and answer as soon as a MutationObserver sees an item
+# whose key changed (a new element or a reused one), or "timeout" when none
+# arrives in time
+WAIT_FOR_ROWS_JS = """
+const [selector, container, timeoutMs, done] = arguments;
+const keyOf = KEY_JS;
+const changed = () => Array.from(container.querySelectorAll(selector)).some(item => {
+    const key = keyOf(item);
+    return key && item.getAttribute("data-bot-key") !== key;
+});
+if (changed()) {
+    done("loaded");
+    return;
+}
+let timer = null;
+const observer = new MutationObserver(() => {
+    if (changed()) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done("loaded");
+    }
+});
+observer.observe(container, {childList: true, subtree: true, characterData: true, attributes: true});
+timer = setTimeout(() => { observer.disconnect(); done("timeout"); }, timeoutMs);
+container.scrollTop = container.scrollHeight;
+"""
+
+
+class InfiniteScroller:
+    """
+    Walk an infinite-scroll list, yielding each item once as it loads.
+
+    Every round reads only the rows whose key changed since the last one
+    (one script call), then scrolls and lets a MutationObserver in the page
+    report the moment the next items show up. There is no fixed pause: the
+    bot goes exactly as fast as the site paginates.
+
+        for row in InfiniteScroller(driver, "li.result", quota=50):
+            ...
+
+    Items are told apart by key, not by element, so virtualized lists that
+    reuse row elements for new items work too. A key is yielded at most once.
+
+    Iteration stops when the quota is reached or when EXHAUSTED_AFTER
+    scrolls in a row load nothing (stop_reason says which).
+
+    Args:
+        driver: Selenium WebDriver
+        item_selector: CSS selector matching one element per item
+        key_js: JS function (item) => key string; empty means "not ready yet"
+        row_js: JS function (item, key) => row object; it must keep the key
+            in row["key"]
+        quota: Most rows to yield (None: the whole list)
+        skip: Optional skip(row); rows it returns True for are not yielded
+            and don't count toward the quota
+        adaptive: AdaptiveTimeout for page loads (learns the site's speed)
+        exhausted_after: Empty scrolls in a row that end the list
+    """
+
+    def __init__(self, driver, item_selector, key_js=ITEM_KEY_JS, row_js=ITEM_ROW_JS, quota=None, skip=None,
+                 adaptive=None, exhausted_after=EXHAUSTED_AFTER):
+        self.driver = driver
+        self.item_selector = item_selector
+        self.rows_js = CHANGED_ROWS_JS.replace("KEY_JS", key_js).replace("ROW_JS", row_js)
+        self.wait_js = WAIT_FOR_ROWS_JS.replace("KEY_JS", key_js)
+        self.quota = quota
+        self.skip = skip
+        self.adaptive = adaptive or AdaptiveTimeout(initial=5.0, minimum=2.0, maximum=20.0)
+        self.exhausted_after = exhausted_after
+        self.container = None
+        self.seen = set()
+        self.yielded = 0
+        self.stop_reason = None
+        self._script_timeout = None
+
+    def find_container(self):
+        self.container = self.driver.execute_script(FIND_CONTAINER_JS, self.item_selector)
+        return self.container
+
+    def changed_rows(self):
+        """Rows whose key changed since the last call (one round-trip)."""
+        try:
+            return self.driver.execute_script(self.rows_js, self.item_selector, self.container)
+        except StaleElementReferenceException:
+            # The page replaced the list element; the keys live on the items
+            return self.driver.execute_script(self.rows_js, self.item_selector, self.find_container())
+
+    def wait_for_more(self):
+        """
+        Scroll down and wait until new items show up.
+
+        Returns:
+            bool: False if nothing arrived within the adaptive timeout
+        """
+        timeout = self.adaptive.timeout
+        if self._script_timeout != timeout:
+            self.driver.set_script_timeout(timeout + SCRIPT_TIMEOUT_MARGIN)
+            self._script_timeout = timeout
+
+        start = time.monotonic()
+        with timer("scroll_load"):
+            try:
+                result = self.driver.execute_async_script(self.wait_js, self.item_selector, self.container,
+                                                          int(timeout * 1000))
+            except StaleElementReferenceException:
+                self.find_container()
+                return True
+        if result == "loaded":
+            self.adaptive.record(time.monotonic() - start)
+            return True
+        self.adaptive.expired()
+        return False
+
+    def __iter__(self):
+        self.find_container()
+        empty_scrolls = 0
+        while True:
+            rows = [row for row in self.changed_rows() if row["key"] not in self.seen]
+            increment("scroll_rows", len(rows))
+            for row in rows:
+                self.seen.add(row["key"])
+                if self.skip and self.skip(row):
+                    continue
+                self.yielded += 1
+                yield row
+                if self.quota is not None and self.yielded >= self.quota:
+                    self.stop_reason = "quota"
+                    return
+
+            if rows or self.wait_for_more():
+                empty_scrolls = 0
+            else:
+                empty_scrolls += 1
+                if empty_scrolls >= self.exhausted_after:
+                    self.stop_reason = "exhausted"
+                    return
@@ -0,0 +1,157 @@
+import os
+import re
+import json
+import time
+import atexit
+import threading
+from .metrics import increment
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Folder (relative to where the script runs) that holds the journals
+JOURNAL_DIR = ".journal"
+
+# Records are flushed to disk (fsync) every SYNC_EVERY records or every
+# SYNC_INTERVAL seconds, whichever comes first. A crash loses at most that
+# much work, which is then simply done again.
+SYNC_EVERY = 20
+SYNC_INTERVAL = 2.0
+
+
+def journal_path(name, directory=JOURNAL_DIR):
+    """File of a journal: "<directory>/<name>.jsonl" with a file-safe name."""
+    return os.path.join(directory, re.sub(r"[^\w.@-]", "_", name) + ".jsonl")
+
+
+class Journal:
+    """
+    Append-only record of finished work units, so a restarted run can skip
+    straight to the unfinished ones.
+
+        with Journal("form_submissions") as journal:
+            for row in journal.pending(rows, key=lambda row: row[2]):
+                submit(row)
+                journal.record(row[2])
+
+    One JSON line per unit ({"key": ..., "at": ..., extra data}). Writes are
+    buffered and fsynced in batches; a half-written last line left by a
+    crash is ignored when the journal is read back. Thread-safe.
+
+    Args:
+        name: Journal name, e.g. "instagram_followed" (one file per name)
+        directory: Folder for the journal files
+        sync_every: Records between two fsyncs
+        sync_interval: Longest time in seconds between two fsyncs
+    """
+
+    def __init__(self, name, directory=JOURNAL_DIR, sync_every=SYNC_EVERY, sync_interval=SYNC_INTERVAL):
+        self.name = name
+        self.path = journal_path(name, directory)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.entries = {}
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        needs_newline = self._load()
+        self._file = open(self.path, "a", encoding="utf-8")
+        if needs_newline:
+            # Keep the next record off the end of a torn line
+            self._file.write("\n")
+        # Records still buffered are written when the script exits
+        atexit.register(self.close)
+
+    def _load(self):
+        """Read the finished units; True if the file ends in a torn line."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding="utf-8", errors="replace") as file:
+            text = file.read()
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+                self.entries[entry.pop("key")] = entry
+            except (ValueError, KeyError, AttributeError):
+                continue
+        return bool(text) and not text.endswith("\n")
+
+    def __contains__(self, key):
+        return str(key) in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def pending(self, items, key=lambda item: item):
+        """
+        Items whose key is not in the journal yet, in their original order.
+
+        Args:
+            items: Work units of this run
+            key: Function giving the journal key of an item
+
+        Returns:
+            list: The items still to do
+        """
+        todo = [item for item in items if str(key(item)) not in self.entries]
+        skipped = len(items) - len(todo)
+        if skipped:
+            increment("journal_skipped", skipped, journal=self.name)
+            print(f"✓ Skipping {skipped} item(s) already done in an earlier run ({self.path})")
+        return todo
+
+    def record(self, key, **data):
+        """
+        Mark a work unit as finished.
+
+        Args:
+            key: Unique id of the unit (listing link, handle, class id)
+            **data: Extra JSON-serializable details to keep with it
+        """
+        key = str(key)
+        line = json.dumps({"key": key, "at": round(time.time(), 3), **data}, ensure_ascii=False)
+        with self._lock:
+            if self._file.closed:
+                return
+            self.entries[key] = data
+            self._file.write(line + "\n")
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        """Write every buffered record to disk now."""
+        with self._lock:
+            if not self._file.closed and self._unsynced:
+                self._sync()
+
+    def clear(self):
+        """Forget all finished units (the next run starts from zero)."""
+        with self._lock:
+            self.entries.clear()
+            self._file.flush()
+            self._file.truncate(0)
+            self._unsynced = 0
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._unsynced:
+                self._sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,266 @@
+import os
+import json
+import math
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# BOT_METRICS_FILE=run.json (or run.prom) in the environment saves the
+# metrics of a run when the bot finishes
+METRICS_FILE_ENV = "BOT_METRICS_FILE"
+
+# Histogram bucket upper bounds, in seconds (Prometheus "le" values)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Raw durations kept per histogram for exact percentiles (oldest dropped first)
+MAX_SAMPLES = 10000
+
+# Prefix of every exported Prometheus metric
+PROMETHEUS_PREFIX = "bot_"
+
+
+class Histogram:
+    """Durations of one step: bucket counts plus recent raw samples."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # Last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.samples = []
+
+    def observe(self, seconds, error=False):
+        self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        if error:
+            self.errors += 1
+        self.samples.append(seconds)
+        if len(self.samples) > MAX_SAMPLES:
+            del self.samples[:len(self.samples) - MAX_SAMPLES]
+
+    def percentile(self, pct):
+        """Nearest-rank percentile of the kept samples (None when empty)."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[max(1, math.ceil(len(ordered) * pct / 100)) - 1]
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.bucket_counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": buckets,
+        }
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _prometheus_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+class Metrics:
+    """
+    Thread-safe registry of step durations and counters.
+
+    Steps are named ("login", "schedule_scan", "spotify_api") and can carry
+    labels (endpoint="search"); every name + label set gets its own
+    histogram.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, error=False, **labels):
+        """Record one duration."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds, error)
+
+    def increment(self, name, amount=1, **labels):
+        """Add to a counter (e.g. retries, injected failures)."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Time a block of code.
+
+            with timer("page_load", page="schedule"):
+                driver.get(URL)
+
+        A block that raises is still recorded, and counted as an error.
+        """
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, error, **labels)
+
+    def timed(self, name=None, **labels):
+        """
+        Decorator timing every call of a function (named after it by default).
+
+            @timed()
+            def login(): ...
+        """
+        def decorator(func):
+            step = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(step, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    # ==========================================================================
+    # EXPORT
+    # ==========================================================================
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **histogram.to_dict()}
+                    for (name, labels), histogram in sorted(self._histograms.items())
+                ],
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+            }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix=PROMETHEUS_PREFIX):
+        """
+        Prometheus text exposition format.
+
+        Step "login" becomes the histogram bot_login_seconds (plus a
+        bot_login_errors_total counter); counters get a _total suffix.
+        """
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+            families = {}
+            for (name, labels), histogram in histograms:
+                families.setdefault(name, []).append((labels, histogram))
+            for name, members in families.items():
+                metric = f"{prefix}{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for labels, histogram in members:
+                    cumulative = 0
+                    for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f"{metric}_bucket{_prometheus_labels(labels, ('le', bound))} {cumulative}")
+                    lines.append(f"{metric}_sum{_prometheus_labels(labels)} {histogram.sum:.6f}")
+                    lines.append(f"{metric}_count{_prometheus_labels(labels)} {histogram.count}")
+                errors = f"{prefix}{name}_errors_total"
+                lines.append(f"# TYPE {errors} counter")
+                for labels, histogram in members:
+                    lines.append(f"{errors}{_prometheus_labels(labels)} {histogram.errors}")
+
+            seen = set()
+            for (name, labels), value in counters:
+                metric = f"{prefix}{name}_total"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} counter")
+                    seen.add(metric)
+                lines.append(f"{metric}{_prometheus_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, path=None):
+        """
+        Write the metrics to a file: Prometheus text for .prom/.txt, JSON otherwise.
+
+        Args:
+            path: Output file (defaults to $BOT_METRICS_FILE)
+
+        Returns:
+            str or None: The path written, None when no path was given
+        """
+        path = path or os.environ.get(METRICS_FILE_ENV)
+        if not path:
+            return None
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def report(self):
+        """Print where the time went, slowest steps first, and save if configured."""
+        histograms = self.to_dict()["histograms"]
+        if histograms:
+            print("\n" + "=" * 78)
+            print(f"{'Step':<34}{'Count':>7}{'Errors':>8}{'Total (s)':>11}{'p50 (s)':>9}{'p99 (s)':>9}")
+            print("=" * 78)
+            for entry in sorted(histograms, key=lambda entry: entry["sum"], reverse=True):
+                labels = ",".join(f"{key}={value}" for key, value in entry["labels"].items())
+                step = f"{entry['name']}[{labels}]" if labels else entry["name"]
+                print(f"{step[:33]:<34}{entry['count']:>7}{entry['errors']:>8}{entry['sum']:>11.2f}"
+                      f"{entry['p50']:>9.3f}{entry['p99']:>9.3f}")
+            print("=" * 78)
+        path = self.save()
+        if path:
+            print(f"✓ Metrics saved to {path}")
+
+
+# One registry per process, shared by the bots and the toolkit
+METRICS = Metrics()
+observe = METRICS.observe
+increment = METRICS.increment
+timer = METRICS.timer
+timed = METRICS.timed
+report = METRICS.report
+save = METRICS.save
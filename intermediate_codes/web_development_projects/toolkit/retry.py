@@ -0,0 +1,229 @@
+import time
+import random
+import asyncio
+import inspect
+import functools
+import threading
+from .metrics import timer, increment
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Delay before retry n is random between 0 and BASE_DELAY * 2^(n-1), capped
+# at MAX_DELAY ("full jitter"), so callers that failed together don't retry
+# together
+BASE_DELAY = 0.1
+MAX_DELAY = 5.0
+
+# Seconds a call may take in total, attempts and waits included
+DEADLINE = 30.0
+
+# The circuit opens after this many failures in a row, and lets one trial
+# call through after RESET_TIMEOUT seconds
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service that keeps failing."""
+
+
+class CircuitBreaker:
+    """
+    Stop calling something that keeps failing, then try again later.
+
+    closed: calls go through. After failure_threshold failures in a row it
+    opens: calls fail at once with CircuitOpenError. After reset_timeout one
+    trial call is let through (half-open); success closes the circuit again,
+    failure opens it for another reset_timeout.
+
+    Args:
+        failure_threshold: Failures in a row that open the circuit
+        reset_timeout: Seconds before a trial call is allowed
+        name: Used in metrics and messages
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT, name="circuit"):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True if a call may go through now."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half-open"
+                self._trial_running = False
+            if self.state == "half-open":
+                if self._trial_running:
+                    return False
+                self._trial_running = True
+                return True
+            return self.state == "closed"
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = "closed"
+            self._trial_running = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    increment("circuit_opened", circuit=self.name)
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._trial_running = False
+
+
+def backoff_delay(attempt, base=BASE_DELAY, maximum=MAX_DELAY):
+    """Seconds to wait before retry number `attempt` (1, 2, ...), with full jitter."""
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
+
+
+class RetryPolicy:
+    """
+    Retry a call with exponential backoff and jitter, within a time budget.
+
+    A call is retried while it raises one of retry_on and the deadline has
+    not passed (no attempt starts after it). A step that fails for half a second then costs
+    about half a second, not a fixed number of sleeps. Other exceptions are
+    raised at once. When the budget runs out the last exception is raised,
+    so callers catch the same errors as without retries.
+
+    Works for plain functions (call) and coroutines (call_async), directly
+    or as a decorator. Every call is timed as "retry_call" and every failed
+    attempt counted in "retry_attempts" (toolkit/metrics.py).
+
+    Args:
+        retry_on: Exception types worth retrying
+        deadline: Seconds for the whole call (None: no time limit)
+        max_attempts: Optional cap on attempts as well (None: only the deadline)
+        base_delay: Backoff of the first retry
+        max_delay: Longest single wait
+        breaker: Optional CircuitBreaker shared by every call of this policy
+        name: Label in metrics
+        on_retry: Optional on_retry(attempt, error, delay) called before each wait
+    """
+
+    def __init__(self, retry_on=(Exception,), deadline=DEADLINE, max_attempts=None, base_delay=BASE_DELAY,
+                 max_delay=MAX_DELAY, breaker=None, name="call", on_retry=None):
+        self.retry_on = retry_on
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker
+        self.name = name
+        self.on_retry = on_retry
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self.call_async(func, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        return wrapper
+
+    def _check_breaker(self):
+        if self.breaker and not self.breaker.allow():
+            increment("retry_giveups", policy=self.name, reason="circuit_open")
+            raise CircuitOpenError(f"{self.breaker.name} keeps failing, paused for up to "
+                                   f"{self.breaker.reset_timeout:g}s")
+
+    def _next_delay(self, attempt, started, error):
+        """Seconds to wait before the next attempt, or None to give up."""
+        increment("retry_attempts", policy=self.name, error=type(error).__name__)
+        if self.breaker:
+            self.breaker.failure()
+        if self.max_attempts is not None and attempt >= self.max_attempts:
+            increment("retry_giveups", policy=self.name, reason="attempts")
+            return None
+        delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+        if self.deadline is not None:
+            remaining = self.deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                increment("retry_giveups", policy=self.name, reason="deadline")
+                return None
+            # The last attempt starts right at the deadline at the latest
+            delay = min(delay, remaining)
+        if self.on_retry:
+            self.on_retry(attempt, error, delay)
+        return delay
+
+    def _succeeded(self):
+        if self.breaker:
+            self.breaker.success()
+
+    def call(self, func, *args, **kwargs):
+        """
+        Call func(*args, **kwargs) until it succeeds or the budget runs out.
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            Exception: The last error once the deadline or attempts run out
+        """
+        started = time.monotonic()
+        with timer("retry_call", policy=self.name):
+            attempt = 0
+            while True:
+                attempt += 1
+                self._check_breaker()
+                try:
+                    result = func(*args, **kwargs)
+                except self.retry_on as e:
+                    delay = self._next_delay(attempt, started, e)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    continue
+                except Exception:
+                    # The service answered, just not with something worth retrying
+                    self._succeeded()
+                    raise
+                self._succeeded()
+                return result
+
+    async def call_async(self, func, *args, **kwargs):
+        """Same as call(), awaiting func and sleeping with asyncio."""
+        started = time.monotonic()
+        with timer("retry_call", policy=self.name):
+            attempt = 0
+            while True:
+                attempt += 1
+                self._check_breaker()
+                try:
+                    result = await func(*args, **kwargs)
+                except self.retry_on as e:
+                    delay = self._next_delay(attempt, started, e)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    continue
+                except Exception:
+                    self._succeeded()
+                    raise
+                self._succeeded()
+                return result
+
+
+def retry(retry_on=(Exception,), **options):
+    """
+    Decorator shortcut for RetryPolicy.
+
+        @retry((TimeoutException,), deadline=20, name="login")
+        def login(): ...
+    """
+    return RetryPolicy(retry_on, **options)
@@ -2,10 +2,14 @@ from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 import undetected_chromedriver as uc
-from selenium import webdriver
 from dotenv import load_dotenv
 import time
 import  os
+import sys
+
+# Make the shared toolkit folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from toolkit.browser import make_driver
 
 load_dotenv()
 
@@ -19,16 +23,11 @@ X_PASSWORD = os.environ["X_PASSWORD"]
 # SETUP CHROME DRIVER
 # ==============================================================================
 
-# Configure Chrome options
-chrome_options = webdriver.ChromeOptions()
-chrome_options.add_experimental_option(name="detach", value=True)
-
 # Use persistent Chrome profile to save login sessions
 user_data_dir = os.path.join(os.getcwd(), "chrome_profile")
-chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
 
-# Initialize Chrome driver
-driver = webdriver.Chrome(options=chrome_options)
+# Initialize a lean Chrome driver (no images, fonts or trackers)
+driver = make_driver(profile_dir=user_data_dir, detach=True)
 
 # Navigate to the webpage
 URL = "https://x.com/"